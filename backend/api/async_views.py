@@ -0,0 +1,252 @@
+"""
+Async counterparts of the hot API endpoints, for ASGI deployments.
+
+DRF views are synchronous, so under an ASGI server every request to them occupies a
+thread of the sync_to_async pool for its whole duration. The views below are plain
+Django async views: reads go through the async ORM (aget, async iteration) and only
+the transactional services run in a worker thread, so one worker can keep many slow
+clients waiting on the database at once. They accept the same JWT tokens and return
+the same payloads as their DRF versions in api.views.
+
+event_stream is the Server-Sent Events feed of live seat counts and join request
+statuses of an event, published through base.broker. It needs an ASGI server and
+answers 501 under WSGI (runserver, gunicorn's sync workers).
+"""
+import json
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import APIException, AuthenticationFailed, NotAuthenticated, ParseError, ValidationError
+from rest_framework.request import Request
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from base.broker import event_channel, get_broker, seats_message
+from base.forms import EventFilterForm
+from base.models import Event
+from base.services import SeatConflict, moderate_requests, request_to_join
+from base.system_names import filter_by_system
+from .authentication import token_user
+from .pagination import EventCursorPagination
+from .renderers import dumps
+from .serializers import (
+	EventSerializer,
+	EventRequestSerializer,
+	JoinRequestDecisionResultSerializer,
+	JoinRequestDecisionSerializer,
+	event_list_serializer,
+)
+from .views import MAX_MODERATION_BATCH
+
+# Seconds between keep-alive comments on an idle event stream
+STREAM_HEARTBEAT = 15
+# Milliseconds EventSource clients wait before reconnecting
+STREAM_RETRY = 3000
+
+
+def api_response(data, status_code=status.HTTP_200_OK):
+	return HttpResponse(dumps(data), status=status_code, content_type="application/json")
+
+
+async def authenticate(request):
+	"""The user of the request's JWT access token, or None when there is no token."""
+	auth = JWTAuthentication()
+	header = auth.get_header(request)
+	raw_token = auth.get_raw_token(header) if header is not None else None
+	if raw_token is None:
+		return None
+	try:
+		token = auth.get_validated_token(raw_token)
+		user_id = token[jwt_settings.USER_ID_CLAIM]
+	except (InvalidToken, TokenError, KeyError):
+		raise AuthenticationFailed("Given token not valid for any token type")
+	user = token_user(token)
+	if user is not None:
+		return user
+	user = await User.objects.filter(**{jwt_settings.USER_ID_FIELD: user_id}).afirst()
+	if user is None or not user.is_active:
+		raise AuthenticationFailed("User not found")
+	return user
+
+
+def async_api_view(methods, login_required=False):
+	"""
+	Turn an async view into a small JSON API endpoint: reject other HTTP methods,
+	authenticate the JWT token into `request.user` and render DRF API exceptions.
+	"""
+	def decorator(view):
+		@csrf_exempt
+		@wraps(view)
+		async def wrapper(request, *args, **kwargs):
+			if request.method not in methods:
+				return api_response({"detail": f'Method "{request.method}" not allowed.'}, status.HTTP_405_METHOD_NOT_ALLOWED)
+			try:
+				request.user = await authenticate(request)
+				if login_required and request.user is None:
+					raise NotAuthenticated()
+				return await view(request, *args, **kwargs)
+			except APIException as exc:
+				return api_response({"detail": exc.detail}, exc.status_code)
+		return wrapper
+	return decorator
+
+
+async def get_event(events, event_id):
+	try:
+		return await events.aget(pk=event_id)
+	except Event.DoesNotExist:
+		return None
+
+
+@async_api_view(["GET"])
+async def event_list(request):
+	"""Async version of api.views.getData (without the response cache)."""
+	try:
+		serializer_class, fields = event_list_serializer(request.GET)
+	except ValidationError as exc:
+		return api_response(exc.detail, status.HTTP_400_BAD_REQUEST)
+	events = serializer_class.listing(fields)
+
+	system_name = request.GET.get("system")
+	if system_name:
+		events = await sync_to_async(filter_by_system)(events, system_name)
+
+	filters = EventFilterForm(request.GET)
+	if not filters.is_valid():
+		return api_response(filters.errors, status.HTTP_400_BAD_REQUEST)
+	events = filters.filter(events)
+
+	paginator = EventCursorPagination()
+	paginator.prepare(Request(request))
+	rows = []
+	for segment in paginator.get_segments(events):
+		async for event in segment[:paginator.page_size + 1 - len(rows)]:
+			rows.append(event)
+		if len(rows) > paginator.page_size:
+			break
+	page = paginator.finish(rows)
+	return api_response({
+		"next": paginator.get_next_link(),
+		"previous": paginator.get_previous_link(),
+		"results": serializer_class(page, many=True, fields=fields).data,
+	})
+
+
+@async_api_view(["GET"], login_required=True)
+async def event_detail(request, event_id):
+	"""Async version of the GET of api.views.editEvent."""
+	event = await get_event(Event.objects.for_listing(), event_id)
+	if event is None:
+		return api_response({"detail": "Not found."}, status.HTTP_404_NOT_FOUND)
+	return api_response(EventSerializer(event).data)
+
+
+@async_api_view(["POST"], login_required=True)
+async def join_event(request, event_id):
+	"""Async version of api.views.join_event_api."""
+	event = await get_event(Event.objects.all(), event_id)
+	if event is None:
+		return api_response({"detail": "Not found."}, status.HTTP_404_NOT_FOUND)
+	if event.organizer_id == request.user.pk:
+		return api_response({"detail": "You are the organizer of this event."}, status.HTTP_400_BAD_REQUEST)
+
+	try:
+		req = await sync_to_async(request_to_join)(event, request.user)
+	except SeatConflict as exc:
+		return api_response({"detail": str(exc)}, status.HTTP_409_CONFLICT)
+	return api_response(EventRequestSerializer(req).data, status.HTTP_201_CREATED)
+
+
+@async_api_view(["GET", "PATCH"], login_required=True)
+async def list_requests(request, event_id):
+	"""Async version of api.views.list_requests_api."""
+	event = await get_event(Event.objects.all(), event_id)
+	if event is None:
+		return api_response({"detail": "Not found."}, status.HTTP_404_NOT_FOUND)
+	if event.organizer_id != request.user.pk:
+		return api_response({"detail": "Not authorized."}, status.HTTP_403_FORBIDDEN)
+
+	if request.method == "PATCH":
+		try:
+			data = json.loads(request.body)
+		except ValueError:
+			raise ParseError()
+		serializer = JoinRequestDecisionSerializer(data=data, many=True, allow_empty=False, max_length=MAX_MODERATION_BATCH)
+		if not serializer.is_valid():
+			return api_response(serializer.errors, status.HTTP_400_BAD_REQUEST)
+		results = await sync_to_async(moderate_requests)(event, serializer.validated_data)
+		return api_response(JoinRequestDecisionResultSerializer(results, many=True).data)
+
+	requests = [req async for req in event.requests.select_related("user").order_by("id")]
+	return api_response(EventRequestSerializer(requests, many=True).data)
+
+
+def sse(event, data):
+	return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def request_update(message, event, user):
+	"""The request status change as `user` may see it: only the organizer and the requester get it."""
+	if user is None or user.pk not in (message["user_id"], event.organizer_id):
+		return None
+	return {"id": message["id"], "status": message["status"], "own": message["user_id"] == user.pk}
+
+
+async def stream_event(event, user):
+	subscription = get_broker().subscribe(event_channel(event.pk))
+	try:
+		yield f"retry: {STREAM_RETRY}\n\n"
+		# Counts read after subscribing, so no change falls in between
+		event = await Event.objects.aget(pk=event.pk)
+		yield sse("seats", seats_message(event))
+		while True:
+			message = await subscription.get(STREAM_HEARTBEAT)
+			if message is None:
+				yield ": keep-alive\n\n"
+			elif message["type"] == "request":
+				update = request_update(message, event, user)
+				if update is not None:
+					yield sse("request", update)
+			elif message["type"] == "closed":
+				yield sse("closed", {})
+				return
+			else:
+				yield sse(message["type"], {key: value for key, value in message.items() if key != "type"})
+	except Event.DoesNotExist:
+		yield sse("closed", {})
+	finally:
+		subscription.close()
+
+
+@async_api_view(["GET"])
+async def event_stream(request, event_id):
+	"""
+	Server-Sent Events stream of an event: `seats` whenever the seat counts change,
+	`request` when a join request of the viewer (or, for the organizer, any request)
+	changes status, and `closed` when the event is deleted. Browsers authenticate with
+	their session, API clients with a JWT. Only served under ASGI: WSGI gets 501.
+	"""
+	user = request.user
+	if user is None:
+		session_user = await request.auser()
+		user = session_user if session_user.is_authenticated else None
+
+	event = await get_event(Event.objects.all(), event_id)
+	if event is None:
+		return api_response({"detail": "Not found."}, status.HTTP_404_NOT_FOUND)
+
+	if not isinstance(request, ASGIRequest):
+		# A sync worker would be held for the whole stream. EventSource gives up on a
+		# non-200 answer instead of reconnecting, so the page keeps its rendered counts
+		return api_response({"detail": "Live updates need an ASGI server."}, status.HTTP_501_NOT_IMPLEMENTED)
+
+	response = StreamingHttpResponse(stream_event(event, user), content_type="text/event-stream")
+	response["Cache-Control"] = "no-cache"
+	response["X-Accel-Buffering"] = "no"
+	return response
@@ -0,0 +1,73 @@
+"""
+JWT authentication without a user lookup per request.
+
+Access tokens carry the claims of USER_CLAIMS next to the user id, and
+StatelessJWTAuthentication builds `request.user` from them: a real User instance
+whose other fields are deferred, exactly like a row loaded with `.only()`. Views that
+only compare the user with an organizer or assign it to a foreign key run no query;
+reading any other field (email, date_joined...) loads it from the database then.
+
+The claims are a snapshot taken when the access token was issued, at login or on
+refresh (ClaimsTokenRefreshSerializer reloads the user): a deactivated user or a
+revoked staff status is only seen when the access token expires (SIMPLE_JWT's
+ACCESS_TOKEN_LIFETIME). Tokens without the claims, issued before they were added,
+are authenticated with the usual database lookup.
+"""
+from django.contrib.auth.models import User
+from django.db import router
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+USER_CLAIMS = ("username", "is_staff")
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+	"""Token pair carrying USER_CLAIMS; refreshed access tokens copy them."""
+
+	@classmethod
+	def get_token(cls, user):
+		token = super().get_token(user)
+		for claim in USER_CLAIMS:
+			token[claim] = getattr(user, claim)
+		return token
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+	"""Refresh stamping the current USER_CLAIMS of the user, rather than those of the login, on the new access token."""
+
+	def validate(self, attrs):
+		refresh = self.token_class(attrs["refresh"])
+		user = User.objects.filter(**{jwt_settings.USER_ID_FIELD: refresh.get(jwt_settings.USER_ID_CLAIM)}).first()
+		if user is None or not jwt_settings.USER_AUTHENTICATION_RULE(user):
+			raise AuthenticationFailed(self.error_messages["no_active_account"], "no_active_account")
+		for claim in USER_CLAIMS:
+			refresh[claim] = getattr(user, claim)
+		return super().validate({**attrs, "refresh": str(refresh)})
+
+
+def token_user(token):
+	"""The User described by the claims of `token`, or None when they are missing."""
+	if jwt_settings.USER_ID_CLAIM not in token or any(claim not in token for claim in USER_CLAIMS):
+		return None
+	# Tokens are only issued to active users
+	id_field = User._meta.get_field(jwt_settings.USER_ID_FIELD)
+	loaded = {id_field.attname: id_field.to_python(token[jwt_settings.USER_ID_CLAIM]), "is_active": True}
+	loaded.update((claim, token[claim]) for claim in USER_CLAIMS)
+	# from_db() takes the values in the order of the model fields
+	fields = [field.attname for field in User._meta.concrete_fields if field.attname in loaded]
+	return User.from_db(router.db_for_read(User), fields, [loaded[name] for name in fields])
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+	"""JWTAuthentication building the user from the token claims, see the module docstring."""
+
+	def get_user(self, validated_token):
+		return token_user(validated_token) or super().get_user(validated_token)
+
+
+class StatelessJWTScheme(SimpleJWTScheme):
+	"""Document StatelessJWTAuthentication as the bearer tokens it is in the OpenAPI schema."""
+	target_class = "api.authentication.StatelessJWTAuthentication"
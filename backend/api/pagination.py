@@ -0,0 +1,160 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from datetime import timezone as dt_timezone
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+# Largest value of a BigAutoField
+MAX_ID = 2 ** 63 - 1
+
+
+class EventCursorPagination(BasePagination):
+	"""
+	Keyset pagination of events ordered by ``(date_start, id)``.
+
+	Dated events come first, followed by the ones without a ``date_start`` ordered by id.
+	Every page is fetched by seeking from the last seen ``(date_start, id)`` pair on
+	``event_date_start_id_idx`` (or the primary key for undated events) instead of using
+	OFFSET, so a deep page costs the same as the first one.
+	"""
+	cursor_query_param = "cursor"
+	page_size_query_param = "page_size"
+	max_page_size = 100
+	invalid_cursor_message = "Invalid cursor."
+
+	def paginate_queryset(self, queryset, request, view=None):
+		self.prepare(request)
+		rows = []
+		for segment in self.get_segments(queryset):
+			rows.extend(segment[:self.page_size + 1 - len(rows)])
+			if len(rows) > self.page_size:
+				break
+		return self.finish(rows)
+
+	def prepare(self, request):
+		"""Read the page size and the cursor position from the request."""
+		self.request = request
+		self.page_size = self.get_page_size(request)
+		self.position, self.reverse = self.decode_cursor(request)
+
+	def get_segments(self, queryset):
+		"""
+		Return the lazy querysets to read from, in traversal order.
+
+		Undated events are kept in their own segment so that each query stays a plain
+		range scan on a single index.
+		"""
+		dated = queryset.filter(date_start__isnull=False)
+		undated = queryset.filter(date_start__isnull=True)
+
+		if self.position is None:
+			return [dated.order_by("date_start", "id"), undated.order_by("id")]
+
+		date_start, pk = self.position
+		if not self.reverse:
+			if date_start is None:
+				return [undated.filter(id__gt=pk).order_by("id")]
+			after = dated.filter(date_start__gte=date_start).exclude(date_start=date_start, id__lte=pk)
+			return [after.order_by("date_start", "id"), undated.order_by("id")]
+
+		if date_start is None:
+			return [undated.filter(id__lt=pk).order_by("-id"), dated.order_by("-date_start", "-id")]
+		before = dated.filter(date_start__lte=date_start).exclude(date_start=date_start, id__gte=pk)
+		return [before.order_by("-date_start", "-id")]
+
+	def finish(self, rows):
+		"""Trim the look-ahead row and work out which neighbouring pages exist."""
+		has_more = len(rows) > self.page_size
+		rows = rows[:self.page_size]
+		if self.reverse:
+			rows.reverse()
+			self.has_next, self.has_previous = True, has_more
+		else:
+			self.has_next, self.has_previous = has_more, self.position is not None
+
+		self.next_position = self.position_of(rows[-1]) if rows else None
+		self.previous_position = self.position_of(rows[0]) if rows else self.position
+		if not rows:
+			self.has_next = False
+		return rows
+
+	def get_paginated_response(self, data):
+		return Response({
+			"next": self.get_next_link(),
+			"previous": self.get_previous_link(),
+			"results": data,
+		})
+
+	def get_paginated_response_schema(self, schema):
+		return {
+			"type": "object",
+			"required": ["results"],
+			"properties": {
+				"next": {"type": "string", "nullable": True, "format": "uri"},
+				"previous": {"type": "string", "nullable": True, "format": "uri"},
+				"results": schema,
+			},
+		}
+
+	def get_page_size(self, request):
+		try:
+			return _positive_int(
+				request.query_params[self.page_size_query_param],
+				strict=True,
+				cutoff=self.max_page_size,
+			)
+		except (KeyError, ValueError):
+			return settings.EVENT_PAGE_SIZE
+
+	def get_next_link(self):
+		if not self.has_next or self.next_position is None:
+			return None
+		return self.encode_cursor(self.next_position, reverse=False)
+
+	def get_previous_link(self):
+		if not self.has_previous or self.previous_position is None:
+			return None
+		return self.encode_cursor(self.previous_position, reverse=True)
+
+	@staticmethod
+	def position_of(event):
+		if isinstance(event, dict):
+			# A .values() row
+			return (event["date_start"], event["id"])
+		return (event.date_start, event.pk)
+
+	def encode_cursor(self, position, reverse):
+		date_start, pk = position
+		payload = {"d": date_start.isoformat() if date_start else None, "i": pk}
+		if reverse:
+			payload["r"] = 1
+		token = urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode()
+		url = self.request.build_absolute_uri()
+		return replace_query_param(url, self.cursor_query_param, token)
+
+	def decode_cursor(self, request):
+		"""The position and direction of the cursor; a tampered cursor is a 400 error."""
+		token = request.query_params.get(self.cursor_query_param)
+		if not token:
+			return None, False
+		invalid = ValidationError({self.cursor_query_param: [self.invalid_cursor_message]})
+		try:
+			payload = json.loads(urlsafe_b64decode(token.encode()))
+			date_start = parse_datetime(payload["d"]) if payload["d"] else None
+			pk = payload["i"]
+			reverse = bool(payload.get("r"))
+		except (BinasciiError, TypeError, ValueError, KeyError, UnicodeDecodeError):
+			raise invalid
+		# Ids beyond the range of the column would fail in the database
+		if (payload["d"] and date_start is None) or type(pk) is not int or not 0 <= pk <= MAX_ID:
+			raise invalid
+		if date_start is not None and timezone.is_naive(date_start):
+			date_start = timezone.make_aware(date_start, dt_timezone.utc)
+		return (date_start, pk), reverse
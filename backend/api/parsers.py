@@ -0,0 +1,31 @@
+import json
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+
+class NDJSONParser(BaseParser):
+	"""
+	Newline-delimited JSON: one object per line.
+
+	Parsing is lazy: `request.data` is a generator reading the body line by line, so
+	large uploads are never held in memory at once.
+	"""
+	media_type = "application/x-ndjson"
+
+	def parse(self, stream, media_type=None, parser_context=None):
+		parser_context = parser_context or {}
+		encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+		return self.iter_objects(stream, encoding)
+
+	@staticmethod
+	def iter_objects(stream, encoding):
+		for number, line in enumerate(stream, start=1):
+			line = line.strip()
+			if not line:
+				continue
+			try:
+				yield json.loads(line.decode(encoding))
+			except ValueError as exc:
+				raise ParseError(f"NDJSON parse error on line {number} - {exc}")
@@ -0,0 +1,53 @@
+import json
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+	import orjson
+except ImportError:
+	orjson = None
+
+
+class NDJSONRenderer(BaseRenderer):
+	"""Render a list as newline-delimited JSON, one item per line."""
+	media_type = "application/x-ndjson"
+	format = "ndjson"
+	charset = None
+
+	def render(self, data, accepted_media_type=None, renderer_context=None):
+		if data is None:
+			return b""
+		if isinstance(data, dict):
+			data = [data]
+		return b"".join(self.render_line(item) for item in data)
+
+	@staticmethod
+	def render_line(item):
+		return (json.dumps(item, cls=encoders.JSONEncoder, ensure_ascii=False) + "\n").encode()
+
+
+class FastJSONRenderer(JSONRenderer):
+	"""
+	JSONRenderer encoding with orjson when it is installed. The output is the same compact
+	UTF-8 JSON: values orjson does not handle identically (dates, decimals, lazy strings...)
+	go through DRF's encoder. Indented output and installs without orjson use JSONRenderer.
+	"""
+
+	def render(self, data, accepted_media_type=None, renderer_context=None):
+		if orjson is None or data is None or self.get_indent(accepted_media_type or "", renderer_context or {}):
+			return super().render(data, accepted_media_type, renderer_context)
+		return dumps(data)
+
+
+def dumps(data):
+	"""Encode `data` like JSONRenderer does, with orjson when it is installed."""
+	if orjson is None:
+		return JSONRenderer().render(data)
+	content = orjson.dumps(
+		data,
+		default=encoders.JSONEncoder().default,
+		option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+	)
+	# Like JSONRenderer, escape the line separators that break JavaScript string literals
+	return content.replace("\u2028".encode(), b"\\u2028").replace("\u2029".encode(), b"\\u2029")
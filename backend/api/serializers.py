@@ -1,10 +1,57 @@
-from rest_framework import serializers
+from django.utils.encoding import smart_str
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+from drf_spectacular.utils import extend_schema_field
+from base import system_names
 from base.models import Event, EventRequest, System
 
-class EventSerializer(serializers.ModelSerializer):
+class SystemNameField(serializers.SlugRelatedField):
+    """System referenced by name (case-insensitive), resolved from the in-process cache."""
+    def to_internal_value(self, data):
+        if not isinstance(data, str):
+            self.fail("invalid")
+        system = system_names.get_system(data)
+        if system is None:
+            self.fail("does_not_exist", slug_name=self.slug_field, value=smart_str(data))
+        return system
+
+class SparseFieldsMixin:
+    """Render only the `fields` given to the constructor (all of them by default)."""
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    @classmethod
+    def requested_fields(cls, query_params):
+        """
+        The field names selected by the `fields` and `omit` query parameters (comma-separated),
+        or None when neither is given. Unknown names are a ValidationError.
+        """
+        listed = {}
+        for param in ("fields", "omit"):
+            value = query_params.get(param)
+            if value:
+                listed[param] = [name.strip() for name in value.split(",") if name.strip()]
+        if not listed:
+            return None
+        available = list(cls().fields)
+        errors = {}
+        for param, names in listed.items():
+            unknown = [name for name in names if name not in available]
+            if unknown:
+                errors[param] = f"Unknown field(s): {', '.join(unknown)}."
+        if errors:
+            raise serializers.ValidationError(errors)
+        kept = listed.get("fields", available)
+        return [name for name in available if name in kept and name not in listed.get("omit", ())]
+
+class EventSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Use with Event.objects.for_listing() to avoid per-event queries."""
     organizer = serializers.ReadOnlyField(source="organizer.username")
-    players = serializers.StringRelatedField(many=True, read_only=True)
-    system = serializers.SlugRelatedField(
+    players = serializers.SerializerMethodField()
+    system = SystemNameField(
         slug_field="name",
         queryset=System.objects.all()
     )
@@ -12,7 +59,110 @@ class EventSerializer(serializers.ModelSerializer):
     class Meta:
         model = Event
         fields = "__all__"
+        read_only_fields = ["recurrence_parent", "recurrence_index"]
+
+    @classmethod
+    def listing(cls, fields=None):
+        return Event.objects.for_listing(fields)
+
+    @extend_schema_field(serializers.ListField(child=serializers.CharField()))
+    def get_players(self, obj):
+        return [user.username for user in obj.approved_players]
+
+    def validate(self, attrs):
+        def value(field):
+            return attrs[field] if field in attrs else getattr(self.instance, field, None)
+
+        if value("recurrence"):
+            if value("date_start") is None:
+                raise serializers.ValidationError({"recurrence": "A recurring event needs a date_start."})
+        elif value("recurrence_until") or value("recurrence_count"):
+            raise serializers.ValidationError({"recurrence": "Set a recurrence to use recurrence_until or recurrence_count."})
+        return attrs
+
+
+class EventRowSerializer:
+    """
+    Read-only fast path of EventSerializer for lists: renders the rows of
+    Event.objects.listing_values() with the same keys, order and value formats, without
+    DRF's field-by-field machinery. Related names and players come from SQL.
+    """
+    # Row keys of the fields that are not plain columns
+    ROW_KEYS = {"organizer": "organizer_name", "system": "system_name", "players": "player_names"}
+
+    def __init__(self, rows, many=True, fields=None):
+        self.rows = rows
+        self.fields = EventSerializer(fields=fields).fields
+
+    @classmethod
+    def requested_fields(cls, query_params):
+        return EventSerializer.requested_fields(query_params)
+
+    @classmethod
+    def listing(cls, fields=None):
+        return Event.objects.listing_values(fields)
+
+    @property
+    def data(self):
+        columns = []
+        for name, field in self.fields.items():
+            key = self.ROW_KEYS.get(name) or Event._meta.get_field(name).attname
+            convert = self.datetime_converter(field) if isinstance(field, serializers.DateTimeField) else None
+            columns.append((name, key, convert))
+        data = [
+            {name: convert(row[key]) if convert and row[key] is not None else row[key] for name, key, convert in columns}
+            for row in self.rows
+        ]
+        if "organizer" in self.fields:
+            # EventSerializer skips the `organizer` of events that have none
+            for item in data:
+                if item["organizer"] is None:
+                    del item["organizer"]
+        return data
+
+    @staticmethod
+    def datetime_converter(field):
+        """DateTimeField.to_representation, without its per-value settings lookups for the default ISO 8601 output."""
+        zone = field.default_timezone()
+        if getattr(field, "format", api_settings.DATETIME_FORMAT).lower() != ISO_8601 or hasattr(field, "timezone") or zone is None:
+            return field.to_representation
+
+        def convert(value):
+            value = value.astimezone(zone).isoformat()
+            return value[:-6] + "Z" if value.endswith("+00:00") else value
+        return convert
+
+class EventCardSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """What an event card shows. Use with Event.objects.for_cards()."""
+    system = serializers.ReadOnlyField(source="system.name", allow_null=True)
+    has_space = serializers.BooleanField(read_only=True)
 
+    class Meta:
+        model = Event
+        fields = ["id", "title", "system", "date_start", "online", "max_players", "approved_count", "has_space"]
+        read_only_fields = fields
+
+    @classmethod
+    def listing(cls, fields=None):
+        return Event.objects.for_cards()
+
+# Representations of the event list, picked with its `view` query parameter
+EVENT_LIST_VIEWS = {
+    "full": EventRowSerializer,
+    "card": EventCardSerializer,
+}
+
+def event_list_serializer(query_params):
+    """
+    The serializer class of an event list and the names of the fields it renders (None for
+    all), from the `view`, `fields` and `omit` query parameters. Invalid values are a
+    ValidationError. `serializer_class.listing(fields)` is the queryset to render.
+    """
+    view = query_params.get("view") or "full"
+    if view not in EVENT_LIST_VIEWS:
+        raise serializers.ValidationError({"view": f"Must be one of: {', '.join(EVENT_LIST_VIEWS)}."})
+    serializer_class = EVENT_LIST_VIEWS[view]
+    return serializer_class, serializer_class.requested_fields(query_params)
 
 class EventRequestSerializer(serializers.ModelSerializer):
     user = serializers.ReadOnlyField(source="user.username")
@@ -22,6 +172,58 @@ class EventRequestSerializer(serializers.ModelSerializer):
         model = EventRequest
         fields = ["id", "event", "user", "status", "created_at"]
 
+class JoinRequestDecisionSerializer(serializers.Serializer):
+    """One item of a bulk moderation batch."""
+    id = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=["approved", "rejected"])
+
+class JoinRequestDecisionResultSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    user = serializers.CharField(required=False)
+    status = serializers.CharField(allow_null=True)
+    result = serializers.ChoiceField(choices=["updated", "unchanged", "conflict", "not_found"])
+    detail = serializers.CharField(required=False)
+
+class OccurrenceWindowSerializer(serializers.Serializer):
+    """Query parameters of the occurrence calendar."""
+    start = serializers.DateTimeField()
+    end = serializers.DateTimeField()
+
+    def validate(self, attrs):
+        if attrs["end"] <= attrs["start"]:
+            raise serializers.ValidationError({"end": "end must be later than start."})
+        if attrs["end"] - attrs["start"] > self.context["max_window"]:
+            raise serializers.ValidationError({"end": f"The window may span at most {self.context['max_window'].days} days."})
+        return attrs
+
+class OccurrenceSerializer(serializers.Serializer):
+    """One session of the calendar: a one-off event or an occurrence of a recurring one."""
+    series = serializers.IntegerField(allow_null=True, help_text="Id of the recurring event, null for one-off events.")
+    index = serializers.IntegerField(help_text="Number of the occurrence in its series (0 is the recurring event itself).")
+    event = serializers.IntegerField(allow_null=True, help_text="Id of the Event row of this session, null while it is not materialized.")
+    title = serializers.CharField()
+    system = serializers.CharField(allow_null=True)
+    organizer = serializers.CharField(allow_null=True)
+    date_start = serializers.DateTimeField()
+    date_end = serializers.DateTimeField(allow_null=True)
+    online = serializers.BooleanField()
+    location = serializers.CharField(allow_null=True)
+
+class SessionSerializer(serializers.ModelSerializer):
+    """An event as one of the user's sessions; `role` is organizer, approved or pending."""
+    role = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Event
+        fields = ["id", "title", "date_start", "date_end", "role"]
+
+    def get_role(self, obj):
+        return "organizer" if obj.organizer_id == self.context["user"].pk else obj.own_status
+
+class ScheduleConflictSerializer(serializers.Serializer):
+    first = SessionSerializer()
+    second = SessionSerializer()
+
 class SystemSerializer(serializers.ModelSerializer):
     class Meta:
         model = System
@@ -0,0 +1,35 @@
+"""
+Rate limits of the endpoints that hash passwords.
+
+Logging in and signing up cost a password hash each, which is deliberately slow.
+DRF checks throttles before running the view, so requests over the limit are
+answered 429 without hashing anything. The history of each key is kept in the
+default cache: per process with the local memory cache, shared with Redis/memcached.
+"""
+import hashlib
+
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class CredentialsIPRateThrottle(SimpleRateThrottle):
+	"""Attempts per client address (see NUM_PROXIES behind a proxy)."""
+	scope = "credentials_ip"
+
+	def get_cache_key(self, request, view):
+		return self.cache_format % {"scope": self.scope, "ident": self.get_ident(request)}
+
+
+class CredentialsUsernameRateThrottle(SimpleRateThrottle):
+	"""Attempts per username, from any address."""
+	scope = "credentials_username"
+
+	def get_cache_key(self, request, view):
+		username = request.data.get("username") if hasattr(request.data, "get") else None
+		if not isinstance(username, str) or not username:
+			return None
+		# Usernames may hold characters cache keys must not
+		ident = hashlib.sha256(username.casefold().encode()).hexdigest()
+		return self.cache_format % {"scope": self.scope, "ident": ident}
+
+
+CREDENTIALS_THROTTLES = [CredentialsIPRateThrottle, CredentialsUsernameRateThrottle]
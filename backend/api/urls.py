@@ -1,5 +1,5 @@
 from django.urls import path
-from . import views
+from . import async_views, views
 from rest_framework_simplejwt.views import (
 	TokenObtainPairView,
 	TokenRefreshView,
@@ -10,6 +10,10 @@ urlpatterns = [
 	path("", views.getData),
 	path("add/", views.addEvent),
 	path('<int:event_id>/', views.editEvent, name='Event_detail'),
+	path("events/search/", views.search_events, name="api_search_events"),
+	path("events/occurrences/", views.list_occurrences, name="api_list_occurrences"),
+	path("events/import/", views.import_events, name="api_import_events"),
+	path("events/export/", views.export_events, name="api_export_events"),
 
 	# Auth
 	path('token/', views.TokenObtainPairViewSchema.as_view(), name='token_obtain_pair'),
@@ -21,10 +25,29 @@ urlpatterns = [
 	path("events/<int:event_id>/requests/", views.list_requests_api, name="api_list_requests"),
 	path("requests/<int:request_id>/", views.update_request_api, name="api_update_request"),
 
+	# Dashboard
+	path("me/events/", views.my_events, name="api_my_events"),
+	path("me/conflicts/", views.my_conflicts, name="api_my_conflicts"),
+
+	# Calendar feeds
+	path("me/calendar/", views.my_calendar_feed, name="api_my_calendar_feed"),
+	path("calendar/<str:token>/events.ics", views.user_calendar, name="api_user_calendar"),
+	path("systems/<int:system_id>/events.ics", views.system_calendar, name="api_system_calendar"),
+
 	# Systems
 	path("systems/", views.system_list_create, name="system_list_create"),
 	path("systems/<int:system_id>/", views.system_detail, name="system_detail"),
 
+	# Async (ASGI) versions of the hot endpoints, see api.async_views
+	path("async/", async_views.event_list, name="api_async_event_list"),
+	path("async/<int:event_id>/", async_views.event_detail, name="api_async_event_detail"),
+	path("async/events/<int:event_id>/join/", async_views.join_event, name="api_async_join_event"),
+	path("async/events/<int:event_id>/requests/", async_views.list_requests, name="api_async_list_requests"),
+	path("events/<int:event_id>/live/", async_views.event_stream, name="api_event_stream"),
+
+	# Monitoring
+	path("cache/stats/", views.cache_stats_api, name="api_cache_stats"),
+
 	# Swagger UI API Docs
 	path('schema/', SpectacularAPIView.as_view(), name='schema'),
 	path('docs/swagger/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
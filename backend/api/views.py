@@ -1,15 +1,72 @@
-from rest_framework import status
+from collections.abc import Iterable
+from datetime import timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.core import signing
+from django.http import Http404, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+from rest_framework import serializers, status
 from rest_framework.response import Response
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, parser_classes, permission_classes, renderer_classes, throttle_classes
+from rest_framework.pagination import _positive_int
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
+from rest_framework.utils.urls import replace_query_param
+from base import dashboard, ical, recurrence, schedule, search
+from base.forms import EventFilterForm
+from base.cache import cache_response, cached, invalidate_on_commit
+from base.cache import stats as cache_stats
 from base.models import Event, EventRequest, System
-from .serializers import EventSerializer, EventRequestSerializer, SystemSerializer
-from rest_framework.permissions import IsAuthenticated
+from base.system_names import filter_by_system
+from base.services import SeatConflict, moderate_requests, request_to_join, set_request_status
+from .pagination import EventCursorPagination
+from .parsers import NDJSONParser
+from .renderers import FastJSONRenderer, NDJSONRenderer
+from .serializers import (
+	EventCardSerializer,
+	EventSerializer,
+	EventRequestSerializer,
+	JoinRequestDecisionResultSerializer,
+	JoinRequestDecisionSerializer,
+	OccurrenceSerializer,
+	OccurrenceWindowSerializer,
+	ScheduleConflictSerializer,
+	SystemSerializer,
+	EVENT_LIST_VIEWS,
+	event_list_serializer,
+)
+from .throttling import CREDENTIALS_THROTTLES
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from django.contrib.auth.models import User
 from rest_framework import status
 from django.shortcuts import get_object_or_404
-from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter, OpenApiResponse, OpenApiExample
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, extend_schema_view, inline_serializer, OpenApiParameter, OpenApiResponse, OpenApiExample
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
+# Largest number of decisions accepted by one bulk moderation call
+MAX_MODERATION_BATCH = 500
+
+# Longest date window of the occurrence calendar
+MAX_OCCURRENCE_WINDOW = timedelta(days=366)
+
+# Deepest search result page served; later pages are served as this one
+MAX_SEARCH_PAGE = 100
+
+# Signing namespace of the calendar feed tokens
+CALENDAR_FEED_SALT = "api.calendar-feed"
+
+# Bulk import/export batch sizes
+IMPORT_CHUNK_SIZE = 1000
+EXPORT_CHUNK_SIZE = 2000
+MAX_IMPORT_ERRORS = 100
+
 param_event_id = OpenApiParameter(
 	name="event_id",
 	type=int,
@@ -40,9 +97,10 @@ param_system_id = OpenApiParameter(
 	operation_id="listEvents",
 	summary="Get Events",
 	description=(
-		"Retrieve a list of all events, ordered by how soon their `date_start` is. "
-		"Optionally, filter events by TTRPG system using the `system` query parameter. "
-		"If no filter is applied, all events are returned."
+		"Retrieve a page of events, ordered by how soon their `date_start` is (events without "
+		"a date come last). Optionally, filter events by TTRPG system using the `system` query parameter. "
+		"Pages are addressed by opaque cursors: follow the `next` and `previous` links of the "
+		"response to move through the list."
 	),
 	parameters=[
 		OpenApiParameter(
@@ -57,26 +115,117 @@ param_system_id = OpenApiParameter(
 					response_only=True
 				)
 			]
-		)
+		),
+		OpenApiParameter(
+			name="date_from",
+			description="Only events starting at or after this ISO 8601 datetime.",
+			required=False,
+			type=OpenApiTypes.DATETIME,
+		),
+		OpenApiParameter(
+			name="date_to",
+			description="Only events starting at or before this ISO 8601 datetime.",
+			required=False,
+			type=OpenApiTypes.DATETIME,
+		),
+		OpenApiParameter(
+			name="upcoming",
+			description="If true, only events that have not started yet.",
+			required=False,
+			type=bool,
+		),
+		OpenApiParameter(
+			name="online",
+			description="If true, only online events; if false, only in-person events.",
+			required=False,
+			type=bool,
+		),
+		OpenApiParameter(
+			name="organizer",
+			description="Only events organized by the user with this username.",
+			required=False,
+			type=str,
+		),
+		OpenApiParameter(
+			name="has_seats",
+			description="If true, only events that can still take another approved player.",
+			required=False,
+			type=bool,
+		),
+		OpenApiParameter(
+			name="view",
+			description=(
+				"`full` (default) renders every event field; `card` renders the compact "
+				"`EventCard` representation (id, title, system, date_start, online and seats), "
+				"which also reads far fewer columns."
+			),
+			required=False,
+			type=str,
+			enum=list(EVENT_LIST_VIEWS),
+		),
+		OpenApiParameter(
+			name="fields",
+			description="Comma-separated fields to render, e.g. `id,title,date_start`. Only the columns they need are read.",
+			required=False,
+			type=str,
+		),
+		OpenApiParameter(
+			name="omit",
+			description="Comma-separated fields to leave out, e.g. `description,players`.",
+			required=False,
+			type=str,
+		),
+		OpenApiParameter(
+			name="cursor",
+			description="Opaque cursor taken from the `next` or `previous` link of a previous page.",
+			required=False,
+			type=str,
+		),
+		OpenApiParameter(
+			name="page_size",
+			description=f"Number of events per page (at most {EventCursorPagination.max_page_size}).",
+			required=False,
+			type=int,
+		),
 	],
-	responses=OpenApiResponse(
-		response=EventSerializer(many=True),
-		description="List of events matching the filter (or all events if no filter)."
-	),
+	responses={
+		200: OpenApiResponse(
+			response=inline_serializer(
+				name="PaginatedEventList",
+				fields={
+					"next": serializers.URLField(allow_null=True),
+					"previous": serializers.URLField(allow_null=True),
+					"results": EventSerializer(many=True),
+				},
+			),
+			description="A page of events matching the filters (or all events if no filter)."
+		),
+		400: OpenApiResponse(description="Invalid filter value or unknown field name. The response maps each parameter to its errors."),
+	},
 )
+@cache_response("events")
 @api_view(["GET"])
+@renderer_classes([FastJSONRenderer, BrowsableAPIRenderer])
 # @permission_classes([IsAuthenticated])
 def getData(request):
-	"""Receive all Events, ordered by how soon their date_start is"""
-	events = Event.objects.all()
+	"""Receive a page of Events, ordered by how soon their date_start is"""
+	serializer_class, fields = event_list_serializer(request.query_params)
+	events = serializer_class.listing(fields)
 
 	# Filtering by system name
 	system_name = request.GET.get("system")
 	if system_name:
-		events = events.filter(system__name__iexact=system_name)
+		events = filter_by_system(events, system_name)
 
-	serializer = EventSerializer(events, many=True)
-	return Response(serializer.data)
+	filters = EventFilterForm(request.GET)
+	if not filters.is_valid():
+		return Response(filters.errors, status=status.HTTP_400_BAD_REQUEST)
+	events = filters.filter(events)
+
+	paginator = EventCursorPagination()
+	page = paginator.paginate_queryset(events, request)
+	serializer = serializer_class(page, many=True, fields=fields)
+	return paginator.get_paginated_response(serializer.data)
 
 @extend_schema(
 	tags=["Events"],
@@ -136,6 +285,8 @@ def getData(request):
 				"online": True,
 				"location": "Deathbringer discord server",
 				"max_players": 6,
+				"approved_count": 0,
+				"pending_count": 0,
 				"created": "2025-10-04T17:18:26.562903+03:00",
 				"updated_at": "2025-10-04T17:18:26.562903+03:00"
 			},
@@ -195,6 +346,8 @@ def addEvent(request):
 					"online": True,
 					"location": "Kyiv, downtown",
 					"max_players": 3,
+					"approved_count": 2,
+					"pending_count": 0,
 					"created": "2025-10-02T18:26:03.059575+03:00",
 					"updated_at": "2025-10-03T18:25:17.113148+03:00",
 				},
@@ -259,6 +412,8 @@ def addEvent(request):
 					"online": True,
 					"location": "Kyiv, downtown",
 					"max_players": 4,
+					"approved_count": 2,
+					"pending_count": 0,
 					"created": "2025-10-02T18:26:03.059575+03:00",
 					"updated_at": "2025-10-04T10:00:00+03:00",
 				},
@@ -313,6 +468,8 @@ def addEvent(request):
 					"online": True,
 					"location": "Kyiv, downtown",
 					"max_players": 3,
+					"approved_count": 2,
+					"pending_count": 0,
 					"created": "2025-10-02T18:26:03.059575+03:00",
 					"updated_at": "2025-10-04T11:20:00+03:00",
 				},
@@ -351,12 +508,12 @@ def addEvent(request):
 @permission_classes([IsAuthenticated])
 def editEvent(request, event_id):
 	try:
-		event = Event.objects.get(pk=event_id)
+		event = Event.objects.for_listing().get(pk=event_id)
 	except Event.DoesNotExist:
 		return Response(status=status.HTTP_404_NOT_FOUND)
 
 	# Only organizer can edit/delete
-	if event.organizer != request.user and request.method in ["PUT", "PATCH", "DELETE"]:
+	if event.organizer_id != request.user.pk and request.method in ["PUT", "PATCH", "DELETE"]:
 		return Response({"detail": "Not authorized."}, status=status.HTTP_403_FORBIDDEN)
 
 	if request.method == 'GET':
@@ -381,6 +538,248 @@ def editEvent(request, event_id):
 		event.delete()
 		return Response({"detail": "Deleted successfully."}, status=status.HTTP_204_NO_CONTENT)
 
+@extend_schema(
+	tags=["Events"],
+	operation_id="searchEvents",
+	summary="Search events",
+	description=(
+		"Full-text search over the title, game setting, description and location of events. "
+		"Every word of `q` must match (words also match as prefixes); results are ranked by relevance. "
+		"The search runs on a dedicated full-text index instead of scanning every event."
+	),
+	parameters=[
+		OpenApiParameter(name="q", description="Words to search for.", required=True, type=str),
+		OpenApiParameter(name="page", description=f"1-based page number (at most {MAX_SEARCH_PAGE}).", required=False, type=int),
+		OpenApiParameter(
+			name="page_size",
+			description=f"Number of events per page (at most {EventCursorPagination.max_page_size}).",
+			required=False,
+			type=int,
+		),
+	],
+	responses={
+		200: OpenApiResponse(
+			response=inline_serializer(
+				name="PaginatedEventSearch",
+				fields={
+					"next": serializers.URLField(allow_null=True),
+					"previous": serializers.URLField(allow_null=True),
+					"results": EventSerializer(many=True),
+				},
+			),
+			description="A page of matching events, best match first."
+		),
+		400: OpenApiResponse(description="Missing `q` parameter or invalid page number."),
+	},
+)
+@api_view(["GET"])
+def search_events(request):
+	text = request.GET.get("q", "").strip()
+	if not text:
+		return Response({"detail": "The q parameter is required."}, status=status.HTTP_400_BAD_REQUEST)
+
+	page_size = EventCursorPagination().get_page_size(request)
+	try:
+		page = _positive_int(request.GET.get("page", "1"), strict=True, cutoff=MAX_SEARCH_PAGE)
+	except ValueError:
+		return Response({"page": ["A positive integer is required."]}, status=status.HTTP_400_BAD_REQUEST)
+
+	ids = search.search_event_ids(text, limit=page_size + 1, offset=(page - 1) * page_size)
+	has_next = len(ids) > page_size
+	ids = ids[:page_size]
+	events = Event.objects.for_listing().in_bulk(ids)
+	results = [events[pk] for pk in ids if pk in events]
+
+	url = request.build_absolute_uri()
+	return Response({
+		"next": replace_query_param(url, "page", page + 1) if has_next else None,
+		"previous": replace_query_param(url, "page", page - 1) if page > 1 else None,
+		"results": EventSerializer(results, many=True).data,
+	})
+
+@extend_schema(
+	tags=["Events"],
+	operation_id="listOccurrences",
+	summary="List sessions in a date window",
+	description=(
+		"Every session starting in `[start, end)`: one-off events and the occurrences of recurring "
+		"events. Occurrences are computed from the recurrence rule for the requested window only; "
+		"`event` is the id of the Event row of the session when it exists (the recurring event "
+		"itself, or an occurrence materialized with `manage.py materialize_occurrences`). "
+		f"The window may span at most {MAX_OCCURRENCE_WINDOW.days} days."
+	),
+	parameters=[
+		OpenApiParameter(name="start", description="Start of the window (ISO 8601).", required=True, type=OpenApiTypes.DATETIME),
+		OpenApiParameter(name="end", description="End of the window, exclusive (ISO 8601).", required=True, type=OpenApiTypes.DATETIME),
+	],
+	responses={
+		200: OpenApiResponse(response=OccurrenceSerializer(many=True), description="Sessions ordered by start."),
+		400: OpenApiResponse(description="Missing or invalid window."),
+	},
+)
+@cache_response("events")
+@api_view(["GET"])
+def list_occurrences(request):
+	window = OccurrenceWindowSerializer(data=request.query_params, context={"max_window": MAX_OCCURRENCE_WINDOW})
+	if not window.is_valid():
+		return Response(window.errors, status=status.HTTP_400_BAD_REQUEST)
+	start, end = window.validated_data["start"], window.validated_data["end"]
+
+	events = Event.objects.select_related("organizer", "system")
+	series = list(events.series_in(start, end))
+	occurrences = [occurrence for event in series for occurrence in recurrence.occurrences(event, start, end)]
+	materialized = {}
+	if occurrences:
+		rows = events.filter(recurrence_parent__in=series, recurrence_index__in={occurrence.index for occurrence in occurrences})
+		materialized = {(row.recurrence_parent_id, row.recurrence_index): row for row in rows}
+
+	sessions = []
+	for occurrence in occurrences:
+		series_event = occurrence.event
+		row = series_event if occurrence.index == 0 else materialized.get((series_event.pk, occurrence.index))
+		sessions.append(session_data(row or series_event, occurrence, series_event.pk, row is not None))
+	for event in events.filter(recurrence="", recurrence_parent__isnull=True, date_start__gte=start, date_start__lt=end):
+		sessions.append(session_data(event, recurrence.Occurrence(event, 0, event.date_start, event.date_end), None, True))
+
+	sessions.sort(key=lambda session: (session["date_start"], session["series"] or 0, session["index"]))
+	return Response(OccurrenceSerializer(sessions, many=True).data)
+
+def session_data(event, occurrence, series_id, stored):
+	"""A calendar entry for `occurrence`, described by `event` (its own row, or its series)."""
+	return {
+		"series": series_id,
+		"index": occurrence.index,
+		"event": event.pk if stored else None,
+		"title": event.title,
+		"system": event.system.name if event.system else None,
+		"organizer": event.organizer.username if event.organizer else None,
+		"date_start": event.date_start if stored else occurrence.date_start,
+		"date_end": event.date_end if stored else occurrence.date_end,
+		"online": event.online,
+		"location": event.location,
+	}
+
+##########################
+# Bulk import and export #
+##########################
+
+@extend_schema(
+	tags=["Events"],
+	operation_id="importEvents",
+	summary="Import events in bulk",
+	description=(
+		"Create many events in one call. The body is either a JSON array or an NDJSON stream "
+		"(`Content-Type: application/x-ndjson`, one event per line) of `createEvent` payloads. "
+		f"Events are validated in chunks of {IMPORT_CHUNK_SIZE} and inserted with bulk inserts. The import is all-or-nothing: if any event is invalid, "
+		"nothing is created and the errors are returned with the index of the offending event. "
+		"The authenticated user becomes the organizer of every imported event."
+	),
+	request={
+		"application/json": EventSerializer(many=True),
+		"application/x-ndjson": EventSerializer,
+	},
+	responses={
+		201: OpenApiResponse(
+			response={"application/json": {"example": {"created": 1250}}},
+			description="All events were imported."
+		),
+		400: OpenApiResponse(
+			response={"application/json": {"example": {"created": 0, "errors": [{"index": 3, "errors": {"system": ["Object with name=Unknown does not exist."]}}]}}},
+			description="Malformed body or invalid events; nothing was imported."
+		),
+		401: OpenApiResponse(
+			description="Authentication credentials were not provided or token invalid.",
+			examples=[OpenApiExample("Unauthorized", value={"detail": "token_not_valid"}, response_only=True)],
+		),
+	},
+)
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+@parser_classes([JSONParser, NDJSONParser])
+def import_events(request):
+	payloads = request.data
+	if isinstance(payloads, (dict, str)) or not isinstance(payloads, Iterable):
+		return Response({"detail": "Expected a JSON array or an NDJSON stream of events."}, status=status.HTTP_400_BAD_REQUEST)
+
+	created = 0
+	errors = []
+	with transaction.atomic():
+		for offset, chunk in enumerate_chunks(payloads, IMPORT_CHUNK_SIZE):
+			serializer = EventSerializer(data=chunk, many=True, context={"request": request})
+			if not serializer.is_valid():
+				errors.extend(
+					{"index": offset + index, "errors": item_errors}
+					for index, item_errors in enumerate(serializer.errors) if item_errors
+				)
+			if errors:
+				# Keep validating to report every error, but stop writing
+				if len(errors) >= MAX_IMPORT_ERRORS:
+					break
+				continue
+			events = [Event(organizer=request.user, **data) for data in serializer.validated_data]
+			for event in events:
+				event.set_recurrence_end()
+			created += len(Event.objects.bulk_create(events))
+			search.index_events(events)
+		invalidate_on_commit("events")
+		dashboard.invalidate_users_on_commit(request.user.pk)
+
+		if errors:
+			transaction.set_rollback(True)
+			return Response({"created": 0, "errors": errors[:MAX_IMPORT_ERRORS]}, status=status.HTTP_400_BAD_REQUEST)
+	return Response({"created": created}, status=status.HTTP_201_CREATED)
+
+@extend_schema(
+	tags=["Events"],
+	operation_id="exportEvents",
+	summary="Export all events",
+	description=(
+		"Stream every event as NDJSON (one `getEventById`-shaped object per line), ordered by id. "
+		"The response is generated while the database is read in chunks, so it works for any "
+		"number of events. The output can be fed back to `importEvents`. Accepts the same "
+		"`system` filter as the event list."
+	),
+	parameters=[
+		OpenApiParameter(
+			name="system",
+			description="Only export events of this system (case-insensitive name).",
+			required=False,
+			type=str,
+		),
+	],
+	responses={
+		(200, "application/x-ndjson"): OpenApiResponse(
+			response=EventSerializer,
+			description="One event per line."
+		),
+	},
+)
+@api_view(["GET"])
+@renderer_classes([NDJSONRenderer, JSONRenderer])
+def export_events(request):
+	events = Event.objects.for_listing().order_by("id")
+
+	system_name = request.GET.get("system")
+	if system_name:
+		events = filter_by_system(events, system_name)
+
+	exporter = EventSerializer(context={"request": request})
+	lines = (
+		NDJSONRenderer.render_line(exporter.to_representation(event))
+		for event in events.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+	)
+	response = StreamingHttpResponse(lines, content_type=NDJSONRenderer.media_type)
+	response["Content-Disposition"] = 'attachment; filename="events.ndjson"'
+	return response
+
+def enumerate_chunks(items, size):
+	"""Yield (offset, list) chunks of `items`, which may be a lazy iterator."""
+	iterator = iter(items)
+	offset = 0
+	while chunk := list(islice(iterator, size)):
+		yield offset, chunk
+		offset += len(chunk)
+
 ##################
 # Authentication #
 ##################
@@ -413,9 +812,12 @@ def editEvent(request, event_id):
 			response={"application/json": {"example": {"error": "Username already taken"}}},
 			description="Invalid input or username already taken."
 		),
+		429: OpenApiResponse(description="Too many login or signup attempts from this address or for this username."),
 	},
 )
 @api_view(["POST"])
+@permission_classes([AllowAny])
+@throttle_classes(CREDENTIALS_THROTTLES)
 def signup(request):
 	username = request.data.get("username")
 	password = request.data.get("password")
@@ -464,6 +866,7 @@ def signup(request):
 					"detail": {"type": "string", "example": "No active account found with the given credentials"}
 				},
 			},
+			429: OpenApiResponse(description="Too many login or signup attempts from this address or for this username."),
 		},
 		examples=[
 			OpenApiExample(
@@ -475,7 +878,7 @@ def signup(request):
 	)
 )
 class TokenObtainPairViewSchema(TokenObtainPairView):
-	pass
+	throttle_classes = CREDENTIALS_THROTTLES
 
 
 @extend_schema_view(
@@ -526,7 +929,7 @@ class TokenRefreshViewSchema(TokenRefreshView):
 	description=(
 		"Creates a pending join request for the given event. "
 		"The authenticated user cannot join their own event. "
-		"If the user already requested or the event is full, an error is returned."
+		"If the user already requested or the event is full, a 409 conflict is returned."
 	),
 	parameters=[param_event_id],
 	responses={
@@ -535,13 +938,14 @@ class TokenRefreshViewSchema(TokenRefreshView):
 			description="Join request successfully created and pending approval."
 		),
 		400: OpenApiResponse(
-			description="Bad request (already requested, event full, or organizer tried to join)."
+			description="Bad request (organizer tried to join)."
 		),
 		401: OpenApiResponse(
 				description="Authentication credentials were not provided or token invalid.",
 				examples=[OpenApiExample("Unauthorized", value={"detail": "token_not_valid"}, response_only=True)],
 			),
 		404: OpenApiResponse(description="Event not found."),
+		409: OpenApiResponse(description="Conflict (already requested, event full, or overlapping with another session of the player)."),
 	},
 	examples=[
 		OpenApiExample(
@@ -556,7 +960,7 @@ class TokenRefreshViewSchema(TokenRefreshView):
 			response_only=True,
 		),
 		OpenApiExample(
-			name="Already requested (400)",
+			name="Already requested (409)",
 			value={"detail": "You already requested to join this event."},
 			response_only=True,
 		),
@@ -574,58 +978,105 @@ def join_event_api(request, event_id):
 	event = get_object_or_404(Event, pk=event_id)
 
 	# Organizer cannot join their own event
-	if event.organizer == request.user:
+	if event.organizer_id == request.user.pk:
 		return Response({"detail": "You are the organizer of this event."}, status=status.HTTP_400_BAD_REQUEST)
 
-	# Check if already requested
-	if EventRequest.objects.filter(event=event, user=request.user).exists():
-		return Response({"detail": "You already requested to join this event."}, status=status.HTTP_400_BAD_REQUEST)
-
-	# Check capacity
-	if not event.has_space():
-		return Response({"detail": "This event is full."}, status=status.HTTP_400_BAD_REQUEST)
-
-	req = EventRequest.objects.create(event=event, user=request.user, status="pending")
+	try:
+		req = request_to_join(event, request.user)
+	except SeatConflict as exc:
+		return Response({"detail": str(exc)}, status=status.HTTP_409_CONFLICT)
 	return Response(EventRequestSerializer(req).data, status=status.HTTP_201_CREATED)
 
-@extend_schema(
-	tags=["Join Requests"],
-	operation_id="listJoinRequests",
-	summary="List join requests for an event",
-	description=(
-		"Returns all join requests for a specific event. "
-		"Only the organizer of the event can access this endpoint."
-	),
-	parameters=[param_event_id],
-	responses={
-		200: OpenApiResponse(
-			response=EventRequestSerializer(many=True),
-			description="List of join requests for this event."
+@extend_schema_view(
+	get=extend_schema(
+		tags=["Join Requests"],
+		operation_id="listJoinRequests",
+		summary="List join requests for an event",
+		description=(
+			"Returns all join requests for a specific event. "
+			"Only the organizer of the event can access this endpoint."
 		),
-		403: OpenApiResponse(description="User is not the organizer of this event."),
-		404: OpenApiResponse(description="Event not found."),
-	},
-	examples=[
-		OpenApiExample(
-			"Example response",
-			value=[
-				{"id": 1, "user": "yulik", "status": "pending"},
-				{"id": 2, "user": "bogdan", "status": "approved"},
-			],
-			response_only=True,
+		parameters=[param_event_id],
+		responses={
+			200: OpenApiResponse(
+				response=EventRequestSerializer(many=True),
+				description="List of join requests for this event."
+			),
+			403: OpenApiResponse(description="User is not the organizer of this event."),
+			404: OpenApiResponse(description="Event not found."),
+		},
+		examples=[
+			OpenApiExample(
+				"Example response",
+				value=[
+					{"id": 1, "user": "yulik", "status": "pending"},
+					{"id": 2, "user": "bogdan", "status": "approved"},
+				],
+				response_only=True,
+			),
+		],
+	),
+	patch=extend_schema(
+		tags=["Join Requests"],
+		operation_id="bulkUpdateJoinRequests",
+		summary="Approve or reject several join requests at once",
+		description=(
+			"Apply a list of `{id, status}` decisions to the join requests of this event in one "
+			"transaction. Decisions are applied in order: once the event is full, further approvals "
+			"are reported as `conflict` while the remaining decisions still apply. Each decision gets "
+			f"its own result. At most {MAX_MODERATION_BATCH} decisions per call. "
+			"Only the organizer of the event can perform this action."
 		),
-	],
+		parameters=[param_event_id],
+		request=JoinRequestDecisionSerializer(many=True),
+		responses={
+			200: OpenApiResponse(
+				response=JoinRequestDecisionResultSerializer(many=True),
+				description="Per-decision results, in the order they were sent."
+			),
+			400: OpenApiResponse(description="Malformed batch (not a list, unknown status, too many items)."),
+			403: OpenApiResponse(description="User is not the organizer of this event."),
+			404: OpenApiResponse(description="Event not found."),
+		},
+		examples=[
+			OpenApiExample(
+				"Moderation batch (request body)",
+				value=[
+					{"id": 5, "status": "approved"},
+					{"id": 6, "status": "approved"},
+					{"id": 7, "status": "rejected"},
+				],
+				request_only=True,
+			),
+			OpenApiExample(
+				"Moderation results (200)",
+				value=[
+					{"id": 5, "user": "playerX", "status": "approved", "result": "updated"},
+					{"id": 6, "user": "playerY", "status": "pending", "result": "conflict", "detail": "This event is full."},
+					{"id": 7, "user": "playerZ", "status": "rejected", "result": "updated"},
+				],
+				response_only=True,
+			),
+		],
+	),
 )
-@api_view(["GET"])
+@api_view(["GET", "PATCH"])
 @permission_classes([IsAuthenticated])
 def list_requests_api(request, event_id):
-	"""Organizer can see all join requests for their event."""
+	"""Organizer can see all join requests for their event, or moderate them in bulk."""
 	event = get_object_or_404(Event, pk=event_id)
 
-	if event.organizer != request.user:
+	if event.organizer_id != request.user.pk:
 		return Response({"detail": "Not authorized."}, status=status.HTTP_403_FORBIDDEN)
 
-	requests = event.requests.all()
+	if request.method == "PATCH":
+		serializer = JoinRequestDecisionSerializer(data=request.data, many=True, allow_empty=False, max_length=MAX_MODERATION_BATCH)
+		if not serializer.is_valid():
+			return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+		results = moderate_requests(event, serializer.validated_data)
+		return Response(JoinRequestDecisionResultSerializer(results, many=True).data)
+
+	requests = event.requests.select_related("user").order_by("id")
 	serializer = EventRequestSerializer(requests, many=True)
 	return Response(serializer.data)
 
@@ -635,7 +1086,8 @@ def list_requests_api(request, event_id):
 	summary="Approve or reject a join request",
 	description=(
 		"Allows the event organizer to approve or reject a player's join request. "
-		"Only the organizer can perform this action."
+		"Only the organizer can perform this action. Approving claims a seat atomically: "
+		"if the event is already full, a 409 conflict is returned."
 	),
 	parameters=[param_request_id],
 	request={
@@ -659,6 +1111,7 @@ def list_requests_api(request, event_id):
 		400: OpenApiResponse(description="Invalid status value."),
 		403: OpenApiResponse(description="User is not the organizer of this event."),
 		404: OpenApiResponse(description="Join request not found."),
+		409: OpenApiResponse(description="Event is full, the player has an overlapping session, or the request was changed concurrently."),
 	},
 	examples=[
 		OpenApiExample(
@@ -682,27 +1135,191 @@ def list_requests_api(request, event_id):
 			value={"detail": "Invalid status."},
 			response_only=True,
 		),
+		OpenApiExample(
+			"Event full (409)",
+			value={"detail": "This event is full."},
+			response_only=True,
+		),
 	],
 )
 @api_view(["PATCH"])
 @permission_classes([IsAuthenticated])
 def update_request_api(request, request_id):
 	"""Organizer approves or rejects a join request."""
-	join_request = get_object_or_404(EventRequest, pk=request_id)
+	join_request = get_object_or_404(EventRequest.objects.select_related("event"), pk=request_id)
 	event = join_request.event
 
-	if event.organizer != request.user:
+	if event.organizer_id != request.user.pk:
 		return Response({"detail": "Not authorized."}, status=status.HTTP_403_FORBIDDEN)
 
 	status_choice = request.data.get("status")
 	if status_choice not in ["approved", "rejected"]:
 		return Response({"detail": "Invalid status."}, status=status.HTTP_400_BAD_REQUEST)
 
-	join_request.status = status_choice
-	join_request.save()
+	try:
+		join_request = set_request_status(join_request, status_choice)
+	except SeatConflict as exc:
+		return Response({"detail": str(exc)}, status=status.HTTP_409_CONFLICT)
 
 	return Response(EventRequestSerializer(join_request).data)
 
+#############
+# My events #
+#############
+
+@extend_schema(
+	tags=["Events"],
+	operation_id="listMyEvents",
+	summary="List my sessions",
+	description=(
+		"Returns the events the authenticated user organizes (`organized`), was approved for "
+		"(`joined`) and is still waiting on (`pending`), ordered by start date. The response is "
+		"cached per user and refreshed whenever the user's join requests, the requests to their "
+		"events or their events change."
+	),
+	responses={
+		200: OpenApiResponse(
+			response=inline_serializer(
+				name="MyEvents",
+				fields={
+					"organized": EventSerializer(many=True),
+					"joined": EventSerializer(many=True),
+					"pending": EventSerializer(many=True),
+				},
+			),
+			description="The user's events, grouped by their role in them."
+		),
+		401: OpenApiResponse(description="Authentication credentials were not provided."),
+	},
+)
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def my_events(request):
+	"""Events the user organizes, joined, or asked to join."""
+	def build():
+		events = dashboard.user_events(request.user)
+		return {group: EventSerializer(group_events, many=True).data for group, group_events in events.items()}
+
+	data = cached(
+		[dashboard.namespace(request.user.pk)],
+		f"me-events:{request.user.pk}",
+		build,
+		timeout=settings.DASHBOARD_CACHE_TIMEOUT,
+	)
+	return Response(data)
+
+@extend_schema(
+	tags=["Events"],
+	operation_id="listMyConflicts",
+	summary="List my schedule conflicts",
+	description=(
+		"Returns every pair of overlapping sessions of the authenticated user, among the events "
+		"they organize and the ones they were approved for or are still waiting on. Events "
+		f"without `date_end` are assumed to last {int(schedule.DEFAULT_DURATION.total_seconds() // 3600)} hours; "
+		"events without a date are ignored. Joining or approving a request that would create a "
+		"conflict with an approved or organized session is refused with 409."
+	),
+	responses={
+		200: OpenApiResponse(
+			response=ScheduleConflictSerializer(many=True),
+			description="Overlapping pairs, ordered by the start of their second session."
+		),
+		401: OpenApiResponse(description="Authentication credentials were not provided."),
+	},
+)
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def my_conflicts(request):
+	"""Overlapping pairs among the user's sessions."""
+	def build():
+		own_request = EventRequest.objects.filter(event=OuterRef("pk"), user=request.user)
+		sessions = schedule.sessions_of(request.user, statuses=("approved", "pending")).annotate(
+			own_status=Subquery(own_request.values("status")[:1]),
+		)
+		pairs = [{"first": first, "second": second} for first, second in schedule.conflicting_pairs(sessions)]
+		return ScheduleConflictSerializer(pairs, many=True, context={"user": request.user}).data
+
+	data = cached(
+		[dashboard.namespace(request.user.pk)],
+		f"me-conflicts:{request.user.pk}",
+		build,
+		timeout=settings.DASHBOARD_CACHE_TIMEOUT,
+	)
+	return Response(data)
+
+##################
+# Calendar feeds #
+##################
+
+@extend_schema(
+	tags=["Events"],
+	operation_id="getMyCalendarFeed",
+	summary="Get my calendar feed URL",
+	description=(
+		"Returns the secret URL of the authenticated user's iCalendar feed: the events they "
+		"organize and the ones they were approved for. Calendar apps subscribe to it without "
+		"credentials, so it must not be shared. Every game system also has a public feed at "
+		"`/api/systems/{id}/events.ics`. Feeds send `ETag` and `Last-Modified`; pollers that "
+		"send them back get `304 Not Modified` while nothing changed."
+	),
+	responses={
+		200: OpenApiResponse(
+			response=inline_serializer(name="CalendarFeed", fields={"url": serializers.URLField()}),
+			description="The feed URL."
+		),
+		401: OpenApiResponse(description="Authentication credentials were not provided."),
+	},
+)
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def my_calendar_feed(request):
+	token = signing.dumps(request.user.pk, salt=CALENDAR_FEED_SALT, compress=True)
+	return Response({"url": request.build_absolute_uri(reverse("api_user_calendar", args=[token]))})
+
+@require_safe
+def user_calendar(request, token):
+	"""iCalendar feed of the sessions of the user `token` was issued to."""
+	try:
+		user_id = signing.loads(token, salt=CALENDAR_FEED_SALT)
+	except signing.BadSignature:
+		raise Http404("Unknown calendar feed.")
+	events = schedule.sessions_of(user_id)
+	return calendar_response(request, events, "My sessions", lambda: User.objects.filter(pk=user_id).exists(), private=True)
+
+@require_safe
+def system_calendar(request, system_id):
+	"""Public iCalendar feed of the events of a game system."""
+	events = Event.objects.filter(system_id=system_id)
+	system = System.objects.filter(pk=system_id)
+	name = lambda: system.values_list("name", flat=True).first()
+	return calendar_response(request, events, name, system.exists)
+
+def calendar_response(request, events, name, exists, private=False):
+	"""
+	Stream the iCalendar feed of `events`, or answer 304 when the poller's copy is current.
+	That check costs one aggregate query; `exists` and `name` (a string or a callable) are
+	only evaluated for feeds that are empty or actually generated.
+	"""
+	last_modified, etag = ical.feed_version(events)
+	if last_modified is None and not exists():
+		raise Http404("Unknown calendar feed.")
+	response = get_conditional_response(
+		request,
+		etag=etag,
+		last_modified=int(last_modified.timestamp()) if last_modified else None,
+	)
+	if response is None:
+		if callable(name):
+			name = name()
+		feed = ical.calendar(ical.feed_events(events), name, request.get_host(), request.build_absolute_uri("/"), chunk_size=EXPORT_CHUNK_SIZE)
+		response = StreamingHttpResponse(feed, content_type="text/calendar; charset=utf-8")
+		response["Content-Disposition"] = 'inline; filename="events.ics"'
+	response["ETag"] = etag
+	if last_modified:
+		response["Last-Modified"] = http_date(last_modified.timestamp())
+	patch_cache_control(response, no_cache=True, private=private, public=not private)
+	return response
+
 ################
 # Game Systems #
 ################
@@ -781,6 +1398,7 @@ def update_request_api(request, request_id):
 		],
 	),
 )
+@cache_response("systems")
 @api_view(["GET", "POST"])
 def system_list_create(request):
 	"""List all systems or create a new one."""
@@ -936,4 +1554,29 @@ def system_detail(request, system_id):
 
 	elif request.method == "DELETE":
 		system.delete()
-		return Response({"detail": "Deleted successfully."}, status=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+		return Response({"detail": "Deleted successfully."}, status=status.HTTP_204_NO_CONTENT)
+
+##############
+# Monitoring #
+##############
+
+@extend_schema(
+	tags=["Monitoring"],
+	operation_id="cacheStats",
+	summary="Response cache statistics",
+	description=(
+		"Hit/miss counters, hit ratio and number of invalidations of the public response cache "
+		"(`listEvents`, `listSystems`). Staff only."
+	),
+	responses={
+		200: OpenApiResponse(
+			response={"application/json": {"example": {"hits": 930, "misses": 70, "hit_ratio": 0.93, "invalidations": 12}}},
+			description="Counters since the cache was last cleared."
+		),
+		403: OpenApiResponse(description="User is not staff."),
+	},
+)
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def cache_stats_api(request):
+	return Response(cache_stats())
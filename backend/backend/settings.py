@@ -22,6 +22,8 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 import environ
 import os
 
+from base import hasher_profiles
+
 env = environ.Env()
 environ.Env.read_env()
 
@@ -65,6 +67,16 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Per-request timing and query metrics (see base.metrics): Server-Timing headers,
+# slow request logs and a Prometheus endpoint at /metrics
+REQUEST_METRICS = env.bool('REQUEST_METRICS', default=False)
+if REQUEST_METRICS:
+    MIDDLEWARE.insert(0, 'base.metrics.RequestMetricsMiddleware')
+# Requests slower than this many milliseconds are logged with their slowest queries
+METRICS_SLOW_REQUEST_MS = env.int('METRICS_SLOW_REQUEST_MS', default=500)
+# Clients allowed to scrape /metrics
+METRICS_ALLOWED_IPS = env.list('METRICS_ALLOWED_IPS', default=['127.0.0.1', '::1'])
+
 ROOT_URLCONF = 'backend.urls'
 
 TEMPLATES = [
@@ -90,13 +102,64 @@ WSGI_APPLICATION = 'backend.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# DATABASE_URL accepts any django-environ database URL, e.g.
+# postgres://user:password@db:5432/dnd for PostgreSQL; without it the project
+# runs on the local SQLite file.
+
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+    'default': env.db('DATABASE_URL', default=f'sqlite:///{BASE_DIR / "db.sqlite3"}'),
+}
+
+if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    DATABASES['default']['OPTIONS'] = {
+        # Take the write lock when a transaction starts, so concurrent
+        # writers queue up instead of failing on lock upgrades
+        'transaction_mode': 'IMMEDIATE',
+        'timeout': 20,
+    }
+    if env.bool('SQLITE_WAL', default=False):
+        # Single-node profile: readers no longer block the writer (and vice
+        # versa), and commits only fsync at checkpoints
+        DATABASES['default']['OPTIONS']['init_command'] = (
+            'PRAGMA journal_mode=WAL;'
+            'PRAGMA synchronous=NORMAL;'
+        )
+    DATABASES['default']['TEST'] = {
+        # On disk rather than in memory, so concurrency tests see real SQLite locking
+        'NAME': BASE_DIR / 'test_db.sqlite3',
     }
+elif DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+    # Reuse connections across requests and check them before use
+    DATABASES['default']['CONN_MAX_AGE'] = env.int('DB_CONN_MAX_AGE', default=60)
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+    DB_POOL_MAX_SIZE = env.int('DB_POOL_MAX_SIZE', default=0)
+    if DB_POOL_MAX_SIZE:
+        # psycopg's connection pool replaces persistent connections
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {
+            'min_size': env.int('DB_POOL_MIN_SIZE', default=2),
+            'max_size': DB_POOL_MAX_SIZE,
+            'timeout': env.int('DB_POOL_TIMEOUT', default=10),
+        }
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# CACHE_URL accepts any django-environ cache URL, e.g. redis://127.0.0.1:6379/1
+
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
 }
 
+# Seconds a cached public API response is kept (it is invalidated on writes anyway)
+API_CACHE_TIMEOUT = env.int('API_CACHE_TIMEOUT', default=300)
+
+# Seconds a user's "my sessions" dashboard is kept (see base.dashboard)
+DASHBOARD_CACHE_TIMEOUT = env.int('DASHBOARD_CACHE_TIMEOUT', default=60)
+
+# Seconds a worker serves its in-memory map of system names before reloading it, for
+# changes made by other workers when the cache is not shared (see base.system_names)
+SYSTEM_NAMES_TTL = env.int('SYSTEM_NAMES_TTL', default=30)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -116,6 +179,13 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing (see base.hashers and base.hasher_profiles): the profile new passwords are stored with and
+# its cost (0 keeps Django's default). Other profiles are rehashed on the next login.
+PASSWORD_HASHER_PROFILES = hasher_profiles.PROFILES
+PASSWORD_HASHER = env('PASSWORD_HASHER', default='pbkdf2')
+PASSWORD_HASHER_COST = env.int('PASSWORD_HASHER_COST', default=0)
+PASSWORD_HASHERS = hasher_profiles.hashers_for(PASSWORD_HASHER)
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
@@ -145,14 +215,32 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.StatelessJWTAuthentication',
     ),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticatedOrReadOnly",
     ),
+    # Attempts on token/ and signup/, checked before any password is hashed (see api.throttling)
+    'DEFAULT_THROTTLE_RATES': {
+        'credentials_ip': env('CREDENTIALS_RATE_IP', default='60/min'),
+        'credentials_username': env('CREDENTIALS_RATE_USERNAME', default='10/min'),
+    },
 }
 
+# Access tokens carry the username and staff status, so that API requests are
+# authenticated without loading the user (see api.authentication)
+SIMPLE_JWT = {
+    'TOKEN_OBTAIN_SERIALIZER': 'api.authentication.ClaimsTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'api.authentication.ClaimsTokenRefreshSerializer',
+}
+
+# Pub/sub backend of the live event streams (see base.broker)
+EVENT_BROKER_BACKEND = env('EVENT_BROKER_BACKEND', default='base.broker.LocalBroker')
+
+# Number of events per page of the API event list (see api.pagination)
+EVENT_PAGE_SIZE = env.int("EVENT_PAGE_SIZE", default=20)
+
 SPECTACULAR_SETTINGS = {
     'TITLE': 'DnD Session Planner API',
     'DESCRIPTION': "API for planning tabletop RPG events.",
@@ -3,10 +3,10 @@ from .models import *
 
 # Register your models here.
 class EventAdmin(admin.ModelAdmin):
-	list_display = ("id", "title", "organizer", "system", "game_setting", "online", "max_players", "date_start", "updated_at", "created")
+	list_display = ("id", "title", "organizer", "system", "game_setting", "online", "max_players", "approved_count", "pending_count", "date_start", "updated_at", "created")
 	list_display_links = ("title",)
 	search_fields = ("title", "game_setting", "description", "location",)
-	list_filter = ("system", "online",)
+	list_filter = ("system", "online", "recurrence",)
 	readonly_fields = ("date_start", "updated_at", "created")
 
 class SystemAdmin(admin.ModelAdmin):
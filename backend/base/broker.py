@@ -0,0 +1,155 @@
+"""
+Publish/subscribe of live event updates.
+
+Writers queue a notification with notify_on_commit(); once their transaction commits,
+the current seat counts of the event (and the new status of the join requests that
+changed) are published on the event's channel, and every Server-Sent Events stream
+subscribed to it (see api.async_views.event_stream) passes them on to its client.
+
+settings.EVENT_BROKER_BACKEND selects the Broker implementation. The default
+LocalBroker only reaches subscribers of its own process, which is enough for a single
+ASGI worker; deployments with several workers plug in a Broker subclass backed by a
+shared bus (e.g. Redis pub/sub).
+"""
+import asyncio
+import threading
+from functools import lru_cache, partial
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+from .models import Event
+
+
+class Subscription:
+	"""Messages of one channel for one consumer, handed over to the event loop that subscribed."""
+
+	def __init__(self, broker, channel, max_pending=100):
+		self.broker = broker
+		self.channel = channel
+		self.loop = asyncio.get_running_loop()
+		self.queue = asyncio.Queue(maxsize=max_pending)
+
+	def deliver(self, message):
+		"""Queue `message` for the consumer. Safe to call from any thread."""
+		try:
+			self.loop.call_soon_threadsafe(self.put, message)
+		except RuntimeError:
+			# The consumer's loop is gone
+			self.close()
+
+	def put(self, message):
+		if self.queue.full():
+			# A stalled client only needs the latest state, drop its oldest message
+			self.queue.get_nowait()
+		self.queue.put_nowait(message)
+
+	async def get(self, timeout):
+		"""The next message, or None if none arrived within `timeout` seconds."""
+		try:
+			return await asyncio.wait_for(self.queue.get(), timeout)
+		except asyncio.TimeoutError:
+			return None
+
+	def close(self):
+		self.broker.unsubscribe(self)
+
+
+class Broker:
+	"""Interface of the EVENT_BROKER_BACKEND implementations."""
+
+	def publish(self, channel, message):
+		"""Deliver `message` (a JSON-serializable dict) to every subscription of `channel`."""
+		raise NotImplementedError
+
+	def subscribe(self, channel):
+		"""Return a Subscription to `channel`. Must be called from a running event loop."""
+		raise NotImplementedError
+
+	def unsubscribe(self, subscription):
+		raise NotImplementedError
+
+	def has_subscribers(self, channel):
+		"""Whether publishing on `channel` may reach anyone (lets writers skip building messages)."""
+		return True
+
+
+class LocalBroker(Broker):
+	"""Broker reaching the subscribers of the current process only."""
+
+	def __init__(self):
+		self.lock = threading.Lock()
+		self.subscriptions = {}
+
+	def publish(self, channel, message):
+		with self.lock:
+			subscriptions = list(self.subscriptions.get(channel, ()))
+		for subscription in subscriptions:
+			subscription.deliver(message)
+		return len(subscriptions)
+
+	def subscribe(self, channel):
+		subscription = Subscription(self, channel)
+		with self.lock:
+			self.subscriptions.setdefault(channel, set()).add(subscription)
+		return subscription
+
+	def unsubscribe(self, subscription):
+		with self.lock:
+			subscriptions = self.subscriptions.get(subscription.channel, set())
+			subscriptions.discard(subscription)
+			if not subscriptions:
+				self.subscriptions.pop(subscription.channel, None)
+
+	def has_subscribers(self, channel):
+		return channel in self.subscriptions
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+	return import_string(settings.EVENT_BROKER_BACKEND)()
+
+
+def event_channel(event_id):
+	return f"event:{event_id}"
+
+
+def seats_message(event):
+	return {
+		"approved_count": event.approved_count,
+		"pending_count": event.pending_count,
+		"max_players": event.max_players,
+		"has_space": event.has_space(),
+	}
+
+
+def request_change(join_request, deleted=False):
+	"""Describe the new state of `join_request` for notify_on_commit()."""
+	return {
+		"type": "request",
+		"id": join_request.pk,
+		"user_id": join_request.user_id,
+		"status": None if deleted else join_request.status,
+	}
+
+
+def notify(event_id, changes=(), closed=False):
+	"""Publish `changes` and the current seat counts of the event to its live streams."""
+	broker = get_broker()
+	channel = event_channel(event_id)
+	if not broker.has_subscribers(channel):
+		return
+	for change in changes:
+		broker.publish(channel, change)
+	if closed:
+		broker.publish(channel, {"type": "closed"})
+		return
+	event = Event.objects.filter(pk=event_id).only("approved_count", "pending_count", "max_players").first()
+	if event is not None:
+		broker.publish(channel, {"type": "seats", **seats_message(event)})
+
+
+def notify_on_commit(event_id, changes=(), closed=False):
+	"""notify() once the current transaction commits, so streams never show rolled back changes."""
+	transaction.on_commit(partial(notify, event_id, list(changes), closed))
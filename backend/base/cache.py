@@ -0,0 +1,153 @@
+"""
+Response caching for the public read endpoints.
+
+Cached entries are keyed by a set of namespaces ("events", "systems", ...). Each
+namespace has a version number stored in the cache; bumping it with invalidate()
+orphans every entry built from the old version, which then simply expires. The
+signal handlers in base.signals bump the namespaces whenever the underlying rows
+change, and code paths that bypass signals (bulk_create, bulk_update, queryset
+updates) call invalidate_on_commit() themselves.
+"""
+from functools import partial, wraps
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags, quote_etag
+
+STATS = ("hits", "misses", "invalidations")
+
+
+def namespace_key(namespace):
+	return f"cache-ns:{namespace}"
+
+
+def namespace_version(namespace):
+	version = cache.get(namespace_key(namespace))
+	if version is None:
+		cache.add(namespace_key(namespace), 1, timeout=None)
+		version = cache.get(namespace_key(namespace), 1)
+	return version
+
+
+def invalidate(*namespaces):
+	"""Drop every cached response built from any of `namespaces`."""
+	for namespace in namespaces:
+		try:
+			cache.incr(namespace_key(namespace))
+		except ValueError:
+			cache.set(namespace_key(namespace), 2, timeout=None)
+		record("invalidations")
+
+
+def invalidate_on_commit(*namespaces):
+	"""invalidate() once the current transaction commits, so readers never re-cache stale rows."""
+	transaction.on_commit(partial(invalidate, *namespaces))
+
+
+def record(stat):
+	key = f"cache-stats:{stat}"
+	if not cache.add(key, 1, timeout=None):
+		try:
+			cache.incr(key)
+		except ValueError:
+			cache.set(key, 1, timeout=None)
+
+
+def stats():
+	values = cache.get_many([f"cache-stats:{stat}" for stat in STATS])
+	hits, misses, invalidations = (values.get(f"cache-stats:{stat}", 0) for stat in STATS)
+	lookups = hits + misses
+	return {
+		"hits": hits,
+		"misses": misses,
+		"hit_ratio": hits / lookups if lookups else 0.0,
+		"invalidations": invalidations,
+	}
+
+
+def cached(namespaces, key, compute, timeout=None):
+	"""
+	Return the cached result of compute() for `key`, built from `namespaces`.
+
+	For per-user data that cache_response() cannot serve; the result must be picklable.
+	"""
+	versions = ".".join(f"{namespace}{namespace_version(namespace)}" for namespace in namespaces)
+	full_key = f"cache-data:{versions}:{key}"
+	value = cache.get(full_key)
+	if value is not None:
+		record("hits")
+		return value
+	record("misses")
+	value = compute()
+	cache.set(full_key, value, settings.API_CACHE_TIMEOUT if timeout is None else timeout)
+	return value
+
+
+def response_cache_key(request, namespaces):
+	versions = ".".join(f"{namespace}{namespace_version(namespace)}" for namespace in namespaces)
+	query = sorted((key, sorted(values)) for key, values in request.GET.lists())
+	# Bodies can hold absolute URLs (pagination links), built from the scheme and host
+	fingerprint = md5(repr((
+		request.scheme, request.get_host(), request.path, query, request.META.get("HTTP_ACCEPT", ""),
+	)).encode()).hexdigest()
+	return f"cache-response:{versions}:{fingerprint}"
+
+
+def not_modified(request, etag):
+	if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+	if not if_none_match:
+		return False
+	etags = parse_etags(if_none_match)
+	return "*" in etags or etag in etags
+
+
+def shareable(response):
+	"""Whether `response` may be served to other users: the browsable API embeds the viewer's CSRF token."""
+	renderer = getattr(response, "accepted_renderer", None)
+	return renderer is None or renderer.format != "api"
+
+
+def cache_response(*namespaces, timeout=None):
+	"""
+	Cache successful GET responses of a view under `namespaces`, and answer matching
+	`If-None-Match` requests with 304 Not Modified.
+
+	Only use it on views whose output is the same for every user. Browsable API pages
+	are rendered for each request.
+	"""
+	def decorator(view):
+		@wraps(view)
+		def wrapper(request, *args, **kwargs):
+			if request.method not in ("GET", "HEAD"):
+				return view(request, *args, **kwargs)
+
+			key = response_cache_key(request, namespaces)
+			entry = cache.get(key)
+			if entry is not None:
+				record("hits")
+				response = HttpResponse(entry["content"], content_type=entry["content_type"])
+			else:
+				record("misses")
+				response = view(request, *args, **kwargs)
+				if response.status_code != 200 or response.streaming or not shareable(response):
+					return response
+				if hasattr(response, "render"):
+					response.render()
+				entry = {
+					"content": response.content,
+					"content_type": response["Content-Type"],
+					"etag": quote_etag(md5(response.content).hexdigest()),
+				}
+				cache.set(key, entry, settings.API_CACHE_TIMEOUT if timeout is None else timeout)
+
+			if not_modified(request, entry["etag"]):
+				response = HttpResponseNotModified()
+			response["ETag"] = entry["etag"]
+			patch_vary_headers(response, ["Accept"])
+			return response
+		return wrapper
+	return decorator
@@ -0,0 +1,62 @@
+"""
+The "my sessions" dashboard of a user: the events they organize, the ones they were
+approved for and the ones they are still waiting on.
+
+Each user's dashboard is cached under its own "me:<user id>" namespace. It is bumped
+when the user's join requests change, when requests to the events they organize
+change, and when one of those events is edited or deleted (see base.signals and
+base.services). Seat counts of joined events that move because of other players'
+requests are refreshed when the entry expires (settings.DASHBOARD_CACHE_TIMEOUT).
+"""
+from django.db.models import F
+
+from .cache import invalidate_on_commit
+from .models import Event, EventRequest
+
+LISTED_STATUSES = ("approved", "pending")
+
+
+def namespace(user_id):
+	return f"me:{user_id}"
+
+
+def invalidate_users_on_commit(*user_ids):
+	namespaces = {namespace(user_id) for user_id in user_ids if user_id is not None}
+	if namespaces:
+		invalidate_on_commit(*sorted(namespaces))
+
+
+def invalidate_request_on_commit(join_request):
+	"""Refresh the dashboards of the requester and of the event's organizer."""
+	if EventRequest.event.is_cached(join_request):
+		organizer_id = join_request.event.organizer_id
+	else:
+		organizer_id = Event.objects.filter(pk=join_request.event_id).values_list("organizer_id", flat=True).first()
+	invalidate_users_on_commit(join_request.user_id, organizer_id)
+
+
+def invalidate_event_on_commit(event):
+	"""Refresh the dashboards of the organizer and of everyone who asked to join `event`."""
+	requesters = EventRequest.objects.filter(event_id=event.pk).values_list("user_id", flat=True)
+	invalidate_users_on_commit(event.organizer_id, *requesters)
+
+
+def ordered(events):
+	return events.order_by(F("date_start").asc(nulls_last=True), "id")
+
+
+def user_events(user):
+	"""
+	The dashboard event sets of `user`, in a constant number of queries: organized events,
+	then approved and pending ones together (split by the annotated request status).
+	"""
+	organized = list(ordered(user.organized_events.for_listing()))
+	requested = ordered(
+		Event.objects.for_listing()
+		.filter(requests__user=user, requests__status__in=LISTED_STATUSES)
+		.annotate(own_status=F("requests__status"))
+	)
+	joined, pending = [], []
+	for event in requested:
+		(joined if event.own_status == "approved" else pending).append(event)
+	return {"organized": organized, "joined": joined, "pending": pending}
@@ -1,7 +1,11 @@
+from datetime import datetime, time, timedelta
+
 from django import forms
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
-from .models import Event
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from .models import Event, has_free_seat
 
 
 class SignUpForm(UserCreationForm):
@@ -26,11 +30,13 @@ class EventForm(forms.ModelForm):
 		model = Event
 		fields = [
 			"title", "system", "game_setting", "description",
-			"date_start", "date_end", "online", "location", "max_players"
+			"date_start", "date_end", "online", "location", "max_players",
+			"recurrence", "recurrence_until", "recurrence_count"
 		]
 		widgets = {
 			"date_start": forms.DateTimeInput(attrs={"type": "datetime-local", "class": "form-control"}),
 			"date_end": forms.DateTimeInput(attrs={"type": "datetime-local", "class": "form-control"}),
+			"recurrence_until": forms.DateTimeInput(attrs={"type": "datetime-local", "class": "form-control"}),
 			"online": forms.CheckboxInput(attrs={"class": "form-check-input"}),
 		}
 
@@ -38,4 +44,61 @@ class EventForm(forms.ModelForm):
 		super().__init__(*args, **kwargs)
 		for field in self.fields.values():
 			if type(field.widget) != forms.CheckboxInput:
-				field.widget.attrs["class"] = "form-control"
\ No newline at end of file
+				field.widget.attrs["class"] = "form-control"
+
+	def clean(self):
+		cleaned_data = super().clean()
+		if cleaned_data.get("recurrence"):
+			if not cleaned_data.get("date_start"):
+				self.add_error("recurrence", "A recurring event needs a start date.")
+		elif cleaned_data.get("recurrence_until") or cleaned_data.get("recurrence_count"):
+			self.add_error("recurrence", "Choose a recurrence to set an end date or a number of sessions.")
+		return cleaned_data
+
+# Event list filters (query string of the home page and of the event API)
+class EventFilterForm(forms.Form):
+	date_from = forms.DateTimeField(required=False)
+	date_to = forms.DateTimeField(required=False)
+	upcoming = forms.BooleanField(required=False)
+	online = forms.NullBooleanField(required=False)
+	organizer = forms.CharField(required=False, max_length=150)
+	has_seats = forms.BooleanField(required=False)
+
+	def clean(self):
+		cleaned_data = super().clean()
+		date_from, date_to = cleaned_data.get("date_from"), cleaned_data.get("date_to")
+		if date_from and date_to and date_from > date_to:
+			raise forms.ValidationError("date_from must not be later than date_to.")
+		return cleaned_data
+
+	def date_to_bound(self):
+		"""
+		The lookup and value ending the date range. A date without a time (the date input
+		of the home page) covers that whole day, up to the next local midnight.
+		"""
+		date_to = self.cleaned_data["date_to"]
+		try:
+			day = parse_date(str(self.data.get("date_to", "")).strip())
+		except ValueError:
+			day = None
+		if day is None:
+			return "date_start__lte", date_to
+		return "date_start__lt", timezone.make_aware(datetime.combine(day + timedelta(days=1), time.min))
+
+	def filter(self, events):
+		"""Narrow an Event queryset with the cleaned filters. Every filter is backed by an index on Event."""
+		data = self.cleaned_data
+		if data.get("date_from"):
+			events = events.filter(date_start__gte=data["date_from"])
+		if data.get("date_to"):
+			lookup, value = self.date_to_bound()
+			events = events.filter(**{lookup: value})
+		if data.get("upcoming"):
+			events = events.filter(date_start__gte=timezone.now())
+		if data.get("online") is not None:
+			events = events.filter(online=data["online"])
+		if data.get("organizer"):
+			events = events.filter(organizer__username=data["organizer"])
+		if data.get("has_seats"):
+			events = events.filter(has_free_seat())
+		return events
@@ -0,0 +1,22 @@
+"""
+The password hasher profiles PASSWORD_HASHER chooses from (see base.hashers).
+
+Read by the settings, so this module must not import Django's auth machinery.
+"""
+from django.core.exceptions import ImproperlyConfigured
+
+PROFILES = {
+	"pbkdf2": "base.hashers.PBKDF2PasswordHasher",
+	"argon2": "base.hashers.Argon2PasswordHasher",
+	"bcrypt": "base.hashers.BCryptSHA256PasswordHasher",
+	"scrypt": "base.hashers.ScryptPasswordHasher",
+}
+# Kept after the profiles so that passwords stored with them can still be checked
+LEGACY_HASHERS = ["django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher"]
+
+
+def hashers_for(profile):
+	"""PASSWORD_HASHERS storing new passwords with `profile`."""
+	if profile not in PROFILES:
+		raise ImproperlyConfigured(f"Unknown PASSWORD_HASHER {profile!r}, choose one of: {', '.join(PROFILES)}.")
+	return [PROFILES[profile], *(path for name, path in PROFILES.items() if name != profile), *LEGACY_HASHERS]
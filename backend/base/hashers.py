@@ -0,0 +1,43 @@
+"""
+Password hasher profiles.
+
+PASSWORD_HASHER picks the hasher new passwords are stored with (pbkdf2, argon2,
+bcrypt or scrypt) and PASSWORD_HASHER_COST tunes it, in its own unit: PBKDF2
+iterations, Argon2 time cost, bcrypt rounds (log2) or scrypt work factor (a power of
+two). Passwords stored by another profile or with another cost stay valid, and Django
+rehashes them with the preferred hasher on the next successful login.
+
+argon2 needs the argon2-cffi package and bcrypt the bcrypt package. The profiles and
+the PASSWORD_HASHERS built from them are in base.hasher_profiles.
+"""
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class Cost:
+	"""Cost attribute of a hasher, replaced by PASSWORD_HASHER_COST while its profile is the preferred one."""
+
+	def __init__(self, profile, default):
+		self.profile = profile
+		self.default = default
+
+	def __get__(self, instance, owner=None):
+		if settings.PASSWORD_HASHER == self.profile and settings.PASSWORD_HASHER_COST:
+			return settings.PASSWORD_HASHER_COST
+		return self.default
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+	iterations = Cost("pbkdf2", hashers.PBKDF2PasswordHasher.iterations)
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+	time_cost = Cost("argon2", hashers.Argon2PasswordHasher.time_cost)
+
+
+class BCryptSHA256PasswordHasher(hashers.BCryptSHA256PasswordHasher):
+	rounds = Cost("bcrypt", hashers.BCryptSHA256PasswordHasher.rounds)
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+	work_factor = Cost("scrypt", hashers.ScryptPasswordHasher.work_factor)
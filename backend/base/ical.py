@@ -0,0 +1,147 @@
+"""
+iCalendar (RFC 5545) feeds of events, for calendar apps that subscribe to a URL.
+
+Feeds are generated while the events are read, one VEVENT per event. A recurring
+event is written once with an RRULE, in local time with the IANA TZID of the site so
+that calendar apps keep its wall-clock time across DST changes like base.recurrence
+does; its materialized occurrences override their slot through RECURRENCE-ID.
+
+Calendar apps poll their subscriptions every few minutes. feed_version() describes
+the state of a feed with one aggregate query, so unchanged feeds are answered with
+304 Not Modified without generating anything.
+"""
+from datetime import timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Count, F, Max
+from django.utils import timezone
+
+from . import recurrence
+from .models import Event
+from .schedule import end_of
+
+PRODID = "-//dnd-session-planner//Events//EN"
+
+RRULE_FREQUENCIES = {
+	"weekly": "FREQ=WEEKLY",
+	"biweekly": "FREQ=WEEKLY;INTERVAL=2",
+	"monthly": "FREQ=MONTHLY",
+}
+
+# Content lines longer than this many octets are folded
+LINE_LIMIT = 75
+
+
+def feed_version(events):
+	"""
+	(last_modified, etag) of a feed of `events`, from one aggregate query. The count is part
+	of the ETag so that removing an event, which leaves no newer updated_at behind, is seen too.
+	"""
+	state = events.order_by().aggregate(last_modified=Max("updated_at"), count=Count("id"))
+	last_modified = state["last_modified"]
+	stamp = last_modified.timestamp() if last_modified else 0
+	return last_modified, f'"{state["count"]}-{stamp:.6f}"'
+
+
+def feed_events(events):
+	"""Narrow `events` to the dated ones and load what the VEVENTs need."""
+	return (
+		events.filter(date_start__isnull=False)
+		.annotate(
+			series_start=F("recurrence_parent__date_start"),
+			series_recurrence=F("recurrence_parent__recurrence"),
+		)
+		.order_by("date_start", "id")
+	)
+
+
+def escape(text):
+	return (
+		str(text).replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+		.replace("\r\n", "\\n").replace("\n", "\\n")
+	)
+
+
+def fold(line):
+	"""Fold a content line at LINE_LIMIT octets, never inside a UTF-8 sequence."""
+	if len(line.encode()) <= LINE_LIMIT:
+		return line + "\r\n"
+	parts, current, size = [], [], 0
+	for char in line:
+		width = len(char.encode())
+		# Continuation lines start with a space, which counts towards their length
+		if size + width > LINE_LIMIT - (1 if parts else 0):
+			parts.append("".join(current))
+			current, size = [], 0
+		current.append(char)
+		size += width
+	parts.append("".join(current))
+	return "\r\n ".join(parts) + "\r\n"
+
+
+def utc(moment):
+	return moment.astimezone(dt_timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def local(moment):
+	return timezone.localtime(moment).strftime("%Y%m%dT%H%M%S")
+
+
+def rrule(event):
+	rule = RRULE_FREQUENCIES[event.recurrence]
+	if event.recurrence == "monthly":
+		day = timezone.localtime(event.date_start).day
+		if day > 28:
+			# Shorter months fall back to their last day, as in base.recurrence
+			rule += f";BYMONTHDAY={day},-1;BYSETPOS=1"
+	if event.recurrence_end:
+		rule += f";UNTIL={utc(event.recurrence_end)}"
+	return rule
+
+
+def vevent(event, host, site_url):
+	"""The content lines of one event."""
+	series = event.recurrence_parent_id is not None and event.series_start is not None
+	uid = event.recurrence_parent_id if series else event.pk
+	lines = [
+		"BEGIN:VEVENT",
+		f"UID:event-{uid}@{host}",
+		f"DTSTAMP:{utc(event.updated_at)}",
+		f"LAST-MODIFIED:{utc(event.updated_at)}",
+	]
+	if event.recurrence:
+		lines += [
+			f"DTSTART;TZID={settings.TIME_ZONE}:{local(event.date_start)}",
+			f"DTEND;TZID={settings.TIME_ZONE}:{local(end_of(event))}",
+			f"RRULE:{rrule(event)}",
+		]
+	else:
+		lines += [f"DTSTART:{utc(event.date_start)}", f"DTEND:{utc(end_of(event))}"]
+	if series:
+		parent = Event(date_start=event.series_start, recurrence=event.series_recurrence)
+		original = recurrence.occurrence_start(parent, event.recurrence_index) if parent.recurrence else event.series_start
+		lines.append(f"RECURRENCE-ID;TZID={settings.TIME_ZONE}:{local(original)}")
+
+	lines.append(f"SUMMARY:{escape(event.title or 'Session')}")
+	location = event.location or ""
+	if event.online:
+		location = f"Online: {location}" if location else "Online"
+	if location:
+		lines.append(f"LOCATION:{escape(location)}")
+	if event.description:
+		lines.append(f"DESCRIPTION:{escape(event.description)}")
+	lines.append(f"URL:{site_url}{event.pk}/")
+	lines.append("END:VEVENT")
+	return "".join(fold(line) for line in lines)
+
+
+def calendar(events, name, host, site_url, chunk_size=500):
+	"""
+	Lazily yield the encoded feed of `events` (see feed_events()), one event at a time.
+	`host` scopes the UIDs, `site_url` (ending with a slash) prefixes the event pages.
+	"""
+	header = ["BEGIN:VCALENDAR", "VERSION:2.0", f"PRODID:{PRODID}", "CALSCALE:GREGORIAN", "METHOD:PUBLISH", f"X-WR-CALNAME:{escape(name)}", f"X-WR-TIMEZONE:{settings.TIME_ZONE}"]
+	yield "".join(fold(line) for line in header).encode()
+	for event in events.iterator(chunk_size=chunk_size):
+		yield vevent(event, host, site_url).encode()
+	yield b"END:VCALENDAR\r\n"
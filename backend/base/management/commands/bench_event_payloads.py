@@ -0,0 +1,71 @@
+import time
+import uuid
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.http import QueryDict
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from api.renderers import FastJSONRenderer
+from api.serializers import event_list_serializer
+from base.models import Event, EventRequest
+
+
+class Command(BaseCommand):
+	help = (
+		"Compare the size and serialization time of the event list representations (`view`, `fields`, "
+		"`omit`) on a generated fixture. The fixture is rolled back afterwards."
+	)
+
+	def add_arguments(self, parser):
+		parser.add_argument("--events", type=int, default=10000, help="Events in the fixture.")
+		parser.add_argument("--players", type=int, default=3, help="Approved players per event.")
+		parser.add_argument(
+			"--query", action="append", dest="queries",
+			help="Event list query string to measure (repeatable), e.g. 'view=card' or 'omit=description,players'.",
+		)
+
+	def handle(self, *args, events, players, queries, **options):
+		queries = queries or ["", "omit=description,players", "fields=id,title,system,date_start", "view=card"]
+		with transaction.atomic():
+			self.create_fixture(events, players)
+			self.stdout.write(f"{events} event(s) with {players} approved player(s) each")
+			for query in queries:
+				self.measure(query)
+			transaction.set_rollback(True)
+
+	def create_fixture(self, events, players):
+		tag = uuid.uuid4().hex[:8]
+		users = User.objects.bulk_create(User(username=f"bench-{tag}-{n}") for n in range(players + 1))
+		now = timezone.now()
+		created = Event.objects.bulk_create(
+			Event(
+				title=f"Session {n}", organizer=users[0], date_start=now + timedelta(hours=n),
+				description="A long campaign pitch. " * 40, max_players=players + 2, approved_count=players,
+			)
+			for n in range(events)
+		)
+		EventRequest.objects.bulk_create(
+			EventRequest(event=event, user=user, status="approved") for event in created for user in users[1:]
+		)
+
+	def measure(self, query):
+		serializer_class, fields = event_list_serializer(QueryDict(query))
+		with CaptureQueriesContext(connection) as queries:
+			started = time.perf_counter()
+			rows = list(serializer_class.listing(fields).order_by("date_start", "id"))
+			loaded = time.perf_counter()
+		data = serializer_class(rows, many=True, fields=fields).data
+		serialized = time.perf_counter()
+		body = FastJSONRenderer().render(data)
+		rendered = time.perf_counter()
+
+		columns = sum(query["sql"].split(" FROM ")[0].count(",") + 1 for query in queries.captured_queries)
+		self.stdout.write(
+			f"{query or '(full)':<40} {len(body) / 1024:9.0f} KiB  "
+			f"query {(loaded - started) * 1000:7.1f} ms  serialize {(serialized - loaded) * 1000:7.1f} ms  "
+			f"render {(rendered - serialized) * 1000:6.1f} ms  {columns} column(s) in {len(queries)} query(ies)"
+		)
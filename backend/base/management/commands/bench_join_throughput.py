@@ -0,0 +1,78 @@
+import statistics
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+
+from base.models import Event
+from base.services import SeatConflict, request_to_join
+
+
+class Command(BaseCommand):
+	help = (
+		"Measure join-request throughput against the configured database with concurrent writers. "
+		"Run it once per database profile (DATABASE_URL, SQLITE_WAL, DB_POOL_MAX_SIZE) to compare them."
+	)
+
+	def add_arguments(self, parser):
+		parser.add_argument("--writers", type=int, default=16, help="Concurrent writer threads.")
+		parser.add_argument("--joins", type=int, default=800, help="Join requests to send in total.")
+
+	def handle(self, *args, writers, joins, **options):
+		tag = uuid.uuid4().hex[:8]
+		organizer = User.objects.create_user(f"bench-{tag}-organizer")
+		# max_players=0 means unlimited, so every join is expected to succeed
+		event = Event.objects.create(title=f"Join benchmark {tag}", organizer=organizer, max_players=0)
+		User.objects.bulk_create(User(username=f"bench-{tag}-{n}") for n in range(joins))
+		users = list(User.objects.filter(username__startswith=f"bench-{tag}-").exclude(pk=organizer.pk))
+
+		try:
+			self.stdout.write(f"Profile: {self.describe_profile()}")
+			started = time.perf_counter()
+			with ThreadPoolExecutor(max_workers=writers) as pool:
+				batches = list(pool.map(self.join_all, [event] * writers, [users[n::writers] for n in range(writers)]))
+			elapsed = time.perf_counter() - started
+
+			latencies = sorted(latency for batch in batches for latency in batch["latencies"])
+			failures = sum(batch["failures"] for batch in batches)
+			self.stdout.write(f"{len(latencies)} join(s) by {writers} writer(s) in {elapsed:.2f}s, {failures} failed")
+			if latencies:
+				p95 = latencies[int(len(latencies) * 0.95) - 1] if len(latencies) >= 20 else latencies[-1]
+				self.stdout.write(self.style.SUCCESS(
+					f"{len(latencies) / elapsed:.0f} joins/s, "
+					f"p50 {statistics.median(latencies) * 1000:.1f} ms, p95 {p95 * 1000:.1f} ms"
+				))
+		finally:
+			event.delete()
+			User.objects.filter(username__startswith=f"bench-{tag}-").delete()
+
+	def join_all(self, event, users):
+		latencies = []
+		failures = 0
+		try:
+			for user in users:
+				started = time.perf_counter()
+				try:
+					request_to_join(event, user)
+				except SeatConflict:
+					failures += 1
+					continue
+				latencies.append(time.perf_counter() - started)
+		finally:
+			connections.close_all()
+		return {"latencies": latencies, "failures": failures}
+
+	def describe_profile(self):
+		settings_dict = connection.settings_dict
+		if connection.vendor == "sqlite":
+			with connection.cursor() as cursor:
+				cursor.execute("PRAGMA journal_mode")
+				journal_mode = cursor.fetchone()[0]
+			return f"sqlite, journal_mode={journal_mode}"
+		pool = settings_dict.get("OPTIONS", {}).get("pool")
+		if pool:
+			return f"{connection.vendor}, pool max_size={pool['max_size'] if isinstance(pool, dict) else 'default'}"
+		return f"{connection.vendor}, CONN_MAX_AGE={settings_dict['CONN_MAX_AGE']}"
@@ -0,0 +1,62 @@
+import statistics
+import time
+import uuid
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import override_settings
+
+from api.authentication import ClaimsTokenObtainPairSerializer
+from base.hasher_profiles import hashers_for
+
+PASSWORD = "correct horse battery staple"
+
+
+class Command(BaseCommand):
+	help = (
+		"Measure how many logins per second one core handles with each password hasher profile: "
+		"the work of the token/ endpoint (user lookup, password check, token pair), without HTTP. "
+		"The benchmark user is rolled back afterwards."
+	)
+
+	def add_arguments(self, parser):
+		parser.add_argument(
+			"--profiles", default=settings.PASSWORD_HASHER,
+			help=f"Comma-separated hasher profiles among {', '.join(settings.PASSWORD_HASHER_PROFILES)}.",
+		)
+		parser.add_argument("--cost", type=int, default=settings.PASSWORD_HASHER_COST, help="PASSWORD_HASHER_COST to use (0: default cost).")
+		parser.add_argument("--logins", type=int, default=20, help="Logins timed per profile.")
+
+	def handle(self, *args, profiles, cost, logins, **options):
+		profiles = profiles.split(",")
+		unknown = [profile for profile in profiles if profile not in settings.PASSWORD_HASHER_PROFILES]
+		if unknown:
+			raise CommandError(f"Unknown profile(s): {', '.join(unknown)}.")
+		for profile in profiles:
+			with override_settings(PASSWORD_HASHER=profile, PASSWORD_HASHER_COST=cost, PASSWORD_HASHERS=hashers_for(profile)):
+				with transaction.atomic():
+					self.measure(profile, logins)
+					transaction.set_rollback(True)
+
+	def measure(self, profile, logins):
+		user = User(username=f"bench-{uuid.uuid4().hex[:8]}")
+		try:
+			user.set_password(PASSWORD)
+		except ValueError as exc:
+			# The hasher library is not installed
+			self.stderr.write(f"{profile:<8} skipped: {exc}")
+			return
+		user.save()
+
+		timings = []
+		for _ in range(logins):
+			started = time.perf_counter()
+			serializer = ClaimsTokenObtainPairSerializer(data={"username": user.username, "password": PASSWORD})
+			serializer.is_valid(raise_exception=True)
+			timings.append(time.perf_counter() - started)
+		self.stdout.write(
+			f"{profile:<8} {user.password.split('$')[0]:<24} median {statistics.median(timings) * 1000:8.1f} ms  "
+			f"{len(timings) / sum(timings):8.1f} logins/s per core"
+		)
@@ -0,0 +1,150 @@
+import json
+import statistics
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from api.authentication import ClaimsTokenObtainPairSerializer
+from base import seeding
+from base.models import Event, EventRequest
+
+# Fixture of one benchmark size: `events` events, and users/requests in proportion
+USERS_PER_EVENT = 0.5
+REQUESTS_PER_EVENT = 3
+SYSTEMS = 20
+
+
+class Command(BaseCommand):
+	help = (
+		"Time the main pages and API endpoints and count their queries on seeded data of several "
+		"sizes (the data is rolled back afterwards). Results are written as JSON; with --baseline, "
+		"the command fails when a query count grew or a median time grew beyond --tolerance."
+	)
+
+	def add_arguments(self, parser):
+		parser.add_argument("--sizes", default="1000,10000", help="Comma-separated numbers of events to benchmark.")
+		parser.add_argument("--iterations", type=int, default=20, help="Requests timed per endpoint and size.")
+		parser.add_argument("--output", help="File to write the JSON results to (default: stdout).")
+		parser.add_argument("--baseline", help="JSON results of a previous run to compare with.")
+		parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed relative growth of median times.")
+		parser.add_argument("--seed", type=int, default=0)
+
+	def handle(self, *args, sizes, iterations, output, baseline, tolerance, seed, **options):
+		results = {
+			"database": connection.vendor,
+			"iterations": iterations,
+			"created": datetime.now(dt_timezone.utc).isoformat(),
+			"sizes": {},
+		}
+		# Measure the work of the views, not the response cache
+		with override_settings(
+			CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}},
+			ALLOWED_HOSTS=["testserver"],
+		):
+			for size in [int(size) for size in sizes.split(",")]:
+				with transaction.atomic():
+					seeding.seed(
+						users=max(int(size * USERS_PER_EVENT), iterations + 10), systems=SYSTEMS,
+						events=size, requests=size * REQUESTS_PER_EVENT, seed=seed,
+					)
+					results["sizes"][str(size)] = self.run_size(iterations)
+					transaction.set_rollback(True)
+
+		content = json.dumps(results, indent=2)
+		if output:
+			with open(output, "w") as file:
+				file.write(content + "\n")
+		else:
+			self.stdout.write(content)
+		self.report(results)
+
+		if baseline:
+			with open(baseline) as file:
+				regressions = self.compare(json.load(file), results, tolerance)
+			if regressions:
+				raise CommandError("Regressions against the baseline:\n" + "\n".join(regressions))
+			self.stderr.write(self.style.SUCCESS("No regression against the baseline."))
+
+	def run_size(self, iterations):
+		"""Time every scenario on the current data."""
+		popular = Event.objects.annotate(requests_count=Count("requests")).filter(organizer__isnull=False).order_by("-requests_count", "id").first()
+		organizer = popular.organizer
+		# Undated and unlimited, so joining and approving never conflict: joined by a different
+		# user on every iteration, and one request moved back and forth between approved and rejected
+		open_event = Event.objects.create(title="Benchmark event", organizer=organizer, max_players=0)
+		users = list(User.objects.exclude(pk=organizer.pk).order_by("-id")[:iterations + 1])
+		moderated = EventRequest.objects.create(event=open_event, user=users.pop(), status="pending")
+		joiners = iter(users)
+
+		anonymous = Client()
+		session = Client()
+		session.force_login(organizer)
+		auth = {"Authorization": f"Bearer {self.access_token(organizer)}"}
+		statuses = iter(["approved", "rejected"] * iterations)
+
+		scenarios = {
+			"getData": lambda: anonymous.get("/api/?page_size=20"),
+			"home": lambda: anonymous.get("/"),
+			"single": lambda: session.get(f"/{popular.pk}/"),
+			"join_event_api": lambda: anonymous.post(
+				f"/api/events/{open_event.pk}/join/",
+				headers={"Authorization": f"Bearer {self.access_token(next(joiners))}"},
+			),
+			"update_request_api": lambda: anonymous.patch(
+				f"/api/requests/{moderated.pk}/", {"status": next(statuses)}, content_type="application/json", headers=auth,
+			),
+			"list_requests_api": lambda: anonymous.get(f"/api/events/{popular.pk}/requests/", headers=auth),
+		}
+		return {name: self.measure(scenario, iterations) for name, scenario in scenarios.items()}
+
+	@staticmethod
+	def access_token(user):
+		"""An access token as the API issues them."""
+		return ClaimsTokenObtainPairSerializer.get_token(user).access_token
+
+	def measure(self, scenario, iterations):
+		timings = []
+		queries = 0
+		for _ in range(iterations):
+			with CaptureQueriesContext(connection) as captured:
+				started = time.perf_counter()
+				response = scenario()
+				timings.append(time.perf_counter() - started)
+			if response.status_code >= 400:
+				raise CommandError(f"{response.request['PATH_INFO']} answered {response.status_code}: {response.content[:200]!r}")
+			queries = max(queries, len(captured))
+		timings.sort()
+		return {
+			"median_ms": round(statistics.median(timings) * 1000, 2),
+			"p95_ms": round(timings[max(int(len(timings) * 0.95) - 1, 0)] * 1000, 2),
+			"queries": queries,
+		}
+
+	def report(self, results):
+		out = self.stderr
+		for size, scenarios in results["sizes"].items():
+			out.write(f"{size} events")
+			for name, result in scenarios.items():
+				out.write(f"  {name:<20} median {result['median_ms']:8.2f} ms  p95 {result['p95_ms']:8.2f} ms  {result['queries']:3} queries")
+
+	@staticmethod
+	def compare(baseline, results, tolerance):
+		"""Describe every result that is worse than its baseline."""
+		regressions = []
+		for size, scenarios in results["sizes"].items():
+			for name, result in scenarios.items():
+				previous = baseline.get("sizes", {}).get(size, {}).get(name)
+				if previous is None:
+					continue
+				if result["queries"] > previous["queries"]:
+					regressions.append(f"{name} at {size} events: {result['queries']} queries, was {previous['queries']}")
+				if result["median_ms"] > previous["median_ms"] * (1 + tolerance):
+					regressions.append(f"{name} at {size} events: median {result['median_ms']} ms, was {previous['median_ms']} ms")
+		return regressions
+
@@ -0,0 +1,82 @@
+import asyncio
+import statistics
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+	help = (
+		"Fire concurrent HTTP requests at running servers and report their throughput, e.g. to compare "
+		"`gunicorn backend.wsgi` on /api/ with `uvicorn backend.asgi:application` on /api/async/."
+	)
+
+	def add_arguments(self, parser):
+		parser.add_argument("urls", nargs="+", help="URLs to load, one after the other (e.g. http://127.0.0.1:8000/api/).")
+		parser.add_argument("--concurrency", type=int, default=100, help="Clients sending requests at the same time.")
+		parser.add_argument("--requests", type=int, default=2000, help="Requests sent to each URL.")
+		parser.add_argument("--method", default="GET")
+		parser.add_argument("--token", help="JWT access token sent as a Bearer Authorization header.")
+		parser.add_argument("--timeout", type=float, default=30, help="Seconds before a request counts as failed.")
+
+	def handle(self, *args, urls, concurrency, requests, method, token, timeout, **options):
+		for url in urls:
+			parts = urlsplit(url)
+			if parts.scheme != "http" or not parts.hostname:
+				raise CommandError(f"Only plain http:// URLs are supported, got {url!r}.")
+			latencies, statuses, elapsed = asyncio.run(self.load(parts, concurrency, requests, method, token, timeout))
+			self.report(url, latencies, statuses, elapsed)
+
+	async def load(self, parts, concurrency, requests, method, token, timeout):
+		path = parts.path or "/"
+		if parts.query:
+			path += f"?{parts.query}"
+		headers = [f"{method} {path} HTTP/1.1", f"Host: {parts.netloc}", "Connection: close", "Content-Length: 0"]
+		if token:
+			headers.append(f"Authorization: Bearer {token}")
+		payload = ("\r\n".join(headers) + "\r\n\r\n").encode()
+
+		latencies = []
+		statuses = Counter()
+		remaining = iter(range(requests))
+
+		async def client():
+			for _ in remaining:
+				started = time.perf_counter()
+				try:
+					status = await asyncio.wait_for(self.send(parts, payload), timeout)
+				except (OSError, asyncio.TimeoutError, IndexError, ValueError) as exc:
+					statuses[type(exc).__name__] += 1
+					continue
+				statuses[status] += 1
+				latencies.append(time.perf_counter() - started)
+
+		started = time.perf_counter()
+		await asyncio.gather(*(client() for _ in range(concurrency)))
+		return latencies, statuses, time.perf_counter() - started
+
+	async def send(self, parts, payload):
+		reader, writer = await asyncio.open_connection(parts.hostname, parts.port or 80)
+		try:
+			writer.write(payload)
+			await writer.drain()
+			status_line = await reader.readline()
+			await reader.read()
+		finally:
+			writer.close()
+		return int(status_line.split()[1])
+
+	def report(self, url, latencies, statuses, elapsed):
+		self.stdout.write(url)
+		self.stdout.write("  responses: " + ", ".join(f"{status}={count}" for status, count in sorted(statuses.items(), key=str)))
+		if not latencies:
+			self.stdout.write(self.style.ERROR("  no successful request"))
+			return
+		latencies.sort()
+		p95 = latencies[max(int(len(latencies) * 0.95) - 1, 0)]
+		self.stdout.write(self.style.SUCCESS(
+			f"  {len(latencies) / elapsed:.0f} req/s, "
+			f"p50 {statistics.median(latencies) * 1000:.1f} ms, p95 {p95 * 1000:.1f} ms"
+		))
@@ -0,0 +1,54 @@
+from itertools import islice
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from base import dashboard, recurrence, search
+from base.cache import invalidate_on_commit
+from base.models import Event
+
+# Fields an occurrence row copies from its series
+COPIED_FIELDS = ("title", "system_id", "game_setting", "description", "online", "location", "max_players", "organizer_id")
+
+
+class Command(BaseCommand):
+	help = (
+		"Create Event rows for the upcoming occurrences of recurring events, so players can ask to join "
+		"them. Occurrences that already have a row are left alone."
+	)
+
+	def add_arguments(self, parser):
+		parser.add_argument("--next", type=int, default=4, help="Upcoming occurrences to materialize per series.")
+		parser.add_argument("--event", type=int, help="Only materialize the occurrences of this recurring event.")
+
+	def handle(self, *args, next, event, **options):
+		now = timezone.now()
+		series = Event.objects.series_in(now, None)
+		if event is not None:
+			series = series.filter(pk=event)
+
+		with transaction.atomic():
+			rows = []
+			for parent in series:
+				upcoming = [occurrence for occurrence in islice(recurrence.occurrences(parent, now), next) if occurrence.index]
+				existing = set(
+					parent.occurrences.filter(recurrence_index__in=[occurrence.index for occurrence in upcoming])
+					.values_list("recurrence_index", flat=True)
+				)
+				rows.extend(
+					Event(
+						**{field: getattr(parent, field) for field in COPIED_FIELDS},
+						date_start=occurrence.date_start,
+						date_end=occurrence.date_end,
+						recurrence_parent=parent,
+						recurrence_index=occurrence.index,
+					)
+					for occurrence in upcoming if occurrence.index not in existing
+				)
+			created = Event.objects.bulk_create(rows)
+			if created:
+				search.index_events(created)
+				invalidate_on_commit("events")
+				dashboard.invalidate_users_on_commit(*{row.organizer_id for row in created})
+		self.stdout.write(self.style.SUCCESS(f"{len(created)} occurrence(s) materialized."))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from base import search
+
+
+class Command(BaseCommand):
+	help = "Rebuild the full-text event search index from the event table."
+
+	def handle(self, *args, **options):
+		with transaction.atomic():
+			indexed = search.rebuild_index()
+		self.stdout.write(self.style.SUCCESS(f"{indexed} event(s) indexed."))
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from base.models import Event, EventRequest
+
+
+def request_count(status):
+	"""Number of join requests of the outer event with `status`."""
+	requests = (
+		EventRequest.objects.filter(event=OuterRef("pk"), status=status)
+		.order_by()
+		.values("event")
+		.annotate(total=Count("pk"))
+		.values("total")
+	)
+	return Coalesce(Subquery(requests), 0)
+
+
+class Command(BaseCommand):
+	help = (
+		"Recompute Event.approved_count / pending_count from the join requests and repair rows that drifted, "
+		"in one UPDATE so that requests changing meanwhile are not overwritten."
+	)
+
+	def add_arguments(self, parser):
+		parser.add_argument("--dry-run", action="store_true", help="Only report the events that are out of sync.")
+
+	def handle(self, *args, dry_run, **options):
+		approved, pending = request_count("approved"), request_count("pending")
+		drifted = Event.objects.exclude(Q(approved_count=approved) & Q(pending_count=pending))
+		if dry_run:
+			repaired = drifted.count()
+		else:
+			repaired = drifted.update(approved_count=approved, pending_count=pending)
+
+		verb = "would be repaired" if dry_run else "repaired"
+		self.stdout.write(self.style.SUCCESS(f"{repaired} event(s) {verb}."))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from base import seeding
+
+
+class Command(BaseCommand):
+	help = (
+		"Fill the database with generated users, systems, events and join requests, with a few "
+		"very popular events like on a real listing. Meant for local testing and benchmarks."
+	)
+
+	def add_arguments(self, parser):
+		parser.add_argument("--users", type=int, default=1000)
+		parser.add_argument("--systems", type=int, default=20)
+		parser.add_argument("--events", type=int, default=5000)
+		parser.add_argument("--requests", type=int, default=20000, help="Join requests to create.")
+		parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent of event popularity (0 means uniform).")
+		parser.add_argument("--seed", type=int, default=0, help="Random seed, for reproducible data.")
+
+	def handle(self, *args, users, systems, events, requests, skew, seed, **options):
+		created = seeding.seed(users, systems, events, requests, skew=skew, seed=seed)
+		self.stdout.write(self.style.SUCCESS(", ".join(f"{count} {name}" for name, count in created.items()) + " created."))
@@ -0,0 +1,216 @@
+"""
+Per-request timing and SQL query metrics.
+
+RequestMetricsMiddleware (enabled with the REQUEST_METRICS setting) measures every
+request: wall time, time spent in the database, number of queries and number of
+duplicate queries (same SQL and parameters run again in the same request). It adds
+them to the response as a `Server-Timing` header, logs the requests slower than
+METRICS_SLOW_REQUEST_MS with their slowest queries, and aggregates them per URL name
+into histograms that metrics_view() exposes in the Prometheus text format.
+
+Queries are timed by a database execute wrapper that reports to the recorder of the
+current request through a context variable, so queries run by async views through
+sync_to_async are counted too. Metrics are kept per process: scrape each worker, or
+run one worker per metrics port.
+"""
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import Http404, HttpResponse
+from django.views.decorators.http import require_safe
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the histogram buckets
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+# Slowest queries quoted in the slow request log, and how much of each
+SLOW_LOG_QUERIES = 3
+SLOW_LOG_SQL_LENGTH = 500
+
+UNRESOLVED = "<unresolved>"
+
+current_recorder = ContextVar("request_metrics_recorder", default=None)
+
+
+class Recorder:
+	"""Queries of one request."""
+
+	def __init__(self):
+		self.queries = []
+		self.seen = set()
+		self.duplicates = 0
+
+	@property
+	def db_time(self):
+		return sum(duration for duration, _ in self.queries)
+
+	def add(self, sql, params, duration):
+		self.queries.append((duration, sql))
+		key = (sql, repr(params))
+		if key in self.seen:
+			self.duplicates += 1
+		else:
+			self.seen.add(key)
+
+
+def query_timer(execute, sql, params, many, context):
+	"""Database execute wrapper timing the query for the current request, if any."""
+	recorder = current_recorder.get()
+	if recorder is None:
+		return execute(sql, params, many, context)
+	started = time.perf_counter()
+	try:
+		return execute(sql, params, many, context)
+	finally:
+		recorder.add(sql, params, time.perf_counter() - started)
+
+
+def instrument(connection, **kwargs):
+	if query_timer not in connection.execute_wrappers:
+		connection.execute_wrappers.append(query_timer)
+
+
+def instrument_thread():
+	"""Instrument the connections of the current thread (new ones are by connection_created)."""
+	for connection in connections.all(initialized_only=True):
+		instrument(connection)
+
+
+class Histogram:
+	def __init__(self, buckets):
+		self.buckets = buckets
+		self.counts = [0] * (len(buckets) + 1)
+		self.total = 0
+
+	def observe(self, value):
+		self.counts[bisect_left(self.buckets, value)] += 1
+		self.total += value
+
+	def lines(self, name, labels):
+		cumulative = 0
+		for bound, count in zip(self.buckets + ("+Inf",), self.counts):
+			cumulative += count
+			yield f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+		yield f"{name}_sum{{{labels}}} {round(self.total, 6)}"
+		yield f"{name}_count{{{labels}}} {cumulative}"
+
+
+class Registry:
+	"""Metrics aggregated per URL name, for the current process."""
+
+	METRICS = {
+		"planner_request_duration_seconds": ("Wall time of the requests.", SECONDS_BUCKETS),
+		"planner_request_db_seconds": ("Time the requests spent in database queries.", SECONDS_BUCKETS),
+		"planner_request_queries": ("SQL queries run per request.", QUERY_BUCKETS),
+		"planner_request_duplicate_queries": ("Queries repeated with the same SQL and parameters within a request.", QUERY_BUCKETS),
+	}
+
+	def __init__(self):
+		self.lock = threading.Lock()
+		self.views = {}
+
+	def observe(self, view, duration, recorder):
+		values = (duration, recorder.db_time, len(recorder.queries), recorder.duplicates)
+		with self.lock:
+			histograms = self.views.get(view)
+			if histograms is None:
+				histograms = self.views[view] = [Histogram(buckets) for _, buckets in self.METRICS.values()]
+			for histogram, value in zip(histograms, values):
+				histogram.observe(value)
+
+	def render(self):
+		"""The metrics in the Prometheus text exposition format."""
+		lines = []
+		with self.lock:
+			for index, (name, (description, _)) in enumerate(self.METRICS.items()):
+				lines += [f"# HELP {name} {description}", f"# TYPE {name} histogram"]
+				for view, histograms in sorted(self.views.items()):
+					lines += histograms[index].lines(name, f'view="{escape_label(view)}"')
+		return "\n".join(lines) + "\n"
+
+	def clear(self):
+		with self.lock:
+			self.views.clear()
+
+
+def escape_label(value):
+	return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+registry = Registry()
+
+
+class RequestMetricsMiddleware:
+	"""Measure each request, see the module docstring. Put it first in MIDDLEWARE."""
+	sync_capable = True
+	async_capable = True
+
+	def __init__(self, get_response):
+		self.get_response = get_response
+		self.async_mode = iscoroutinefunction(get_response)
+		if self.async_mode:
+			markcoroutinefunction(self)
+		connection_created.connect(instrument, dispatch_uid="base.metrics.instrument")
+
+	def __call__(self, request):
+		if self.async_mode:
+			return self.__acall__(request)
+		instrument_thread()
+		recorder = Recorder()
+		token = current_recorder.set(recorder)
+		started = time.perf_counter()
+		try:
+			response = self.get_response(request)
+		finally:
+			current_recorder.reset(token)
+		self.finish(request, response, time.perf_counter() - started, recorder)
+		return response
+
+	async def __acall__(self, request):
+		# Database calls run in the thread of sync_to_async, instrument its connections
+		await sync_to_async(instrument_thread)()
+		recorder = Recorder()
+		token = current_recorder.set(recorder)
+		started = time.perf_counter()
+		try:
+			response = await self.get_response(request)
+		finally:
+			current_recorder.reset(token)
+		self.finish(request, response, time.perf_counter() - started, recorder)
+		return response
+
+	def finish(self, request, response, duration, recorder):
+		"""Record the request and describe it in the response. Streamed bodies are not included."""
+		view = request.resolver_match.view_name if request.resolver_match else UNRESOLVED
+		registry.observe(view, duration, recorder)
+
+		description = f"{len(recorder.queries)} queries"
+		if recorder.duplicates:
+			description += f", {recorder.duplicates} duplicates"
+		response["Server-Timing"] = f'app;dur={duration * 1000:.1f}, db;dur={recorder.db_time * 1000:.1f};desc="{description}"'
+
+		if duration * 1000 >= settings.METRICS_SLOW_REQUEST_MS:
+			slowest = sorted(recorder.queries, key=lambda query: query[0], reverse=True)[:SLOW_LOG_QUERIES]
+			logger.warning(
+				"Slow request %s %s (%s): %.0f ms, %d queries (%d duplicates) in %.0f ms%s",
+				request.method, request.path, view, duration * 1000, len(recorder.queries), recorder.duplicates,
+				recorder.db_time * 1000,
+				"".join(f"\n  {query_time * 1000:.1f} ms: {sql[:SLOW_LOG_SQL_LENGTH]}" for query_time, sql in slowest),
+			)
+
+
+@require_safe
+def metrics_view(request):
+	"""Prometheus scrape endpoint, only answered to METRICS_ALLOWED_IPS while metrics are enabled."""
+	if not settings.REQUEST_METRICS or request.META.get("REMOTE_ADDR") not in settings.METRICS_ALLOWED_IPS:
+		raise Http404()
+	return HttpResponse(registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-18 00:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0007_alter_event_max_players'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['date_start', 'id'], name='event_date_start_id_idx'),
+        ),
+    ]
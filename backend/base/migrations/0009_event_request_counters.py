@@ -0,0 +1,42 @@
+# Generated by Django 5.2.7 on 2026-10-18 00:43
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def populate_counters(apps, schema_editor):
+    Event = apps.get_model('base', 'Event')
+    EventRequest = apps.get_model('base', 'EventRequest')
+
+    def count_of(status):
+        requests = (
+            EventRequest.objects.filter(event=models.OuterRef('pk'), status=status)
+            .order_by()
+            .values('event')
+            .annotate(total=models.Count('pk'))
+            .values('total')
+        )
+        return Coalesce(models.Subquery(requests), 0)
+
+    Event.objects.update(approved_count=count_of('approved'), pending_count=count_of('pending'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0008_event_date_start_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='approved_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='pending_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+from django.db import migrations
+
+SEARCH_FIELDS = "title, game_setting, description, location"
+
+PG_VECTOR = (
+    "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(game_setting, '') || ' ' "
+    "|| coalesce(description, '') || ' ' || coalesce(location, ''))"
+)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE base_event_search USING fts5({SEARCH_FIELDS}, "
+            "tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        schema_editor.execute(
+            f"INSERT INTO base_event_search (rowid, {SEARCH_FIELDS}) SELECT id, {SEARCH_FIELDS} FROM base_event"
+        )
+    elif vendor == 'postgresql':
+        schema_editor.execute(f"CREATE INDEX base_event_search_idx ON base_event USING GIN ({PG_VECTOR})")
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute("DROP TABLE IF EXISTS base_event_search")
+    elif vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS base_event_search_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0009_event_request_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
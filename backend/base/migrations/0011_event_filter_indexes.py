@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-18 00:53
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0010_event_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['system', 'date_start'], name='event_system_date_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['online', 'date_start'], name='event_online_date_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['organizer', 'date_start'], name='event_organizer_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('max_players__isnull', True), ('max_players', 0), ('approved_count__lt', models.F('max_players')), _connector='OR'), fields=['date_start', 'id'], name='event_open_date_start_idx'),
+        ),
+    ]
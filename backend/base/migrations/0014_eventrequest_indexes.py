@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-18 01:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0013_event_recurrence'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='eventrequest',
+            index=models.Index(fields=['event', 'status'], name='request_event_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventrequest',
+            index=models.Index(fields=['user', 'status', 'event'], name='request_user_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventrequest',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['event', 'id'], name='request_pending_event_idx'),
+        ),
+    ]
@@ -1,7 +1,9 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
 from django.utils import timezone
-from django.core.validators import MaxValueValidator
+from django.core.validators import MaxValueValidator, MinValueValidator
+
+from . import recurrence
 
 # Create your models here.
 
@@ -11,7 +13,117 @@ class System(models.Model):
     def __str__(self):
         return self.name
 
+def has_free_seat():
+	"""Filter matching events that can take one more approved player."""
+	return models.Q(max_players__isnull=True) | models.Q(max_players=0) | models.Q(approved_count__lt=models.F("max_players"))
+
+class ApprovedPlayerNames(models.Subquery):
+	"""JSON array of the usernames of the approved players of the outer event, in request order."""
+	# JSON_GROUP_ARRAY() takes no ORDER BY before SQLite 3.44, its window form does
+	template = (
+		'COALESCE((SELECT JSON_GROUP_ARRAY("name") OVER (ORDER BY "id" ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING) '
+		'FROM (%(subquery)s) "players" LIMIT 1), \'[]\')'
+	)
+
+	def __init__(self):
+		players = (
+			EventRequest.objects.filter(event=models.OuterRef("pk"), status="approved")
+			.order_by().values("id", name=models.F("user__username"))
+		)
+		super().__init__(players, output_field=models.JSONField())
+
+	def as_postgresql(self, compiler, connection, **extra_context):
+		# jsonb, which Django reads as text; psycopg would decode json itself before JSONField does
+		template = '(SELECT COALESCE(JSONB_AGG("name" ORDER BY "id"), \'[]\'::jsonb) FROM (%(subquery)s) "players")'
+		return self.as_sql(compiler, connection, template=template, **extra_context)
+
+class EventQuerySet(models.QuerySet):
+	def for_listing(self, fields=None):
+		"""
+		Load everything EventSerializer renders in a fixed number of queries:
+		organizer and system are joined, approved players are prefetched.
+		`fields` (EventSerializer field names) restricts the load to what they render.
+		"""
+		events = self
+		if fields is None or "organizer" in fields:
+			events = events.select_related("organizer")
+		if fields is None or "system" in fields:
+			events = events.select_related("system")
+		if fields is None or "players" in fields:
+			events = events.prefetch_related(
+				models.Prefetch(
+					"requests",
+					queryset=EventRequest.objects.filter(status="approved").select_related("user").order_by("id"),
+					to_attr="approved_requests",
+				)
+			)
+		if fields is None:
+			return events
+		# date_start is what the event list pages by
+		columns = {"date_start"}
+		for name in fields:
+			if name == "organizer":
+				columns.update(["organizer", "organizer__username"])
+			elif name == "system":
+				columns.update(["system", "system__name"])
+			elif name != "players":
+				columns.add(name)
+		return events.only(*columns)
+
+	def listing_values(self, fields=None):
+		"""
+		The .values() counterpart of for_listing(), for api.serializers.EventRowSerializer: one
+		query, with `organizer_name`, `system_name` and `player_names` (a JSON array) computed
+		in SQL. `fields` (EventSerializer field names) restricts it to what they render.
+		"""
+		related = {
+			"organizer": {"organizer_name": models.F("organizer__username")},
+			"system": {"system_name": models.F("system__name")},
+			"players": {"player_names": ApprovedPlayerNames()},
+		}
+		# id and date_start are what the event list pages by
+		columns = {"id", "date_start"}
+		computed = {}
+		for name in fields if fields is not None else [field.name for field in self.model._meta.concrete_fields] + list(related):
+			if name in related:
+				computed.update(related[name])
+			else:
+				columns.add(self.model._meta.get_field(name).attname)
+		return self.values(*columns, **computed)
+
+	def for_cards(self):
+		"""Load the columns EventCardSerializer renders, and nothing else."""
+		return self.select_related("system").only(
+			"title", "date_start", "online", "max_players", "approved_count", "system", "system__name",
+		)
+
+	def adjust_counters(self, deltas):
+		"""Atomically shift the maintained request counters by `deltas` ({field: amount})."""
+		changes = {field: models.F(field) + amount for field, amount in deltas.items() if amount}
+		if not changes:
+			return 0
+		return self.update(updated_at=timezone.now(), **changes)
+
+	def series_in(self, start, end=None):
+		"""Recurring events with at least one occurrence starting in [start, end) (no end if None)."""
+		series = self.exclude(recurrence="").filter(date_start__isnull=False)
+		if end is not None:
+			series = series.filter(date_start__lt=end)
+		return series.filter(models.Q(recurrence_end__isnull=True) | models.Q(recurrence_end__gte=start))
+
+	def with_request_status(self, user):
+		"""Annotate `viewer_status` with the status of `user`'s join request (None if they did not ask to join)."""
+		own_request = EventRequest.objects.filter(event=models.OuterRef("pk"), user=user)
+		return self.annotate(viewer_status=models.Subquery(own_request.values("status")[:1]))
+
 class Event(models.Model):
+	RECURRENCE_CHOICES = [
+		("", "Does not repeat"),
+		("weekly", "Weekly"),
+		("biweekly", "Every two weeks"),
+		("monthly", "Monthly"),
+	]
+
 	title = models.CharField(max_length=200, blank=True)
 	system = models.ForeignKey(System, on_delete=models.SET_NULL, null=True, blank=True, related_name="events") #filtering by ttrpg systems; ex: DnD5e, daggerheart... 
 	game_setting = models.CharField(max_length=200, blank=True, null=True)
@@ -24,17 +136,71 @@ class Event(models.Model):
 	created = models.DateTimeField(auto_now_add=True, blank=True)
 	updated_at = models.DateTimeField(auto_now=True)
 
+	# Join request counters, kept in step with EventRequest rows (see EventRequest.save()).
+	# `manage.py recount_event_requests` recomputes them if they ever drift.
+	approved_count = models.PositiveIntegerField(default=0, editable=False)
+	pending_count = models.PositiveIntegerField(default=0, editable=False)
+
+	# Recurring campaigns: occurrences are computed on read, see base.recurrence
+	recurrence = models.CharField(max_length=10, choices=RECURRENCE_CHOICES, default="", blank=True)
+	recurrence_until = models.DateTimeField(blank=True, null=True)
+	recurrence_count = models.PositiveIntegerField(blank=True, null=True, validators=[MinValueValidator(1)])
+	# Start of the last occurrence (None while the rule never ends), kept by save()
+	recurrence_end = models.DateTimeField(blank=True, null=True, editable=False)
+	# Set on the Event rows materialized for one occurrence of a recurring event
+	recurrence_parent = models.ForeignKey("self", on_delete=models.CASCADE, related_name="occurrences", blank=True, null=True)
+	recurrence_index = models.PositiveIntegerField(blank=True, null=True)
+
 	# DM who creates/organizes this event
 	organizer = models.ForeignKey(User, on_delete=models.CASCADE, related_name="organized_events", blank=True, null=True,)
 	# Approved players — linked only after DM approves
 	players = models.ManyToManyField(User, related_name="joined_events", through="EventRequest", blank=True, null=True,)
 
+	objects = EventQuerySet.as_manager()
+
+	class Meta:
+		indexes = [
+			# Keyset pagination of the event list walks (date_start, id)
+			models.Index(fields=["date_start", "id"], name="event_date_start_id_idx"),
+			# List filters (see EventFilterForm), each followed by the list ordering
+			models.Index(fields=["system", "date_start"], name="event_system_date_start_idx"),
+			models.Index(fields=["online", "date_start"], name="event_online_date_start_idx"),
+			models.Index(fields=["organizer", "date_start"], name="event_organizer_date_idx"),
+			models.Index(fields=["date_start", "id"], condition=has_free_seat(), name="event_open_date_start_idx"),
+			# Schedule overlap checks (see base.schedule)
+			models.Index(fields=["date_start", "date_end"], name="event_date_range_idx"),
+			# Recurring events still running in a window (see EventQuerySet.series_in)
+			models.Index(fields=["recurrence_end"], condition=~models.Q(recurrence=""), name="event_recurrence_end_idx"),
+		]
+		constraints = [
+			models.UniqueConstraint(fields=["recurrence_parent", "recurrence_index"], name="event_unique_occurrence"),
+		]
+
 	def __str__(self):
 		return f"{self.title} ({self.date_start.date() if self.date_start else 'TBD'})"
 
+	def set_recurrence_end(self):
+		"""Denormalize the start of the last occurrence; call it before bulk_create(), which skips save()."""
+		self.recurrence_end = recurrence.last_start(self) if self.recurrence else None
+
+	def save(self, *args, **kwargs):
+		self.set_recurrence_end()
+		update_fields = kwargs.get("update_fields")
+		if update_fields is not None:
+			kwargs["update_fields"] = {*update_fields, "recurrence_end"}
+		super().save(*args, **kwargs)
+
+	@property
+	def approved_players(self):
+		"""Users whose join request was approved (uses the for_listing() prefetch when present)."""
+		requests = getattr(self, "approved_requests", None)
+		if requests is None:
+			requests = self.requests.filter(status="approved").select_related("user").order_by("id")
+		return [req.user for req in requests]
+
 	def has_space(self):
 		"""Check if the event still has room for new players."""
-		return self.players.count() < self.max_players if self.max_players else True
+		return self.approved_count < self.max_players if self.max_players else True
 
 class EventRequest(models.Model):
     STATUS_CHOICES = [
@@ -48,8 +214,57 @@ class EventRequest(models.Model):
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending")
     created_at = models.DateTimeField(default=timezone.now)
 
+    # Event counter maintained for each status
+    STATUS_COUNTERS = {
+        "pending": "pending_count",
+        "approved": "approved_count",
+    }
+
     class Meta:
         unique_together = ("event", "user")  # One request per user per event
+        # Each one answers its lookups from the index alone, without reading the table rows
+        indexes = [
+            # Approved players and status counts of an event
+            models.Index(fields=["event", "status"], name="request_event_status_idx"),
+            # The requests of a user by status, with their events (dashboard, schedule conflicts)
+            models.Index(fields=["user", "status", "event"], name="request_user_status_idx"),
+            # Moderation queue of an event, a small share of the rows
+            models.Index(fields=["event", "id"], condition=models.Q(status="pending"), name="request_pending_event_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user.username} -> {self.event.title} ({self.status})"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._saved_status = instance.__dict__.get("status")
+        return instance
+
+    @classmethod
+    def counter_deltas(cls, old_status, new_status):
+        """Event counter changes for a request moving from `old_status` to `new_status` (None = no row)."""
+        deltas = {}
+        if old_status in cls.STATUS_COUNTERS:
+            field = cls.STATUS_COUNTERS[old_status]
+            deltas[field] = deltas.get(field, 0) - 1
+        if new_status in cls.STATUS_COUNTERS:
+            field = cls.STATUS_COUNTERS[new_status]
+            deltas[field] = deltas.get(field, 0) + 1
+        return deltas
+
+    def save(self, *args, **kwargs):
+        """Save the request and move the event counters in the same transaction."""
+        old_status = getattr(self, "_saved_status", None)
+        with transaction.atomic(using=kwargs.get("using")):
+            super().save(*args, **kwargs)
+            Event.objects.filter(pk=self.event_id).adjust_counters(self.counter_deltas(old_status, self.status))
+        self._saved_status = self.status
+
+    def delete(self, *args, **kwargs):
+        old_status = getattr(self, "_saved_status", None)
+        with transaction.atomic(using=kwargs.get("using")):
+            result = super().delete(*args, **kwargs)
+            Event.objects.filter(pk=self.event_id).adjust_counters(self.counter_deltas(old_status, None))
+        self._saved_status = None
+        return result
@@ -0,0 +1,94 @@
+"""
+Occurrences of recurring events, computed on demand.
+
+A recurring Event stores its rule (`recurrence`, plus an optional `recurrence_until`
+and/or `recurrence_count`) and is itself occurrence 0. Later occurrences are not stored:
+occurrences() computes the ones starting in a date window, jumping straight to the
+first of them, so listing a window costs what the window contains, not the lifetime of
+the rule. Occurrences keep the local wall-clock time of the first session across DST
+changes. `manage.py materialize_occurrences` creates Event rows for upcoming
+occurrences when players need to join them; those rows point back to their series
+through `recurrence_parent`/`recurrence_index`.
+"""
+from calendar import monthrange
+from collections import namedtuple
+from datetime import timedelta
+
+from django.utils import timezone
+
+PERIOD_DAYS = {
+	"weekly": 7,
+	"biweekly": 14,
+}
+
+Occurrence = namedtuple("Occurrence", ["event", "index", "date_start", "date_end"])
+
+
+def add_months(moment, months):
+	years, month = divmod(moment.month - 1 + months, 12)
+	year = moment.year + years
+	return moment.replace(year=year, month=month + 1, day=min(moment.day, monthrange(year, month + 1)[1]))
+
+
+def occurrence_start(event, index):
+	"""Start of occurrence `index` of `event` (0 is the event itself)."""
+	local = timezone.localtime(event.date_start)
+	naive = local.replace(tzinfo=None)
+	if event.recurrence == "monthly":
+		naive = add_months(naive, index)
+	else:
+		naive += timedelta(days=PERIOD_DAYS[event.recurrence] * index)
+	return timezone.make_aware(naive, local.tzinfo)
+
+
+def first_index(event, moment):
+	"""Index of the first occurrence starting at or after `moment`, ignoring the end of the rule."""
+	if moment <= event.date_start:
+		return 0
+	if event.recurrence == "monthly":
+		start, local = timezone.localtime(event.date_start), timezone.localtime(moment)
+		index = (local.year - start.year) * 12 + local.month - start.month - 1
+	else:
+		index = (moment - event.date_start) // timedelta(days=PERIOD_DAYS[event.recurrence]) - 1
+	# The estimate is at most one period early (DST shifts, short months); walk up from it
+	index = max(index, 0)
+	while occurrence_start(event, index) < moment:
+		index += 1
+	return index
+
+
+def last_index(event):
+	"""Index of the last occurrence of `event`, or None if the rule never ends."""
+	if not event.recurrence:
+		return 0
+	last = None
+	if event.recurrence_count:
+		last = event.recurrence_count - 1
+	if event.recurrence_until:
+		until = max(first_index(event, event.recurrence_until + timedelta(microseconds=1)) - 1, 0)
+		last = until if last is None else min(last, until)
+	return last
+
+
+def last_start(event):
+	"""Start of the last occurrence of `event`, or None if the rule never ends."""
+	if event.date_start is None:
+		return None
+	last = last_index(event)
+	return None if last is None else occurrence_start(event, last)
+
+
+def occurrences(event, window_start, window_end=None):
+	"""Lazily yield the Occurrences of `event` starting in [window_start, window_end) (no end if None)."""
+	if event.date_start is None:
+		return
+	last = last_index(event)
+	duration = event.date_end - event.date_start if event.date_end else None
+	index = first_index(event, window_start) if event.recurrence else 0
+	while last is None or index <= last:
+		start = occurrence_start(event, index) if index else event.date_start
+		if window_end is not None and start >= window_end:
+			return
+		if start >= window_start:
+			yield Occurrence(event, index, start, start + duration if duration else None)
+		index += 1
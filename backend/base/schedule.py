@@ -0,0 +1,76 @@
+"""
+Overlap detection between a user's sessions.
+
+A user is busy during the events they organize and the ones they were approved for.
+Two events overlap when each starts before the other ends; events without a date
+never conflict, and events without a `date_end` are assumed to last DEFAULT_DURATION.
+Single checks are interval-overlap queries that seek on ``event_date_range_idx``;
+the batch report sorts the user's sessions once and sweeps them, so it only compares
+sessions that actually overlap.
+"""
+import heapq
+from datetime import timedelta
+
+from django.db.models import DateTimeField, Exists, F, OuterRef, Q
+from django.db.models.functions import Coalesce
+
+from .models import Event, EventRequest
+
+DEFAULT_DURATION = timedelta(hours=4)
+
+
+def with_end(events):
+	"""Annotate `ends_at`, the effective end of each event."""
+	return events.annotate(
+		ends_at=Coalesce("date_end", F("date_start") + DEFAULT_DURATION, output_field=DateTimeField()),
+	)
+
+
+def end_of(event):
+	return event.date_end or event.date_start + DEFAULT_DURATION
+
+
+def overlapping(events, start, end):
+	"""Narrow `events` to the ones overlapping the interval [start, end)."""
+	return with_end(events.filter(date_start__lt=end)).filter(ends_at__gt=start)
+
+
+def busy_users(user_ids, event):
+	"""
+	Map each of `user_ids` who is busy during `event` to the title of one overlapping
+	session. Two queries whatever the number of users.
+	"""
+	if event.date_start is None or not user_ids:
+		return {}
+	sessions = overlapping(Event.objects.exclude(pk=event.pk), event.date_start, end_of(event))
+	busy = dict(
+		EventRequest.objects.filter(user_id__in=user_ids, status="approved", event__in=sessions)
+		.values_list("user_id", "event__title")
+	)
+	busy.update(sessions.filter(organizer_id__in=user_ids).values_list("organizer_id", "title"))
+	return busy
+
+
+def sessions_of(user, statuses=("approved",)):
+	"""Dated events `user` organizes or has a request with one of `statuses` for, ordered by start."""
+	own_request = EventRequest.objects.filter(event=OuterRef("pk"), user=user, status__in=statuses)
+	return (
+		Event.objects.filter(Q(organizer=user) | Exists(own_request), date_start__isnull=False)
+		.order_by("date_start", "id")
+	)
+
+
+def conflicting_pairs(events):
+	"""
+	All overlapping pairs among `events` (ordered by date_start), found with a sweep line:
+	a heap keeps the sessions still running at each start, so the cost is
+	O(n log n + number of overlapping pairs) instead of comparing every pair.
+	"""
+	running = []
+	pairs = []
+	for index, event in enumerate(events):
+		while running and running[0][0] <= event.date_start:
+			heapq.heappop(running)
+		pairs.extend((other, event) for _, _, other in running)
+		heapq.heappush(running, (end_of(event), index, event))
+	return pairs
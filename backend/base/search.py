@@ -0,0 +1,93 @@
+"""
+Full-text search over event titles, settings, descriptions and locations.
+
+On SQLite the text lives in an FTS5 virtual table (created by migration 0010) whose
+rowid is the event id; it is kept in step by the Event signals in base.signals and
+by index_events() for bulk inserts. On PostgreSQL the same columns are matched with
+to_tsvector() backed by a GIN expression index, which the database maintains by
+itself. Other databases fall back to icontains filtering.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from .models import Event
+
+SEARCH_TABLE = "base_event_search"
+SEARCH_FIELDS = ("title", "game_setting", "description", "location")
+
+# Kept identical to the GIN index expression of migration 0010
+PG_VECTOR = (
+	"to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(game_setting, '') || ' ' "
+	"|| coalesce(description, '') || ' ' || coalesce(location, ''))"
+)
+
+WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def fts_query(text):
+	"""Turn free text into an FTS5 query: every word must match, as a prefix."""
+	return " ".join(f'"{word}"*' for word in WORD.findall(text))
+
+
+def search_event_ids(text, limit, offset=0):
+	"""Ids of the events matching `text`, best match first."""
+	if connection.vendor == "sqlite":
+		query = fts_query(text)
+		if not query:
+			return []
+		sql = f"SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s ORDER BY rank LIMIT %s OFFSET %s"
+		params = [query, limit, offset]
+	elif connection.vendor == "postgresql":
+		sql = (
+			f"SELECT id FROM base_event, websearch_to_tsquery('simple', %s) q "
+			f"WHERE {PG_VECTOR} @@ q ORDER BY ts_rank({PG_VECTOR}, q) DESC, id LIMIT %s OFFSET %s"
+		)
+		params = [text, limit, offset]
+	else:
+		words = WORD.findall(text)
+		if not words:
+			return []
+		matches = Event.objects.all()
+		for word in words:
+			condition = Q()
+			for field in SEARCH_FIELDS:
+				condition |= Q(**{f"{field}__icontains": word})
+			matches = matches.filter(condition)
+		return list(matches.order_by("date_start", "id").values_list("id", flat=True)[offset:offset + limit])
+
+	with connection.cursor() as cursor:
+		cursor.execute(sql, params)
+		return [row[0] for row in cursor.fetchall()]
+
+
+def index_events(events):
+	"""(Re)index `events` in the FTS5 table. No-op on databases that index by themselves."""
+	if connection.vendor != "sqlite":
+		return
+	columns = ", ".join(SEARCH_FIELDS)
+	placeholders = ", ".join(["%s"] * (len(SEARCH_FIELDS) + 1))
+	rows = [[event.pk] + [getattr(event, field) for field in SEARCH_FIELDS] for event in events]
+	if not rows:
+		return
+	with connection.cursor() as cursor:
+		cursor.executemany(f"INSERT OR REPLACE INTO {SEARCH_TABLE} (rowid, {columns}) VALUES ({placeholders})", rows)
+
+
+def remove_events(event_ids):
+	if connection.vendor != "sqlite" or not event_ids:
+		return
+	with connection.cursor() as cursor:
+		cursor.executemany(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s", [[pk] for pk in event_ids])
+
+
+def rebuild_index():
+	"""Rebuild the FTS5 table from scratch. Returns the number of indexed events."""
+	if connection.vendor != "sqlite":
+		return Event.objects.count()
+	columns = ", ".join(SEARCH_FIELDS)
+	with connection.cursor() as cursor:
+		cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+		cursor.execute(f"INSERT INTO {SEARCH_TABLE} (rowid, {columns}) SELECT id, {columns} FROM base_event")
+		return cursor.rowcount
@@ -0,0 +1,107 @@
+"""
+Generated planner data for benchmarks and local testing.
+
+seed() bulk-creates users, systems, events and join requests. Popularity is skewed
+like on a real listing: the chance that a join request goes to the event of rank r is
+proportional to 1 / r ** skew, so a few events collect most of the requests. The
+counters of the events match their requests, and the same `seed` gives the same data.
+"""
+import random
+import uuid
+from collections import Counter
+from datetime import timedelta
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+from . import search
+from .cache import invalidate_on_commit
+from .models import Event, EventRequest, System
+
+# Usernames and system names of generated rows start with this
+PREFIX = "seed-"
+
+TABLE_SIZES = [0, 3, 4, 4, 5, 6, 8]
+STATUS_WEIGHTS = {"approved": 6, "pending": 3, "rejected": 1}
+
+
+def popularity(count, skew):
+	"""Cumulative weights of `count` ranks following a Zipf-like law."""
+	return list(accumulate(1 / rank ** skew for rank in range(1, count + 1)))
+
+
+@transaction.atomic
+def seed(users, systems, events, requests, skew=1.1, seed=0, batch_size=1000):
+	"""Create the rows and return how many of each were created."""
+	rng = random.Random(seed)
+	tag = uuid.UUID(int=rng.getrandbits(128)).hex[:8]
+	if User.objects.filter(username__startswith=f"{PREFIX}{tag}-").exists():
+		# Seeding twice with the same seed must not collide on the unique names
+		tag = uuid.uuid4().hex[:8]
+	now = timezone.now().replace(minute=0, second=0, microsecond=0)
+
+	password = make_password(None)
+	user_rows = User.objects.bulk_create(
+		(User(username=f"{PREFIX}{tag}-user-{n}", password=password) for n in range(users)),
+		batch_size=batch_size,
+	)
+	system_rows = System.objects.bulk_create(
+		(System(name=f"{PREFIX}{tag} system {n}") for n in range(systems)),
+		batch_size=batch_size,
+	)
+	system_weights = popularity(len(system_rows), skew)
+
+	event_rows = []
+	for n in range(events):
+		dated = rng.random() > 0.05
+		start = now + timedelta(hours=rng.randint(-24 * 30, 24 * 180)) if dated else None
+		event_rows.append(Event(
+			title=f"Session {n}",
+			system=rng.choices(system_rows, cum_weights=system_weights)[0] if system_rows else None,
+			organizer=rng.choice(user_rows) if user_rows else None,
+			description="A campaign looking for players. " * rng.randint(1, 20),
+			date_start=start,
+			date_end=start + timedelta(hours=rng.randint(2, 5)) if dated else None,
+			online=rng.random() < 0.6,
+			max_players=rng.choice(TABLE_SIZES),
+		))
+	event_rows = Event.objects.bulk_create(event_rows, batch_size=batch_size)
+
+	# The most popular events are spread over the list, not the first ones created
+	ranked = rng.sample(event_rows, len(event_rows))
+	event_weights = popularity(len(ranked), skew)
+	statuses, status_weights = list(STATUS_WEIGHTS), list(STATUS_WEIGHTS.values())
+	pairs = set()
+	approved = Counter()
+	pending = Counter()
+	request_rows = []
+	# Popular events run out of new players, give up after a few misses per request
+	for _ in range(requests * 5):
+		if len(request_rows) >= requests or not ranked or not user_rows:
+			break
+		event = rng.choices(ranked, cum_weights=event_weights)[0]
+		user = rng.choice(user_rows)
+		if user.pk == event.organizer_id or (event.pk, user.pk) in pairs:
+			continue
+		pairs.add((event.pk, user.pk))
+		status = rng.choices(statuses, weights=status_weights)[0]
+		if status == "approved" and event.max_players and approved[event.pk] >= event.max_players:
+			status = "pending"
+		if status == "approved":
+			approved[event.pk] += 1
+		elif status == "pending":
+			pending[event.pk] += 1
+		request_rows.append(EventRequest(event=event, user=user, status=status))
+	EventRequest.objects.bulk_create(request_rows, batch_size=batch_size)
+
+	for event in event_rows:
+		event.approved_count = approved[event.pk]
+		event.pending_count = pending[event.pk]
+	Event.objects.bulk_update(event_rows, ["approved_count", "pending_count"], batch_size=batch_size)
+
+	search.index_events(event_rows)
+	invalidate_on_commit("events")
+	return {"users": len(user_rows), "systems": len(system_rows), "events": len(event_rows), "requests": len(request_rows)}
@@ -0,0 +1,177 @@
+"""
+Seat reservation for join requests.
+
+Joining and moderating are check-then-act operations, so they are applied with
+conditional UPDATEs inside a transaction: a request only changes status if it still
+has the status we read, and an approval only goes through if the UPDATE claiming the
+seat matches a row with a free seat. Concurrent callers therefore either win or get a
+SeatConflict, never an oversubscribed event. On PostgreSQL the request row is also
+locked with SELECT ... FOR UPDATE; SQLite ignores that and relies on its single writer
+(transactions start with BEGIN IMMEDIATE, see settings.DATABASES), retrying briefly
+when the database stays locked by another writer.
+
+Requests and approvals are also refused with a ScheduleConflict when the player is
+already busy with an overlapping session (see base.schedule).
+"""
+import time
+
+from django.db import IntegrityError, OperationalError, transaction
+
+from . import dashboard, schedule
+from .broker import notify_on_commit, request_change
+from .cache import invalidate_on_commit
+from .models import Event, EventRequest, has_free_seat
+
+LOCK_RETRIES = 8
+LOCK_BACKOFF = 0.01
+
+
+class SeatConflict(Exception):
+	"""The change conflicts with the current state of the event (full, already requested, ...)."""
+
+
+class ScheduleConflict(SeatConflict):
+	"""The player is already busy with an overlapping session."""
+
+	def __init__(self, title):
+		super().__init__(f"This event overlaps with another session of the player: {title}.")
+
+
+def atomic_with_retry(func):
+	"""
+	Run `func` in a transaction, retrying when SQLite reports the database as locked.
+
+	Inside an outer transaction the retry is impossible, so the error propagates.
+	"""
+	for attempt in range(LOCK_RETRIES):
+		try:
+			with transaction.atomic():
+				return func()
+		except OperationalError as exc:
+			retryable = "locked" in str(exc) and not transaction.get_connection().in_atomic_block
+			if not retryable or attempt == LOCK_RETRIES - 1:
+				raise
+			time.sleep(LOCK_BACKOFF * 2 ** attempt)
+
+
+def request_to_join(event, user):
+	"""Create a pending join request of `user` for `event`."""
+	def join():
+		if EventRequest.objects.filter(event=event, user=user).exists():
+			raise SeatConflict("You already requested to join this event.")
+		if not Event.objects.filter(has_free_seat(), pk=event.pk).exists():
+			raise SeatConflict("This event is full.")
+		busy = schedule.busy_users([user.pk], event)
+		if busy:
+			raise ScheduleConflict(busy[user.pk])
+		try:
+			with transaction.atomic():
+				return EventRequest.objects.create(event=event, user=user, status="pending")
+		except IntegrityError:
+			# Lost the race against a parallel request of the same user
+			raise SeatConflict("You already requested to join this event.")
+
+	return atomic_with_retry(join)
+
+
+def set_request_status(join_request, status):
+	"""
+	Move `join_request` to `status`, claiming a seat when it gets approved.
+
+	Returns the updated request; raises SeatConflict when the event is full or the
+	request was changed by someone else in the meantime.
+	"""
+	def moderate():
+		current = EventRequest.objects.select_for_update().get(pk=join_request.pk)
+		if current.status == status:
+			return current
+
+		if status == "approved":
+			busy = schedule.busy_users([current.user_id], Event.objects.only("date_start", "date_end").get(pk=current.event_id))
+			if busy:
+				raise ScheduleConflict(busy[current.user_id])
+
+		moved = EventRequest.objects.filter(pk=current.pk, status=current.status).update(status=status)
+		if not moved:
+			raise SeatConflict("This request was updated by someone else.")
+
+		events = Event.objects.filter(pk=current.event_id)
+		if status == "approved":
+			events = events.filter(has_free_seat())
+		claimed = events.adjust_counters(EventRequest.counter_deltas(current.status, status))
+		if status == "approved" and not claimed:
+			raise SeatConflict("This event is full.")
+
+		current.status = status
+		current._saved_status = status
+		invalidate_on_commit("events")
+		notify_on_commit(current.event_id, [request_change(current)])
+		dashboard.invalidate_request_on_commit(join_request)
+		return current
+
+	updated = atomic_with_retry(moderate)
+	join_request.status = updated.status
+	join_request._saved_status = updated.status
+	return join_request
+
+
+def moderate_requests(event, decisions):
+	"""
+	Apply a batch of ``{"id", "status"}`` decisions to the join requests of `event`, in order.
+
+	Capacity is checked decision by decision against the locked event, so approvals past
+	the last free seat come back as conflicts while the rest of the batch still applies.
+	All changes are written with one bulk_update and one counter UPDATE. Returns one
+	result dict per decision.
+	"""
+	def moderate():
+		ids = [decision["id"] for decision in decisions]
+		# Lock request rows before the event row, in the same order as set_request_status()
+		requests = {
+			req.pk: req
+			for req in EventRequest.objects.select_for_update().select_related("user")
+				.filter(event_id=event.pk, pk__in=ids).order_by("pk")
+		}
+		locked = Event.objects.select_for_update().get(pk=event.pk)
+		seats_taken = locked.approved_count
+		approving = [req.user_id for req in requests.values() if req.status != "approved"]
+		busy = schedule.busy_users(approving, locked) if any(d["status"] == "approved" for d in decisions) else {}
+
+		changed = {}
+		deltas = {}
+		results = []
+		for decision in decisions:
+			req = requests.get(decision["id"])
+			status = decision["status"]
+			if req is None:
+				results.append({"id": decision["id"], "status": None, "result": "not_found", "detail": "Join request not found."})
+				continue
+			if req.status == status:
+				results.append({"id": req.pk, "user": req.user.username, "status": req.status, "result": "unchanged"})
+				continue
+			if status == "approved" and locked.max_players and seats_taken >= locked.max_players:
+				results.append({"id": req.pk, "user": req.user.username, "status": req.status, "result": "conflict", "detail": "This event is full."})
+				continue
+			if status == "approved" and req.user_id in busy:
+				detail = str(ScheduleConflict(busy[req.user_id]))
+				results.append({"id": req.pk, "user": req.user.username, "status": req.status, "result": "conflict", "detail": detail})
+				continue
+
+			for field, amount in EventRequest.counter_deltas(req.status, status).items():
+				deltas[field] = deltas.get(field, 0) + amount
+			seats_taken += (status == "approved") - (req.status == "approved")
+			req.status = status
+			changed[req.pk] = req
+			results.append({"id": req.pk, "user": req.user.username, "status": status, "result": "updated"})
+
+		if changed:
+			EventRequest.objects.bulk_update(changed.values(), ["status"])
+			Event.objects.filter(pk=locked.pk).adjust_counters(deltas)
+			for req in changed.values():
+				req._saved_status = req.status
+			invalidate_on_commit("events")
+			notify_on_commit(locked.pk, [request_change(req) for req in changed.values()])
+			dashboard.invalidate_users_on_commit(locked.organizer_id, *(req.user_id for req in changed.values()))
+		return results
+
+	return atomic_with_retry(moderate)
@@ -0,0 +1,70 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import dashboard, search, system_names
+from .broker import notify_on_commit, request_change
+from .cache import invalidate_on_commit
+from .models import Event, EventRequest, System
+
+
+@receiver([post_save, post_delete], sender=Event)
+@receiver([post_save, post_delete], sender=EventRequest)
+def invalidate_event_responses(sender, **kwargs):
+	invalidate_on_commit("events")
+
+
+@receiver(post_save, sender=Event)
+def index_event(sender, instance, **kwargs):
+	search.index_events([instance])
+
+
+@receiver(post_delete, sender=Event)
+def unindex_event(sender, instance, **kwargs):
+	search.remove_events([instance.pk])
+
+
+@receiver(post_save, sender=EventRequest)
+def push_request_change(sender, instance, **kwargs):
+	notify_on_commit(instance.event_id, [request_change(instance)])
+
+
+@receiver(post_delete, sender=EventRequest)
+def push_request_removal(sender, instance, **kwargs):
+	notify_on_commit(instance.event_id, [request_change(instance, deleted=True)])
+
+
+@receiver(post_save, sender=Event)
+def push_event_change(sender, instance, created, **kwargs):
+	if not created:
+		notify_on_commit(instance.pk)
+
+
+@receiver(post_delete, sender=Event)
+def push_event_removal(sender, instance, **kwargs):
+	notify_on_commit(instance.pk, closed=True)
+
+
+@receiver([post_save, post_delete], sender=EventRequest)
+def invalidate_request_dashboards(sender, instance, **kwargs):
+	dashboard.invalidate_request_on_commit(instance)
+
+
+@receiver(post_save, sender=Event)
+def invalidate_event_dashboards(sender, instance, created, **kwargs):
+	if created:
+		dashboard.invalidate_users_on_commit(instance.organizer_id)
+	else:
+		dashboard.invalidate_event_on_commit(instance)
+
+
+@receiver(post_delete, sender=Event)
+def invalidate_organizer_dashboard(sender, instance, **kwargs):
+	# The requests went first, each refreshing its requester's dashboard
+	dashboard.invalidate_users_on_commit(instance.organizer_id)
+
+
+@receiver([post_save, post_delete], sender=System)
+def invalidate_system_responses(sender, **kwargs):
+	# Events embed the system name
+	invalidate_on_commit("systems", "events")
+	system_names.clear()
@@ -0,0 +1,67 @@
+"""
+Process-local lookup of game systems by name (case-insensitive).
+
+The System table is tiny and nearly static, so the whole name -> (id, name) map is
+loaded once per process and then served from memory. Every System save/delete bumps
+the "systems" cache namespace (see base.signals); each process compares that version
+with the one its map was built from and reloads when it changed. With a shared cache
+(Redis, memcached) that catches changes made by any worker at once. A process-local
+cache only sees the changes of its own process, so maps are also reloaded once they
+are SYSTEM_NAMES_TTL seconds old.
+"""
+import threading
+import time
+
+from django.conf import settings
+
+from .cache import namespace_version
+from .models import System
+
+_lock = threading.Lock()
+_names = None
+_version = None
+_loaded_at = 0.0
+
+
+def _fresh(version):
+	return _names is not None and _version == version and time.monotonic() - _loaded_at < settings.SYSTEM_NAMES_TTL
+
+
+def _load():
+	global _names, _version, _loaded_at
+	version = namespace_version("systems")
+	names = _names
+	if names is not None and _fresh(version):
+		return names
+	with _lock:
+		if not _fresh(version):
+			loaded = {}
+			for pk, name in System.objects.order_by("id").values_list("id", "name"):
+				loaded.setdefault(name.lower(), (pk, name))
+			_names, _version, _loaded_at = loaded, version, time.monotonic()
+		return _names
+
+
+def get_system(name):
+	"""Return the System called `name` (any case) without querying, or None."""
+	if not isinstance(name, str):
+		return None
+	entry = _load().get(name.lower())
+	if entry is None:
+		return None
+	return System(pk=entry[0], name=entry[1])
+
+
+def clear():
+	"""Forget the map of this process; the next lookup reloads it."""
+	global _names
+	with _lock:
+		_names = None
+
+
+def filter_by_system(events, name):
+	"""Narrow an Event queryset to the system called `name`, without joining the System table."""
+	system = get_system(name)
+	if system is None:
+		return events.none()
+	return events.filter(system_id=system.pk)
@@ -1,3 +1,1505 @@
-from django.test import TestCase
+import asyncio
+import json
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+from base64 import urlsafe_b64encode
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
+from functools import partial
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.db import connection, connections, transaction
+from django.db.models import Count, F, Q
+from django.http import QueryDict
+from django.middleware.csrf import _unmask_cipher_token
+from django.test import AsyncClient, Client, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework.throttling import SimpleRateThrottle
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.authentication import token_user
+from api.serializers import EventSerializer
+from api.views import MAX_SEARCH_PAGE
+
+from . import metrics, recurrence, search, seeding, system_names
+from .cache import invalidate
+from .forms import EventFilterForm
+from .hasher_profiles import hashers_for
+from .models import Event, EventRequest, System
+from .schedule import conflicting_pairs, end_of
+from .services import request_to_join, set_request_status
+
+# For tests counting queries or reading back writes, which the response cache would hide
+NO_CACHE = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+
+
+class EventFixtures:
+	"""Dated events with approved and pending join requests, and the queries of the pages listing them."""
+
+	def setUp(self):
+		self.organizer = User.objects.create_user("organizer", password="secret")
+		self.system = System.objects.create(name="DnD5e")
+		self.created = 0
+
+	def create_events(self, count, players=3):
+		for _ in range(count):
+			self.created += 1
+			event = Event.objects.create(
+				title=f"Event {self.created}",
+				system=self.system,
+				organizer=self.organizer,
+				date_start=timezone.now() + timedelta(days=self.created),
+				online=bool(self.created % 2),
+				max_players=players + 1,
+			)
+			for n in range(players):
+				user = User.objects.create_user(f"player-{self.created}-{n}")
+				EventRequest.objects.create(event=event, user=user, status="approved")
+			pending = User.objects.create_user(f"pending-{self.created}")
+			EventRequest.objects.create(event=event, user=pending, status="pending")
+		return event
+
+	def fetch(self, url):
+		"""The response to GET `url` and the SQL of the queries it ran."""
+		with CaptureQueriesContext(connection) as queries:
+			response = self.client.get(url)
+		self.assertEqual(response.status_code, 200)
+		return response, [query["sql"] for query in queries.captured_queries]
+
+	def count_queries(self, url):
+		return len(self.fetch(url)[1])
+
+
+@override_settings(CACHES=NO_CACHE)
+class EventQueryBudgetTests(EventFixtures, TestCase):
+	"""The event API must issue the same number of queries however many events/players there are."""
+
+	def setUp(self):
+		super().setUp()
+		self.client = APIClient()
+
+	def test_list_query_count_is_constant(self):
+		self.create_events(2)
+		small = self.count_queries("/api/?page_size=100")
+		self.create_events(30)
+		large = self.count_queries("/api/?page_size=100")
+		self.assertEqual(small, large)
+
+	def test_detail_query_count_is_constant(self):
+		self.client.force_authenticate(self.organizer)
+		small_event = self.create_events(1, players=1)
+		large_event = self.create_events(1, players=20)
+		self.assertEqual(
+			self.count_queries(f"/api/{small_event.pk}/"),
+			self.count_queries(f"/api/{large_event.pk}/"),
+		)
+
+	def test_only_approved_players_are_listed(self):
+		event = self.create_events(1, players=2)
+		data = self.client.get("/api/").json()["results"][0]
+		self.assertEqual(data["players"], [user.username for user in event.approved_players])
+		self.assertEqual(len(data["players"]), 2)
+		self.assertEqual(data["organizer"], "organizer")
+		self.assertEqual(data["system"], "DnD5e")
+
+	def results_and_sql(self, url):
+		response, sql = self.fetch(url)
+		return response.json()["results"], sql
+
+	def test_sparse_fields_narrow_payload_and_columns(self):
+		self.create_events(2)
+		results, sql = self.results_and_sql("/api/?fields=id,title,system")
+		self.assertEqual(results[0], {"id": results[0]["id"], "title": "Event 1", "system": "DnD5e"})
+		# Dated and undated events are read separately, the players are not prefetched
+		self.assertEqual(len(sql), 2)
+		self.assertFalse(any('"description"' in query or "base_eventrequest" in query for query in sql))
+
+		results, sql = self.results_and_sql("/api/?omit=description,players")
+		self.assertNotIn("players", results[0])
+		self.assertIn("organizer", results[0])
+		self.assertFalse(any("base_eventrequest" in query for query in sql))
+
+		results, sql = self.results_and_sql("/api/?view=card&page_size=1")
+		self.assertEqual(results, [{
+			"id": results[0]["id"], "title": "Event 1", "system": "DnD5e", "date_start": results[0]["date_start"],
+			"online": True, "max_players": 4, "approved_count": 3, "has_space": True,
+		}])
+		self.assertNotIn('"description"', sql[0])
+		self.assertNotIn("auth_user", sql[0])
+
+		response = self.client.get("/api/?fields=title,secret&omit=nope")
+		self.assertEqual(response.status_code, 400)
+		self.assertEqual(set(response.json()), {"fields", "omit"})
+		self.assertEqual(self.client.get("/api/?view=poster").status_code, 400)
+
+
+@override_settings(CACHES=NO_CACHE)
+class EventRowParityTests(TestCase):
+	"""The .values() fast path of the event list must render exactly what EventSerializer renders."""
+
+	def setUp(self):
+		organizer = User.objects.create_user("organizer")
+		system = System.objects.create(name="Pathfinder 2e")
+		start = timezone.make_aware(datetime(2026, 7, 1, 18, 30, 15, 123456))
+		series = Event.objects.create(
+			title="Ünïcode \u2028 title", system=system, organizer=organizer, date_start=start,
+			date_end=start + timedelta(hours=3), recurrence="weekly", recurrence_count=4, description="Line\nbreak",
+		)
+		Event.objects.create(title="Child", organizer=organizer, date_start=start + timedelta(days=7), recurrence_parent=series, recurrence_index=1)
+		Event.objects.create(title="Undated", online=False, location=None, max_players=None)
+		Event.objects.create(title="No organizer", date_start=datetime(2026, 1, 1, tzinfo=UTC))
+		for n in range(3):
+			EventRequest.objects.create(event=series, user=User.objects.create_user(f"player-{n}"), status="approved" if n != 1 else "pending")
+
+	def expected(self, fields=None):
+		events = list(Event.objects.for_listing().order_by(F("date_start").asc(nulls_last=True), "id"))
+		return JSONRenderer().render(EventSerializer(events, many=True, fields=fields).data)
+
+	def test_output_matches_event_serializer(self):
+		for query, fields in [("", None), ("&fields=id,players,date_end,recurrence_parent", ["id", "players", "date_end", "recurrence_parent"]), ("&omit=players,organizer", [name for name in EventSerializer().fields if name not in ("players", "organizer")])]:
+			with self.subTest(query=query):
+				response = self.client.get(f"/api/?page_size=100{query}")
+				content = response.content
+				results = content[content.index(b'"results":') + len(b'"results":'):-1]
+				self.assertEqual(results, self.expected(fields))
+
+		async_response = self.client.get("/api/async/?page_size=100")
+		self.assertEqual(async_response.json()["results"], json.loads(self.expected()))
+
+	def test_players_in_request_order(self):
+		event = Event.objects.create(title="Ordered")
+		late, early = User.objects.create_user("zed"), User.objects.create_user("amy")
+		for user in [early, late]:
+			EventRequest.objects.create(event=event, user=user, status="approved")
+		rows = Event.objects.filter(pk=event.pk).listing_values(["players"])
+		self.assertEqual(rows.get()["player_names"], ["amy", "zed"])
+		self.assertEqual(Event.objects.filter(title="Undated").listing_values(["players"]).get()["player_names"], [])
+
+		# PostgreSQL must aggregate to jsonb, which JSONField decodes (json arrives already decoded)
+		names = rows.query.annotations["player_names"]
+		sql, _ = names.as_postgresql(rows.query.get_compiler(connection=connection), connection)
+		self.assertIn("JSONB_AGG(\"name\" ORDER BY \"id\")", sql)
+		self.assertIn("'[]'::jsonb", sql)
+
+
+class MyEventsTests(TestCase):
+	"""The dashboard must cost a fixed number of queries and drop its cache when the user's events change."""
+
+	def setUp(self):
+		cache.clear()
+		self.client = APIClient()
+		self.user = User.objects.create_user("player")
+		self.client.force_authenticate(self.user)
+		self.host = User.objects.create_user("host")
+		self.created = 0
+
+	def create_event(self, organizer, status=None):
+		self.created += 1
+		event = Event.objects.create(
+			title=f"Event {self.created}",
+			organizer=organizer,
+			date_start=timezone.now() + timedelta(days=self.created),
+		)
+		if status:
+			EventRequest.objects.create(event=event, user=self.user, status=status)
+		return event
+
+	def fetch(self):
+		with CaptureQueriesContext(connection) as queries:
+			response = self.client.get("/api/me/events/")
+		self.assertEqual(response.status_code, 200)
+		return response.json(), len(queries)
+
+	def titles(self, data):
+		return {group: [event["title"] for event in events] for group, events in data.items()}
+
+	def test_groups_and_query_count(self):
+		with self.captureOnCommitCallbacks(execute=True):
+			self.create_event(self.user)
+			self.create_event(self.host, "approved")
+			self.create_event(self.host, "pending")
+			self.create_event(self.host, "rejected")
+		data, small = self.fetch()
+		self.assertEqual(self.titles(data), {"organized": ["Event 1"], "joined": ["Event 2"], "pending": ["Event 3"]})
+
+		with self.captureOnCommitCallbacks(execute=True):
+			for status in ["approved", "pending"] * 5:
+				self.create_event(self.user)
+				self.create_event(self.host, status)
+		data, large = self.fetch()
+		self.assertEqual(len(data["joined"]), 6)
+		self.assertEqual(small, large)
+
+	def test_cache_is_invalidated_by_own_changes(self):
+		event = self.create_event(self.host)
+		self.fetch()
+		self.assertEqual(self.fetch()[1], 0)
+
+		with self.captureOnCommitCallbacks(execute=True):
+			join_request = request_to_join(event, self.user)
+		data, queries = self.fetch()
+		self.assertGreater(queries, 0)
+		self.assertEqual(self.titles(data)["pending"], ["Event 1"])
+
+		with self.captureOnCommitCallbacks(execute=True):
+			set_request_status(join_request, "approved")
+		self.assertEqual(self.titles(self.fetch()[0])["joined"], ["Event 1"])
+
+		with self.captureOnCommitCallbacks(execute=True):
+			event.title = "Renamed"
+			event.save()
+		self.assertEqual(self.titles(self.fetch()[0])["joined"], ["Renamed"])
+
+	def test_cache_is_private(self):
+		self.create_event(self.user)
+		self.fetch()
+		other = APIClient()
+		other.force_authenticate(self.host)
+		self.assertEqual(other.get("/api/me/events/").json()["organized"], [])
+
+
+@override_settings(ALLOWED_HOSTS=["testserver", "planner.example"])
+class ResponseCacheTests(TestCase):
+	"""Public API responses must be served from the cache until a write changes them."""
+
+	def setUp(self):
+		cache.clear()
+		self.organizer = User.objects.create_user("organizer")
+		self.system = System.objects.create(name="Pathfinder")
+		for n in range(3):
+			Event.objects.create(title=f"Event {n}", organizer=self.organizer, date_start=timezone.now() + timedelta(days=n))
+
+	def get(self, path="/api/?page_size=2", **extra):
+		with CaptureQueriesContext(connection) as queries:
+			response = self.client.get(path, **extra)
+		return response, len(queries)
+
+	def test_hits_and_conditional_requests(self):
+		first, queries = self.get()
+		self.assertGreater(queries, 0)
+		second, queries = self.get()
+		self.assertEqual((second.content, second["ETag"], queries), (first.content, first["ETag"], 0))
+		self.assertIn("Accept", second["Vary"])
+
+		not_modified, queries = self.get(HTTP_IF_NONE_MATCH=first["ETag"])
+		self.assertEqual((not_modified.status_code, not_modified["ETag"], not_modified.content, queries), (304, first["ETag"], b"", 0))
+		self.assertEqual(self.get(HTTP_IF_NONE_MATCH='"stale"')[0].status_code, 200)
+		# Other parameters are cached apart
+		self.assertNotEqual(self.get("/api/?page_size=3")[0].content, first.content)
+
+		admin = APIClient()
+		admin.force_authenticate(User.objects.create_user("admin", is_staff=True))
+		stats = admin.get("/api/cache/stats/").json()
+		self.assertEqual((stats["hits"], stats["misses"]), (3, 2))
+
+	def test_writes_invalidate_cached_responses(self):
+		before = self.get("/api/?page_size=100")[0].json()["results"]
+		client = APIClient()
+		client.force_authenticate(self.organizer)
+		with self.captureOnCommitCallbacks(execute=True):
+			response = client.post("/api/add/", {"title": "Fresh", "system": "Pathfinder", "date_start": "2020-01-01T10:00:00Z"}, format="json")
+		self.assertEqual(response.status_code, 201)
+		after, queries = self.get("/api/?page_size=100")
+		self.assertGreater(queries, 0)
+		self.assertEqual(len(after.json()["results"]), len(before) + 1)
+
+		with self.captureOnCommitCallbacks(execute=True):
+			self.system.name = "Pathfinder 2e"
+			self.system.save()
+		self.assertIn("Pathfinder 2e", self.get("/api/systems/")[0].content.decode())
+
+	def test_links_of_each_host_are_kept_apart(self):
+		local = self.get()[0].json()["next"]
+		other = self.get(HTTP_HOST="planner.example")[0].json()["next"]
+		secure = self.get(HTTP_HOST="planner.example", secure=True)[0].json()["next"]
+		self.assertTrue(local.startswith("http://testserver/"))
+		self.assertTrue(other.startswith("http://planner.example/"))
+		self.assertTrue(secure.startswith("https://planner.example/"))
+
+	def assert_csrf_not_shared(self, path):
+		"""Two sessions viewing the browsable API page at `path` must each get their own CSRF token."""
+		tokens = []
+		for _ in range(2):
+			client = Client()
+			response = client.get(path)
+			self.assertEqual(response.status_code, 200)
+			token = re.search(r'"csrfToken": "(\w+)"', response.content.decode())[1]
+			self.assertEqual(_unmask_cipher_token(token), client.cookies[settings.CSRF_COOKIE_NAME].value)
+			tokens.append(token)
+		self.assertNotEqual(*tokens)
+
+	def test_browsable_api_is_not_shared(self):
+		self.assert_csrf_not_shared("/api/?format=api")
+
+	def test_browsable_occurrences_are_not_shared(self):
+		self.assert_csrf_not_shared("/api/events/occurrences/?format=api&start=2026-01-01T00:00:00Z&end=2026-02-01T00:00:00Z")
+
+
+@override_settings(CACHES=NO_CACHE)
+class BulkImportExportTests(TestCase):
+	"""Imports must be all-or-nothing, and exports must stream what imports read back."""
+
+	def setUp(self):
+		self.organizer = User.objects.create_user("organizer")
+		self.client = APIClient()
+		self.client.force_authenticate(self.organizer)
+		System.objects.create(name="Pathfinder")
+
+	def payload(self, n, **changes):
+		return {"title": f"Imported {n}", "system": "Pathfinder", "date_start": f"2030-01-{n + 1:02}T18:00:00Z", **changes}
+
+	def ndjson(self, items):
+		return "".join(json.dumps(item) + "\n" for item in items)
+
+	def post_ndjson(self, body):
+		return self.client.generic("POST", "/api/events/import/", body, content_type="application/x-ndjson")
+
+	def test_import_in_chunks(self):
+		with mock.patch("api.views.IMPORT_CHUNK_SIZE", 2), CaptureQueriesContext(connection) as queries:
+			response = self.client.post("/api/events/import/", [self.payload(n) for n in range(5)], format="json")
+		self.assertEqual(response.json(), {"created": 5})
+		self.assertEqual(len([query for query in queries if query["sql"].startswith('INSERT INTO "base_event"')]), 3)
+		self.assertEqual(Event.objects.filter(organizer=self.organizer, title__startswith="Imported").count(), 5)
+
+	def test_invalid_events_cancel_the_whole_import(self):
+		items = [self.payload(n) for n in range(6)]
+		items[1]["system"] = "Unknown"
+		items[4]["max_players"] = -1
+		with mock.patch("api.views.IMPORT_CHUNK_SIZE", 2):
+			response = self.post_ndjson(self.ndjson(items))
+		self.assertEqual(response.status_code, 400)
+		body = response.json()
+		self.assertEqual((body["created"], [error["index"] for error in body["errors"]]), (0, [1, 4]))
+		self.assertIn("system", body["errors"][0]["errors"])
+		self.assertFalse(Event.objects.exists())
+
+		with mock.patch("api.views.MAX_IMPORT_ERRORS", 2), mock.patch("api.views.IMPORT_CHUNK_SIZE", 2):
+			response = self.post_ndjson(self.ndjson([self.payload(n, title="x" * 500) for n in range(6)]))
+		self.assertEqual(len(response.json()["errors"]), 2)
+
+	def test_imported_series_end_like_saved_ones(self):
+		series = self.payload(0, recurrence="weekly", recurrence_count=3, date_end="2030-01-01T21:00:00Z")
+		self.assertEqual(self.client.post("/api/events/import/", [series], format="json").status_code, 201)
+		imported = Event.objects.get()
+		self.assertEqual(imported.recurrence_end, imported.date_start + timedelta(days=14))
+		later = datetime(2031, 1, 1, tzinfo=UTC)
+		self.assertFalse(Event.objects.series_in(later, later + timedelta(days=30)).exists())
+		imported.save()
+		self.assertEqual(Event.objects.get().recurrence_end, imported.date_start + timedelta(days=14))
+
+	def test_malformed_input_is_rejected(self):
+		response = self.post_ndjson(self.ndjson([self.payload(0)]) + "{not json\n")
+		self.assertEqual(response.status_code, 400)
+		self.assertIn("line 2", response.json()["detail"])
+		self.assertFalse(Event.objects.exists())
+		self.assertEqual(self.client.post("/api/events/import/", {"title": "One"}, format="json").status_code, 400)
+		self.assertEqual(APIClient().post("/api/events/import/", [], format="json").status_code, 401)
+
+	def test_export_streams_what_import_reads(self):
+		player = User.objects.create_user("player")
+		for n in range(5):
+			event = Event.objects.create(organizer=self.organizer, location=f"Table {n}", online=bool(n % 2), max_players=4, **{
+				key: value for key, value in self.payload(n).items() if key != "system"
+			}, system=System.objects.get())
+		EventRequest.objects.create(event=event, user=player, status="approved")
+
+		with mock.patch("api.views.EXPORT_CHUNK_SIZE", 2):
+			response = self.client.get("/api/events/export/")
+			self.assertTrue(response.streaming)
+			lines = b"".join(response.streaming_content).decode().splitlines()
+		exported = [json.loads(line) for line in lines]
+		self.assertEqual([item["title"] for item in exported], [f"Imported {n}" for n in range(5)])
+		self.assertEqual(exported[-1]["players"], ["player"])
+		self.assertEqual(self.client.get("/api/events/export/?system=Unknown").getvalue(), b"")
+
+		Event.objects.all().delete()
+		response = self.post_ndjson("\n".join(lines) + "\n")
+		self.assertEqual(response.json(), {"created": 5})
+		with mock.patch("api.views.EXPORT_CHUNK_SIZE", 2):
+			reimported = [json.loads(line) for line in b"".join(self.client.get("/api/events/export/").streaming_content).decode().splitlines()]
+		volatile = {"id", "players", "created", "updated_at", "approved_count", "pending_count"}
+		strip = lambda items: [{key: value for key, value in item.items() if key not in volatile} for item in items]
+		self.assertEqual(strip(reimported), strip(exported))
+
+
+@override_settings(CACHES=NO_CACHE)
+class BulkModerationTests(TestCase):
+	"""A moderation batch applies decision by decision, within the seats, and keeps the counters exact."""
+
+	def setUp(self):
+		self.organizer = User.objects.create_user("organizer")
+		self.event = Event.objects.create(title="Table", organizer=self.organizer, max_players=2)
+		self.requests = [
+			EventRequest.objects.create(event=self.event, user=User.objects.create_user(f"player-{n}"), status=status)
+			for n, status in enumerate(["approved", "pending", "pending", "pending", "rejected"])
+		]
+		other = Event.objects.create(title="Other", organizer=self.organizer)
+		self.foreign = EventRequest.objects.create(event=other, user=User.objects.create_user("elsewhere"))
+		self.client = APIClient()
+		self.client.force_authenticate(self.organizer)
+
+	def moderate(self, decisions, client=None):
+		return (client or self.client).patch(f"/api/events/{self.event.pk}/requests/", decisions, format="json")
+
+	def assert_counters_match_rows(self):
+		self.event.refresh_from_db()
+		requests = EventRequest.objects.filter(event=self.event)
+		self.assertEqual(self.event.approved_count, requests.filter(status="approved").count())
+		self.assertEqual(self.event.pending_count, requests.filter(status="pending").count())
+
+	def test_batch_results(self):
+		first, second, third, fourth, rejected = self.requests
+		decisions = [
+			{"id": second.pk, "status": "approved"},  # takes the last seat
+			{"id": third.pk, "status": "approved"},  # full
+			{"id": first.pk, "status": "rejected"},  # frees a seat...
+			{"id": fourth.pk, "status": "approved"},  # ...taken here
+			{"id": rejected.pk, "status": "rejected"},
+			{"id": self.foreign.pk, "status": "approved"},
+			{"id": 10 ** 9, "status": "rejected"},
+		]
+		with CaptureQueriesContext(connection) as queries:
+			response = self.moderate(decisions)
+		self.assertEqual(response.status_code, 200)
+		self.assertEqual(
+			[(item["id"], item["status"], item["result"]) for item in response.json()],
+			[
+				(second.pk, "approved", "updated"),
+				(third.pk, "pending", "conflict"),
+				(first.pk, "rejected", "updated"),
+				(fourth.pk, "approved", "updated"),
+				(rejected.pk, "rejected", "unchanged"),
+				(self.foreign.pk, None, "not_found"),
+				(10 ** 9, None, "not_found"),
+			],
+		)
+		self.assertEqual(response.json()[1]["detail"], "This event is full.")
+		# The three changes are written by one bulk UPDATE
+		self.assertEqual(len([query for query in queries if query["sql"].startswith('UPDATE "base_eventrequest"')]), 1)
+
+		statuses = dict(EventRequest.objects.values_list("pk", "status"))
+		self.assertEqual([statuses[req.pk] for req in self.requests], ["rejected", "approved", "pending", "approved", "rejected"])
+		self.assertEqual(statuses[self.foreign.pk], "pending")
+		self.assert_counters_match_rows()
+		self.assertEqual((self.event.approved_count, self.event.pending_count), (2, 1))
+
+	def test_counters_follow_successive_batches(self):
+		for decisions in [
+			[{"id": req.pk, "status": "approved"} for req in self.requests],
+			[{"id": req.pk, "status": "rejected"} for req in self.requests[:2]],
+			[{"id": req.pk, "status": "approved"} for req in reversed(self.requests)],
+		]:
+			self.assertEqual(self.moderate(decisions).status_code, 200)
+			self.assert_counters_match_rows()
+			self.assertLessEqual(self.event.approved_count, self.event.max_players)
+
+	def test_invalid_batches_are_rejected(self):
+		self.assertEqual(self.moderate([{"id": self.requests[1].pk, "status": "pending"}]).status_code, 400)
+		self.assertEqual(self.moderate([]).status_code, 400)
+		with mock.patch("api.views.MAX_MODERATION_BATCH", 1):
+			self.assertEqual(self.moderate([{"id": req.pk, "status": "rejected"} for req in self.requests[:2]]).status_code, 400)
+		stranger = APIClient()
+		stranger.force_authenticate(self.requests[1].user)
+		self.assertEqual(self.moderate([{"id": self.requests[1].pk, "status": "approved"}], stranger).status_code, 403)
+		self.assertEqual(EventRequest.objects.get(pk=self.requests[1].pk).status, "pending")
+
+
+@override_settings(CACHES=NO_CACHE)
+class EventSearchTests(TestCase):
+	"""Search must match every word as a prefix, rank the matches and follow changes to the events."""
+
+	def setUp(self):
+		self.mine = Event.objects.create(title="Lost Mine of Phandelver", game_setting="Forgotten Realms", location="Kyiv")
+		self.dragon = Event.objects.create(title="Dragon dragon dragon", description="Dragons everywhere.")
+		self.mention = Event.objects.create(
+			title="Tavern night", description="A long evening of songs, drinks and stories, and maybe one dragon at the end.",
+		)
+
+	def search(self, text, **params):
+		response = self.client.get("/api/events/search/", {"q": text, **params})
+		self.assertEqual(response.status_code, 200)
+		return response.json()
+
+	def titles(self, text):
+		return [event["title"] for event in self.search(text)["results"]]
+
+	def test_every_word_matches_as_a_prefix(self):
+		self.assertEqual(self.titles("phandel"), ["Lost Mine of Phandelver"])
+		self.assertEqual(self.titles("forgotten kyiv"), ["Lost Mine of Phandelver"])
+		self.assertEqual(self.titles("forgotten tavern"), [])
+		# FTS5 syntax is matched as plain words
+		self.assertEqual(self.titles('"mine" -( NEAR/2 *'), [])
+		self.assertEqual(self.titles('"mine" -( *'), ["Lost Mine of Phandelver"])
+		self.assertEqual(self.client.get("/api/events/search/?q=%20").status_code, 400)
+
+	def test_ranking_and_pages(self):
+		self.assertEqual(self.titles("dragon"), ["Dragon dragon dragon", "Tavern night"])
+		first = self.search("dragon", page_size=1)
+		self.assertEqual([event["title"] for event in first["results"]], ["Dragon dragon dragon"])
+		second = self.client.get(first["next"]).json()
+		self.assertEqual(([event["title"] for event in second["results"]], second["next"]), (["Tavern night"], None))
+		for page in ("0", "-1", "two"):
+			with self.subTest(page):
+				self.assertEqual(self.client.get("/api/events/search/", {"q": "dragon", "page": page}).status_code, 400)
+		# Pages past the last one served are capped instead of overflowing the query
+		far = self.search("dragon", page="99999999999999999999")
+		self.assertEqual(far["results"], [])
+		self.assertIn(f"page={MAX_SEARCH_PAGE - 1}&", far["previous"])
+
+	def test_index_follows_updates_and_deletes(self):
+		self.mine.title = "Curse of Strahd"
+		self.mine.save()
+		self.assertEqual(self.titles("phandelver"), [])
+		self.assertEqual(self.titles("strahd"), ["Curse of Strahd"])
+
+		self.dragon.delete()
+		self.assertEqual(self.titles("dragon"), ["Tavern night"])
+
+		imported = Event.objects.bulk_create([Event(title="Dragon Heist")])
+		search.index_events(imported)
+		self.assertEqual(self.titles("heist"), ["Dragon Heist"])
+
+
+@override_settings(CACHES=NO_CACHE)
+class CursorPaginationTests(TestCase):
+	"""Cursors must walk the whole list both ways, dated then undated events, and reject forgeries."""
+
+	def setUp(self):
+		start = timezone.now().replace(microsecond=0)
+		# Several events share each start, and undated ones are created in between
+		for n in range(12):
+			dated = n % 4 != 1
+			Event.objects.create(title=f"Event {n}", date_start=start + timedelta(hours=n % 3) if dated else None)
+		dated = Event.objects.filter(date_start__isnull=False).order_by("date_start", "id")
+		undated = Event.objects.filter(date_start__isnull=True).order_by("id")
+		self.expected = [*dated.values_list("id", flat=True), *undated.values_list("id", flat=True)]
+
+	def walk(self, url, link):
+		pages = []
+		while url:
+			response = self.client.get(url)
+			self.assertEqual(response.status_code, 200, response.content)
+			body = response.json()
+			pages.append([event["id"] for event in body["results"]])
+			url = body[link]
+		return pages
+
+	def test_every_page_size_walks_the_list_both_ways(self):
+		for base in ["/api/", "/api/async/"]:
+			for page_size in range(1, 6):
+				with self.subTest(base=base, page_size=page_size):
+					pages = self.walk(f"{base}?page_size={page_size}", "next")
+					self.assertEqual([pk for page in pages for pk in page], self.expected)
+					self.assertTrue(all(len(page) == page_size for page in pages[:-1]))
+
+					last = self.client.get(f"{base}?page_size={page_size}").json()
+					while last["next"]:
+						last = self.client.get(last["next"]).json()
+					backwards = self.walk(last["previous"], "previous") if last["previous"] else []
+					self.assertEqual([pk for page in reversed(backwards) for pk in page], self.expected[:len(self.expected) - len(pages[-1])])
+
+	def test_cursor_crossing_into_undated_events(self):
+		dated = Event.objects.filter(date_start__isnull=False).count()
+		page = self.client.get(f"/api/?page_size={dated + 1}").json()
+		self.assertEqual([event["id"] for event in page["results"]], self.expected[:dated + 1])
+		self.assertIsNone(page["results"][-1]["date_start"])
+		following = self.client.get(page["next"]).json()
+		self.assertEqual([event["id"] for event in following["results"]], self.expected[dated + 1:dated + 1 + dated + 1])
+
+	def test_tampered_cursors_are_rejected(self):
+		def token(payload):
+			return urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+		for cursor in [
+			"!!!", "abc", token([]), token("text"), token({"i": 1}), token({"d": None}),
+			token({"d": "yesterday", "i": 1}), token({"d": "2026-13-01T00:00:00", "i": 1}),
+			token({"d": 5, "i": 1}), token({"d": None, "i": "1"}), token({"d": None, "i": -1}),
+			token({"d": None, "i": 10 ** 30}), token({"d": None, "i": 1.5}),
+		]:
+			for base in ["/api/", "/api/async/"]:
+				with self.subTest(cursor=cursor, base=base):
+					response = self.client.get(base, {"cursor": cursor})
+					self.assertEqual(response.status_code, 400, response.content)
+		response = self.client.get("/api/", {"cursor": token({"d": "2026-01-01T00:00:00", "i": 1})})
+		self.assertEqual(response.status_code, 200)
+
+
+class RequestCounterTests(TestCase):
+	"""Event.approved_count / pending_count must follow every request change, or be repaired by recount."""
+
+	def setUp(self):
+		self.event = Event.objects.create(title="Table")
+		self.players = [User.objects.create_user(f"player-{n}") for n in range(3)]
+
+	def counters(self, event=None):
+		event = event or self.event
+		event.refresh_from_db(fields=["approved_count", "pending_count"])
+		return event.approved_count, event.pending_count
+
+	def test_status_changes_and_deletes(self):
+		join_request = EventRequest.objects.create(event=self.event, user=self.players[0])
+		self.assertEqual(self.counters(), (0, 1))
+		for status, expected in [("approved", (1, 0)), ("approved", (1, 0)), ("rejected", (0, 0)), ("pending", (0, 1))]:
+			join_request.status = status
+			join_request.save()
+			self.assertEqual(self.counters(), expected, status)
+
+		# Loaded from the database, the instance knows the status it was saved with
+		loaded = EventRequest.objects.get(pk=join_request.pk)
+		loaded.status = "approved"
+		loaded.save()
+		self.assertEqual(self.counters(), (1, 0))
+		EventRequest.objects.create(event=self.event, user=self.players[1], status="approved")
+		self.assertEqual(self.counters(), (2, 0))
+
+		EventRequest.objects.get(pk=loaded.pk).delete()
+		self.assertEqual(self.counters(), (1, 0))
+		rejected = EventRequest.objects.create(event=self.event, user=self.players[2], status="rejected")
+		rejected.delete()
+		self.assertEqual(self.counters(), (1, 0))
+
+	def test_recount_repairs_drifted_counters(self):
+		other = Event.objects.create(title="Other")
+		for event in [self.event, other]:
+			for player, status in zip(self.players, ["approved", "approved", "pending"]):
+				EventRequest.objects.create(event=event, user=player, status=status)
+		untouched = Event.objects.create(title="Untouched")
+		# Cascading and bulk changes skip EventRequest.save()/delete()
+		self.players[0].delete()
+		EventRequest.objects.filter(event=other, user=self.players[2]).update(status="approved")
+		self.assertEqual((self.counters(), self.counters(other)), ((2, 1), (2, 1)))
+
+		out = StringIO()
+		call_command("recount_event_requests", "--dry-run", stdout=out)
+		self.assertIn("2 event(s) would be repaired", out.getvalue())
+		self.assertEqual(self.counters(), (2, 1))
+
+		out = StringIO()
+		call_command("recount_event_requests", stdout=out)
+		self.assertIn("2 event(s) repaired", out.getvalue())
+		self.assertEqual((self.counters(), self.counters(other), self.counters(untouched)), ((1, 1), (2, 0), (0, 0)))
+
+		out = StringIO()
+		call_command("recount_event_requests", stdout=out)
+		self.assertIn("0 event(s) repaired", out.getvalue())
+
+
+@override_settings(CACHES=NO_CACHE, EVENT_PAGE_SIZE=5)
+class HomeFeedTests(EventFixtures, TestCase):
+	"""The home page must cost the same queries on any page and show each viewer their own state."""
+
+	def setUp(self):
+		super().setUp()
+		self.player = User.objects.create_user("player")
+
+	def test_query_count_does_not_grow(self):
+		self.create_events(5, players=1)
+		small = [self.count_queries("/")]
+		self.client.force_login(self.player)
+		small.append(self.count_queries("/"))
+		self.client.logout()
+
+		self.create_events(20, players=1)
+		large = [self.count_queries("/"), self.count_queries("/?page=3&online=true")]
+		self.client.force_login(self.player)
+		large.append(self.count_queries("/"))
+		self.assertEqual(large, [small[0], small[0], small[1]])
+
+	def test_viewer_state_and_pages(self):
+		self.create_events(6, players=1)
+		newest = Event.objects.get(title="Event 6")
+		EventRequest.objects.create(event=newest, user=self.player, status="pending")
+
+		self.client.force_login(self.player)
+		response, _ = self.fetch("/")
+		items = response.context["events"]
+		self.assertEqual([item["event"].title for item in items], [f"Event {n}" for n in range(6, 1, -1)])
+		self.assertEqual([item["request_status"] for item in items], ["pending", None, None, None, None])
+		self.assertEqual([item["pending_count"] for item in items], [0] * 5)
+		self.assertContains(response, "1/2")
+		self.assertContains(response, 'href="?page=2"')
+
+		self.client.force_login(self.organizer)
+		items = self.fetch("/")[0].context["events"]
+		self.assertEqual([item["pending_count"] for item in items], [2, 1, 1, 1, 1])
+		self.assertEqual(items[0]["slots_taken"], 1)
+
+		response, _ = self.fetch("/?online=false&system=dnd5e")
+		self.assertEqual([item["event"].title for item in response.context["events"]], ["Event 6", "Event 4", "Event 2"])
+		self.assertNotContains(response, "page=2")
+		self.assertEqual(self.fetch("/?system=Unknown")[0].context["events"], [])
+
+
+class SystemNamesTests(TestCase):
+	"""The in-memory map of system names must follow creations, renames and deletions in every worker."""
+
+	def setUp(self):
+		cache.clear()
+		system_names.clear()
+		self.system = System.objects.create(name="Pathfinder")
+
+	def lookup(self, name):
+		system = system_names.get_system(name)
+		return system and (system.pk, system.name)
+
+	def test_follows_changes_made_by_this_process(self):
+		self.assertEqual(self.lookup("pathfinder"), (self.system.pk, "Pathfinder"))
+		with self.captureOnCommitCallbacks(execute=True):
+			created = System.objects.create(name="Mothership")
+		self.assertEqual(self.lookup("MOTHERSHIP"), (created.pk, "Mothership"))
+
+		with self.captureOnCommitCallbacks(execute=True):
+			self.system.name = "Pathfinder 2e"
+			self.system.save()
+		self.assertIsNone(self.lookup("Pathfinder"))
+		self.assertEqual(self.lookup("pathfinder 2e"), (self.system.pk, "Pathfinder 2e"))
+
+		with self.captureOnCommitCallbacks(execute=True):
+			created.delete()
+		self.assertIsNone(self.lookup("Mothership"))
+
+	def test_follows_changes_made_by_other_workers(self):
+		self.lookup("Pathfinder")
+		# Another worker renames the system: this process only sees the version bump
+		System.objects.filter(pk=self.system.pk).update(name="Cthulhu")
+		with self.assertNumQueries(0):
+			self.assertIsNotNone(self.lookup("Pathfinder"))
+		invalidate("systems")
+		self.assertEqual(self.lookup("cthulhu"), (self.system.pk, "Cthulhu"))
+
+		# ... and, when the cache is not shared, not even that: the map expires
+		System.objects.filter(pk=self.system.pk).update(name="Traveller")
+		self.assertIsNone(self.lookup("Traveller"))
+		later = time.monotonic() + settings.SYSTEM_NAMES_TTL
+		with mock.patch("base.system_names.time.monotonic", return_value=later):
+			self.assertEqual(self.lookup("traveller"), (self.system.pk, "Traveller"))
+
+	def test_api_accepts_a_system_created_by_another_worker(self):
+		self.lookup("Pathfinder")
+		System.objects.bulk_create([System(name="Blades in the Dark")])
+		client = APIClient()
+		client.force_authenticate(User.objects.create_user("organizer"))
+		with mock.patch("base.system_names.time.monotonic", return_value=time.monotonic() + settings.SYSTEM_NAMES_TTL):
+			response = client.post("/api/add/", {"title": "Heist", "system": "Blades in the Dark"}, format="json")
+		self.assertEqual(response.status_code, 201, response.content)
+
+
+@override_settings(CACHES=NO_CACHE)
+class ScheduleConflictTests(TestCase):
+	"""Players must not be approved for overlapping sessions, and the report must list every overlap."""
+
+	def setUp(self):
+		self.now = timezone.now().replace(microsecond=0)
+		self.organizer = User.objects.create_user("organizer")
+		self.player = User.objects.create_user("player")
+		self.organizer_client = APIClient()
+		self.organizer_client.force_authenticate(self.organizer)
+		self.player_client = APIClient()
+		self.player_client.force_authenticate(self.player)
+
+	def create_event(self, title, start, hours=None, organizer=None):
+		return Event.objects.create(
+			title=title,
+			organizer=organizer or self.organizer,
+			date_start=self.now + timedelta(hours=start),
+			date_end=self.now + timedelta(hours=start + hours) if hours else None,
+		)
+
+	def join(self, event):
+		return self.player_client.post(f"/api/events/{event.pk}/join/")
+
+	def test_approval_and_join_refused_on_overlap(self):
+		first = self.create_event("First", 0, hours=3)
+		second = self.create_event("Second", 2)
+		third = self.create_event("Third", 3)
+		for event in (first, second, third):
+			self.assertEqual(self.join(event).status_code, 201)
+		requests = {req.event_id: req for req in EventRequest.objects.filter(user=self.player)}
+
+		response = self.organizer_client.patch(f"/api/requests/{requests[first.pk].pk}/", {"status": "approved"}, format="json")
+		self.assertEqual(response.status_code, 200)
+		response = self.organizer_client.patch(f"/api/requests/{requests[second.pk].pk}/", {"status": "approved"}, format="json")
+		self.assertEqual(response.status_code, 409)
+		self.assertIn("First", response.json()["detail"])
+
+		# Sessions that only touch do not overlap
+		response = self.organizer_client.patch(
+			f"/api/events/{third.pk}/requests/", [{"id": requests[third.pk].pk, "status": "approved"}], format="json",
+		)
+		self.assertEqual(response.json()[0]["result"], "updated")
+
+		overlapping = self.create_event("Overlapping", 1, organizer=User.objects.create_user("other"))
+		self.assertEqual(self.join(overlapping).status_code, 409)
+		own = self.create_event("Own", 10, hours=2, organizer=self.player)
+		self.assertEqual(self.join(self.create_event("During own", 11)).status_code, 409)
+		self.assertEqual(own.requests.count(), 0)
+
+	def test_conflict_report(self):
+		first = self.create_event("First", 0, hours=3)
+		second = self.create_event("Second", 2)
+		self.create_event("Elsewhere", 20)
+		self.join(first)
+		self.join(second)
+		self.create_event("Own", 5, hours=1, organizer=self.player)
+
+		pairs = [(pair["first"]["title"], pair["second"]["title"], pair["second"]["role"]) for pair in self.player_client.get("/api/me/conflicts/").json()]
+		self.assertEqual(pairs, [("First", "Second", "pending"), ("Second", "Own", "organizer")])
+
+	def test_sweep_matches_pairwise_comparison(self):
+		random.seed(3)
+		events = []
+		for pk in range(200):
+			start = self.now + timedelta(minutes=30 * random.randint(0, 400))
+			end = random.choice([None, start + timedelta(minutes=30 * random.randint(1, 12))])
+			events.append(Event(pk=pk, date_start=start, date_end=end))
+		events.sort(key=lambda event: (event.date_start, event.pk))
+
+		found = {frozenset((a.pk, b.pk)) for a, b in conflicting_pairs(events)}
+		expected = {
+			frozenset((a.pk, b.pk))
+			for index, a in enumerate(events) for b in events[index + 1:]
+			if a.date_start < end_of(b) and b.date_start < end_of(a)
+		}
+		self.assertEqual(found, expected)
+
+
+@override_settings(CACHES=NO_CACHE)
+class RecurringEventTests(TestCase):
+	"""Occurrences follow the rule, keep their local time, and only the requested window is computed."""
+
+	def setUp(self):
+		self.organizer = User.objects.create_user("organizer")
+
+	def create_series(self, start, recurrence="weekly", **fields):
+		return Event.objects.create(
+			title="Campaign", organizer=self.organizer, recurrence=recurrence,
+			date_start=start, date_end=start + timedelta(hours=3), **fields,
+		)
+
+	def local(self, *args):
+		return timezone.make_aware(datetime(*args))
+
+	def starts(self, event, start, end):
+		return [timezone.localtime(occurrence.date_start) for occurrence in recurrence.occurrences(event, start, end)]
+
+	def test_local_time_kept_across_dst(self):
+		event = self.create_series(self.local(2026, 3, 21, 19))
+		starts = self.starts(event, self.local(2026, 3, 1), self.local(2026, 4, 10))
+		self.assertEqual([(start.day, start.hour) for start in starts], [(21, 19), (28, 19), (4, 19)])
+		self.assertEqual(starts[2].astimezone(UTC) - starts[1].astimezone(UTC), timedelta(days=7, hours=-1))
+
+	def test_monthly_clamps_to_month_end(self):
+		event = self.create_series(self.local(2026, 1, 31, 18), recurrence="monthly")
+		starts = self.starts(event, self.local(2026, 1, 1), self.local(2026, 5, 1))
+		self.assertEqual([(start.month, start.day) for start in starts], [(1, 31), (2, 28), (3, 31), (4, 30)])
+
+	def test_count_and_until_end_the_series(self):
+		start = self.local(2026, 1, 5, 18)
+		counted = self.create_series(start, recurrence_count=3)
+		until = self.create_series(start, recurrence="biweekly", recurrence_until=start + timedelta(days=28))
+		self.assertEqual(len(self.starts(counted, start, start + timedelta(days=365))), 3)
+		self.assertEqual(len(self.starts(until, start, start + timedelta(days=365))), 3)
+		self.assertEqual(counted.recurrence_end, start + timedelta(days=14))
+		self.assertEqual(until.recurrence_end, start + timedelta(days=28))
+		self.assertFalse(Event.objects.series_in(start + timedelta(days=29), None).exists())
+
+	def test_far_window_cost_does_not_grow(self):
+		event = self.create_series(self.local(2000, 1, 3, 18))
+		window = (self.local(2090, 6, 1), self.local(2090, 7, 1))
+		with mock.patch.object(recurrence, "occurrence_start", wraps=recurrence.occurrence_start) as computed:
+			starts = self.starts(event, *window)
+		self.assertEqual(len(starts), 4)
+		self.assertTrue(all(start.weekday() == 0 and start.hour == 18 for start in starts))
+		self.assertLess(computed.call_count, 10)
+
+	def test_calendar_lists_sessions_of_the_window(self):
+		start = timezone.now().replace(microsecond=0) + timedelta(days=1)
+		series = self.create_series(start)
+		one_off = Event.objects.create(title="One-shot", organizer=self.organizer, date_start=start + timedelta(days=2))
+		call_command("materialize_occurrences", "--next", "2", stdout=StringIO())
+		materialized = Event.objects.get(recurrence_parent=series, recurrence_index=1)
+		single = self.create_series(start, recurrence_count=1)
+
+		params = {"start": start.isoformat(), "end": (start + timedelta(days=15)).isoformat()}
+		with self.assertNumQueries(3):
+			sessions = self.client.get("/api/events/occurrences/", params).json()
+		self.assertEqual(
+			[(session["series"], session["index"], session["event"]) for session in sessions],
+			[(series.pk, 0, series.pk), (single.pk, 0, single.pk), (None, 0, one_off.pk), (series.pk, 1, materialized.pk), (series.pk, 2, None)],
+		)
+
+		call_command("materialize_occurrences", "--next", "3", "--event", str(series.pk), stdout=StringIO())
+		self.assertEqual(series.occurrences.count(), 2)
+		response = self.client.get("/api/events/occurrences/", {"start": params["start"], "end": (start + timedelta(days=400)).isoformat()})
+		self.assertEqual(response.status_code, 400)
+
+
+class CalendarFeedTests(TestCase):
+	"""Feeds are valid iCalendar, private feeds need their token, and unchanged feeds answer 304 in one query."""
+
+	def setUp(self):
+		self.system = System.objects.create(name="Daggerheart")
+		self.organizer = User.objects.create_user("organizer")
+		self.player = User.objects.create_user("player")
+		self.start = timezone.make_aware(datetime(2026, 10, 30, 19))
+		self.series = Event.objects.create(
+			title="Campaign; session", system=self.system, organizer=self.organizer, recurrence="monthly",
+			recurrence_count=6, date_start=self.start, date_end=self.start + timedelta(hours=3),
+			description="Long description " * 10,
+		)
+		self.one_shot = Event.objects.create(title="One-shot", system=self.system, organizer=self.organizer, date_start=self.start + timedelta(days=2))
+		self.url = f"/api/systems/{self.system.pk}/events.ics"
+
+	def test_feed_content(self):
+		Event.objects.create(
+			title="Campaign", system=self.system, organizer=self.organizer, recurrence_parent=self.series, recurrence_index=1,
+			date_start=self.start + timedelta(days=31, hours=1),
+		)
+		response = self.client.get(self.url)
+		self.assertEqual(response.status_code, 200)
+		self.assertTrue(response.streaming)
+		body = b"".join(response.streaming_content).decode()
+		self.assertTrue(all(len(line.encode()) <= 75 for line in body.split("\r\n")))
+		unfolded = body.replace("\r\n ", "")
+		self.assertEqual(unfolded.count("BEGIN:VEVENT"), 3)
+		self.assertIn("SUMMARY:Campaign\\; session", unfolded)
+		self.assertIn("DTSTART;TZID=Europe/Kyiv:20261030T190000", unfolded)
+		self.assertIn("RRULE:FREQ=MONTHLY;BYMONTHDAY=30,-1;BYSETPOS=1;UNTIL=20270330T160000Z", unfolded)
+		# The materialized occurrence overrides its slot of the series
+		self.assertEqual(unfolded.count(f"UID:event-{self.series.pk}@"), 2)
+		self.assertIn("RECURRENCE-ID;TZID=Europe/Kyiv:20261130T190000", unfolded)
+
+	def test_unchanged_feed_is_not_modified(self):
+		response = self.client.get(self.url)
+		etag, last_modified = response["ETag"], response["Last-Modified"]
+		with self.assertNumQueries(1):
+			self.assertEqual(self.client.get(self.url, headers={"If-Modified-Since": last_modified}).status_code, 304)
+		with self.assertNumQueries(1):
+			self.assertEqual(self.client.get(self.url, headers={"If-None-Match": etag}).status_code, 304)
+
+		self.one_shot.delete()
+		self.assertEqual(self.client.get(self.url, headers={"If-None-Match": etag}).status_code, 200)
+		self.assertEqual(self.client.get("/api/systems/999/events.ics").status_code, 404)
+
+	def test_user_feed(self):
+		EventRequest.objects.create(event=self.one_shot, user=self.player, status="approved")
+		Event.objects.create(title="Pending", organizer=self.organizer, date_start=self.start).requests.create(user=self.player)
+		self.assertEqual(self.client.get("/api/me/calendar/").status_code, 401)
+		client = APIClient()
+		client.force_authenticate(self.player)
+		url = client.get("/api/me/calendar/").json()["url"]
+
+		body = b"".join(self.client.get(url).streaming_content).decode()
+		self.assertEqual(re.findall(r"SUMMARY:(.*)\r", body), ["One-shot"])
+		self.assertEqual(self.client.get(url.replace("/calendar/", "/calendar/x")).status_code, 404)
+
+
+@override_settings(CACHES=NO_CACHE)
+class EventFilterIndexTests(TestCase):
+	"""Every event list filter must be answered from an index, never by scanning the whole event table."""
+
+	filters = [
+		"date_from=2026-01-01T00:00:00Z",
+		"date_to=2030-01-01T00:00:00Z",
+		"upcoming=true",
+		"online=true",
+		"online=false",
+		"organizer=organizer",
+		"has_seats=true",
+		"system=DnD5e",
+		"upcoming=true&online=true&has_seats=true",
+	]
+	full_scan = re.compile(r"\bSCAN base_event\b(?! USING)")
+
+	@classmethod
+	def setUpTestData(cls):
+		organizer = User.objects.create_user("organizer")
+		system = System.objects.create(name="DnD5e")
+		for n in range(30):
+			event = Event.objects.create(
+				title=f"Event {n}",
+				system=system if n % 2 else None,
+				organizer=organizer,
+				online=bool(n % 3),
+				date_start=timezone.now() + timedelta(days=n - 10) if n % 5 else None,
+				max_players=1,
+			)
+			if n % 4 == 0:
+				EventRequest.objects.create(event=event, user=User.objects.create_user(f"player-{n}"), status="approved")
+
+	def assert_indexed(self, url):
+		with CaptureQueriesContext(connection) as queries:
+			response = self.client.get(url)
+		self.assertEqual(response.status_code, 200)
+		with connection.cursor() as cursor:
+			for query in queries:
+				if not query["sql"].startswith("SELECT"):
+					continue
+				cursor.execute("EXPLAIN QUERY PLAN " + query["sql"])
+				plan = "\n".join(row[-1] for row in cursor.fetchall())
+				self.assertIsNone(self.full_scan.search(plan), f"{url}: full scan in\n{plan}\nfor {query['sql']}")
+
+	def test_api_filters_use_indexes(self):
+		for params in self.filters:
+			with self.subTest(params):
+				self.assert_indexed(f"/api/?{params}")
+
+	def test_home_filters_use_indexes(self):
+		for params in self.filters:
+			with self.subTest(params):
+				self.assert_indexed(f"/?{params}")
+
+	def test_filters_pick_their_index(self):
+		dated = Event.objects.filter(date_start__isnull=False).order_by("date_start", "id")
+		expected = {
+			"date_from=2026-01-01T00:00:00Z": "event_date_start_id_idx",
+			"upcoming=true": "event_date_start_id_idx",
+			"organizer=organizer": "event_organizer_date_idx",
+			"has_seats=true": "event_open_date_start_idx",
+		}
+		for params, index in expected.items():
+			with self.subTest(params):
+				form = EventFilterForm(QueryDict(params))
+				self.assertTrue(form.is_valid(), form.errors)
+				self.assertIn(index, form.filter(dated).explain())
+		system = System.objects.get(name="DnD5e")
+		self.assertIn("event_system_date_start_idx", dated.filter(system_id=system.pk).explain())
+
+	def test_filters_narrow_the_list(self):
+		results = self.client.get("/api/?online=false&has_seats=true&page_size=100").json()["results"]
+		self.assertTrue(results)
+		for event in results:
+			self.assertFalse(event["online"])
+			self.assertEqual(event["approved_count"], 0)
+
+	def test_invalid_filter_is_rejected(self):
+		response = self.client.get("/api/?date_from=2030-01-01&date_to=2020-01-01")
+		self.assertEqual(response.status_code, 400)
+		response = self.client.get("/api/?date_from=soon")
+		self.assertEqual(response.status_code, 400)
+		self.assertIn("date_from", response.json())
+
+	def test_date_only_range_covers_whole_days(self):
+		evening = timezone.make_aware(datetime(2031, 6, 15, 18))
+		Event.objects.create(title="Evening", organizer=User.objects.get(username="organizer"), date_start=evening)
+		for url in ("/?date_from=2031-06-15&date_to=2031-06-15", "/api/?date_from=2031-06-15&date_to=2031-06-15"):
+			with self.subTest(url):
+				response = self.client.get(url)
+				self.assertEqual(response.status_code, 200)
+				self.assertContains(response, "Evening")
+		for date_to in ("2031-06-14", "2031-06-15T17:59:59%2B03:00"):
+			with self.subTest(date_to):
+				self.assertNotContains(self.client.get(f"/api/?date_to={date_to}"), "Evening")
+
+
+class EventRequestIndexTests(TestCase):
+	"""The hot join request lookups must be answered from an index alone."""
+
+	# Every player asked to join every event: EVENTS * PLAYERS requests. Once analyzed, a
+	# few hundred rows get the same plans; FULL_SIZE_PLAN_TESTS=1 checks them on a million.
+	EVENTS = PLAYERS = 1000 if os.environ.get("FULL_SIZE_PLAN_TESTS") else 20
+	index_only = {
+		"sqlite": re.compile(r"USING COVERING INDEX (\w+)"),
+		"postgresql": re.compile(r"Index Only Scan using (\w+)"),
+	}
+
+	@classmethod
+	def setUpTestData(cls):
+		users = User.objects.bulk_create(User(username=f"player-{n}") for n in range(cls.PLAYERS))
+		events = Event.objects.bulk_create(Event(title=f"Event {n}") for n in range(cls.EVENTS))
+		cls.user, cls.event = users[cls.PLAYERS // 2], events[cls.EVENTS // 2]
+		# One statement instead of a million inserts; each event and each player has one
+		# request in ten pending, three rejected and six approved
+		with connection.cursor() as cursor:
+			cursor.execute(
+				"""
+				INSERT INTO base_eventrequest (event_id, user_id, status, created_at)
+				WITH RECURSIVE n(i) AS (SELECT 0 UNION ALL SELECT i + 1 FROM n WHERE i < %s)
+				SELECT %s + i / %s, %s + i %% %s,
+					CASE (i / %s + i) %% 10 WHEN 0 THEN 'pending' WHEN 1 THEN 'rejected' WHEN 2 THEN 'rejected'
+						WHEN 3 THEN 'rejected' ELSE 'approved' END, %s
+				FROM n
+				""",
+				[cls.EVENTS * cls.PLAYERS - 1, events[0].pk, cls.PLAYERS, users[0].pk, cls.PLAYERS, cls.PLAYERS, timezone.now()],
+			)
+			cursor.execute("ANALYZE")
+
+	def assert_index_only(self, queryset, *indexes):
+		plan = queryset.explain()
+		used = self.index_only[connection.vendor].findall(plan)
+		self.assertEqual(len(used), 1, plan)
+		self.assertIn(used[0], indexes, plan)
+
+	def test_fixture(self):
+		self.assertEqual(EventRequest.objects.count(), self.EVENTS * self.PLAYERS)
+		self.assertEqual(set(EventRequest.objects.filter(event=self.event).values_list("user__username", flat=True)[:3]), {"player-0", "player-1", "player-2"})
+
+	def test_pending_count(self):
+		pending = EventRequest.objects.filter(event=self.event, status="pending")
+		self.assert_index_only(pending.values("id"), "request_event_status_idx", "request_pending_event_idx")
+		self.assertEqual(pending.count(), self.PLAYERS // 10)
+
+	def test_my_status(self):
+		# At most one row: the unique (event, user) index is probed, a covering index would not save anything
+		plan = EventRequest.objects.filter(event=self.event, user=self.user).values("status").explain()
+		self.assertRegex(plan, r"SEARCH base_eventrequest USING INDEX \w+_uniq \(event_id=\? AND user_id=\?\)" if connection.vendor == "sqlite" else r"Index Scan using \w+_uniq")
+		self.assertEqual(Event.objects.with_request_status(self.user).get(pk=self.event.pk).viewer_status, "pending")
+
+	def test_my_requests(self):
+		approved = EventRequest.objects.filter(user=self.user, status="approved").values("event")
+		self.assert_index_only(approved, "request_user_status_idx")
+		self.assertEqual(approved.count(), self.EVENTS * 6 // 10)
+
+
+@override_settings(PASSWORD_HASHER_COST=1000)
+class CredentialsTests(TestCase):
+	"""Passwords follow the hasher profile, and credential floods are rejected before hashing."""
+
+	def setUp(self):
+		cache.clear()
+		self.user = User.objects.create_user("player", password="secret")
+
+	def login(self, username="player", password="secret", **extra):
+		return self.client.post("/api/token/", {"username": username, "password": password}, **extra)
+
+	def test_passwords_are_rehashed_with_the_preferred_profile_on_login(self):
+		self.assertTrue(self.user.password.startswith("pbkdf2_sha256$1000$"))
+		with self.settings(PASSWORD_HASHER_COST=2000):
+			self.assertEqual(self.login().status_code, 200)
+		self.user.refresh_from_db()
+		self.assertTrue(self.user.password.startswith("pbkdf2_sha256$2000$"))
+
+		with self.settings(PASSWORD_HASHER="scrypt", PASSWORD_HASHERS=hashers_for("scrypt"), PASSWORD_HASHER_COST=1024):
+			self.assertEqual(self.login().status_code, 200)
+			self.user.refresh_from_db()
+			self.assertTrue(self.user.password.startswith("scrypt$1024$"))
+		# Still valid once the profile is switched back
+		self.assertEqual(self.login().status_code, 200)
+
+	def test_unknown_profile_is_a_configuration_error(self):
+		self.assertEqual(hashers_for("pbkdf2"), settings.PASSWORD_HASHERS)
+		with self.assertRaisesMessage(ImproperlyConfigured, "choose one of: pbkdf2, argon2, bcrypt, scrypt"):
+			hashers_for("md5")
+
+	def test_floods_are_throttled_before_hashing(self):
+		rates = {"credentials_ip": "4/min", "credentials_username": "2/min"}
+		with mock.patch.object(SimpleRateThrottle, "THROTTLE_RATES", rates), mock.patch.object(User, "check_password", return_value=False) as check:
+			self.assertEqual([self.login(password="guess").status_code for _ in range(3)], [401, 401, 429])
+			self.assertEqual(check.call_count, 2)
+			self.assertIn("Retry-After", self.login(password="guess"))
+
+			# Another username from the same address is only stopped by the address limit
+			response = self.client.post("/api/signup/", {"username": "newcomer", "password": "secret"})
+			self.assertEqual(response.status_code, 429)
+			other_address = self.login(username="other", password="guess", REMOTE_ADDR="10.0.0.2")
+			self.assertEqual(other_address.status_code, 401)
+			self.assertEqual(check.call_count, 2)
+
+
+@override_settings(CACHES=NO_CACHE)
+class StatelessJwtTests(TestCase):
+	"""API requests with a token carrying the user claims must not load the user."""
+
+	def setUp(self):
+		self.organizer = User.objects.create_user("organizer", password="secret", email="organizer@example.com")
+		self.player = User.objects.create_user("player", password="secret")
+		self.event = Event.objects.create(title="Event", organizer=self.organizer)
+		self.join_request = EventRequest.objects.create(event=self.event, user=self.player, status="pending")
+
+	def tokens(self, username):
+		return self.client.post("/api/token/", {"username": username, "password": "secret"}).json()
+
+	def call(self, method, path, token, data=None):
+		"""Status and query count of a request, whose changes are rolled back."""
+		with transaction.atomic(), CaptureQueriesContext(connection) as captured:
+			response = getattr(self.client, method)(
+				path, data, content_type="application/json", headers={"Authorization": f"Bearer {token}"},
+			)
+			transaction.set_rollback(True)
+		return response.status_code, len(captured)
+
+	def test_ownership_checks_skip_the_user_lookup(self):
+		access = self.tokens("organizer")["access"]
+		# Issued without the claims: the user is loaded from the database
+		legacy = AccessToken.for_user(self.organizer)
+		for method, path, data in [
+			("get", f"/api/events/{self.event.pk}/requests/", None),
+			("patch", f"/api/requests/{self.join_request.pk}/", {"status": "approved"}),
+			("delete", f"/api/{self.event.pk}/", None),
+		]:
+			with self.subTest(method=method, path=path):
+				status, queries = self.call(method, path, access, data)
+				self.assertLess(status, 300)
+				self.assertEqual((status, queries + 1), self.call(method, path, legacy, data))
+
+		self.assertEqual(self.call("delete", f"/api/{self.event.pk}/", self.tokens("player")["access"]), (403, 2))
+
+	def test_claims_survive_refresh_and_other_fields_load_lazily(self):
+		access = self.client.post("/api/token/refresh/", {"refresh": self.tokens("organizer")["refresh"]}).json()["access"]
+		user = token_user(AccessToken(access))
+		with self.assertNumQueries(0):
+			self.assertEqual((user.pk, user.username, user.is_staff, user.is_authenticated), (self.organizer.pk, "organizer", False, True))
+			self.assertEqual(user, self.organizer)
+		with self.assertNumQueries(1):
+			self.assertEqual(user.email, "organizer@example.com")
+		self.assertIsNone(token_user(AccessToken.for_user(self.organizer)))
+
+		response = self.client.post(
+			"/api/add/", {"title": "Created by the token user", "system": System.objects.create(name="Pathfinder").name},
+			content_type="application/json",
+			headers={"Authorization": f"Bearer {access}"},
+		)
+		self.assertEqual((response.status_code, response.json()["organizer"]), (201, "organizer"))
+		self.assertEqual(Event.objects.get(title="Created by the token user").organizer, self.organizer)
+
+	def test_refresh_picks_up_changed_claims(self):
+		refresh = self.tokens("organizer")["refresh"]
+		User.objects.filter(pk=self.organizer.pk).update(username="renamed", is_staff=True)
+		access = self.client.post("/api/token/refresh/", {"refresh": refresh}).json()["access"]
+		user = token_user(AccessToken(access))
+		self.assertEqual((user.username, user.is_staff), ("renamed", True))
+
+		User.objects.filter(pk=self.organizer.pk).update(is_active=False)
+		self.assertEqual(self.client.post("/api/token/refresh/", {"refresh": refresh}).status_code, 401)
+
+
+@override_settings(
+	CACHES=NO_CACHE,
+	REQUEST_METRICS=True,
+	MIDDLEWARE=["base.metrics.RequestMetricsMiddleware", *settings.MIDDLEWARE],
+)
+class RequestMetricsTests(TestCase):
+	"""Requests must be measured per URL name, with their queries, and exported for Prometheus."""
+
+	def setUp(self):
+		metrics.registry.clear()
+		self.event = Event.objects.create(title="Event", date_start=timezone.now())
+
+	def test_server_timing_and_prometheus_export(self):
+		response = self.client.get(f"/{self.event.pk}/")
+		self.assertRegex(response["Server-Timing"], r'^app;dur=[\d.]+, db;dur=[\d.]+;desc="[1-9]\d* queries')
+		self.client.get(f"/{self.event.pk}/")
+
+		exported = self.client.get("/metrics").content.decode()
+		self.assertIn('planner_request_duration_seconds_count{view="single"} 2', exported)
+		self.assertIn('planner_request_queries_bucket{view="single",le="+Inf"} 2', exported)
+		self.assertIn("# TYPE planner_request_db_seconds histogram", exported)
+		self.assertEqual(self.client.get("/metrics", REMOTE_ADDR="10.0.0.7").status_code, 404)
+
+	async def test_async_views_are_measured(self):
+		response = await AsyncClient().get("/api/async/")
+		self.assertRegex(response["Server-Timing"], r'desc="[1-9]\d* queries')
+
+	def test_duplicates_and_slow_request_log(self):
+		recorder = metrics.Recorder()
+		metrics.instrument_thread()
+		token = metrics.current_recorder.set(recorder)
+		try:
+			Event.objects.filter(pk=self.event.pk).exists()
+			Event.objects.filter(pk=self.event.pk).exists()
+			Event.objects.filter(pk=0).exists()
+		finally:
+			metrics.current_recorder.reset(token)
+		self.assertEqual((len(recorder.queries), recorder.duplicates), (3, 1))
+
+		with self.settings(METRICS_SLOW_REQUEST_MS=0), self.assertLogs("base.metrics", "WARNING") as logs:
+			self.client.get("/")
+		self.assertIn("Slow request GET / (home)", logs.output[0])
+		self.assertIn("SELECT", logs.output[0])
+
+
+@override_settings(CACHES=NO_CACHE)
+class AsyncEventApiTests(TestCase):
+	"""The async endpoints must answer exactly like their DRF versions."""
+
+	def setUp(self):
+		self.organizer = User.objects.create_user("organizer")
+		self.player = User.objects.create_user("player")
+		for n in range(5):
+			self.event = Event.objects.create(title=f"Event {n}", organizer=self.organizer, date_start=timezone.now() + timedelta(days=n))
+		EventRequest.objects.create(event=self.event, user=User.objects.create_user("approved"), status="approved")
+
+	def auth(self, user):
+		return {"Authorization": f"Bearer {AccessToken.for_user(user)}"}
+
+	async def test_reads_match_sync_views(self):
+		client = AsyncClient()
+		for params in ["page_size=2", "has_seats=true", "system=unknown"]:
+			sync = (await client.get(f"/api/?{params}")).json()
+			response = await client.get(f"/api/async/?{params}")
+			self.assertEqual(response.status_code, 200)
+			self.assertEqual(response.json()["results"], sync["results"])
+
+		headers = self.auth(self.player)
+		sync = await client.get(f"/api/{self.event.pk}/", headers=headers)
+		response = await client.get(f"/api/async/{self.event.pk}/", headers=headers)
+		self.assertEqual(response.json(), sync.json())
+		self.assertEqual((await client.get(f"/api/async/{self.event.pk}/")).status_code, 401)
+
+	async def test_join_and_moderate(self):
+		client = AsyncClient()
+		url = f"/api/async/events/{self.event.pk}/join/"
+		response = await client.post(url, headers=self.auth(self.player))
+		self.assertEqual(response.status_code, 201)
+		self.assertEqual(response.json()["status"], "pending")
+		self.assertEqual((await client.post(url, headers=self.auth(self.player))).status_code, 409)
+
+		url = f"/api/async/events/{self.event.pk}/requests/"
+		self.assertEqual((await client.get(url, headers=self.auth(self.player))).status_code, 403)
+		requests = (await client.get(url, headers=self.auth(self.organizer))).json()
+		self.assertEqual([req["user"] for req in requests], ["approved", "player"])
+		response = await client.patch(
+			url, [{"id": requests[1]["id"], "status": "approved"}],
+			content_type="application/json", headers=self.auth(self.organizer),
+		)
+		self.assertEqual(response.json()[0]["result"], "updated")
+		await self.event.arefresh_from_db()
+		self.assertEqual(self.event.approved_count, 2)
+
+
+class EventStreamTests(TransactionTestCase):
+	"""Join request changes must reach the event's live stream, filtered per viewer."""
+
+	async def test_stream_pushes_seats_and_own_request_status(self):
+		organizer = await User.objects.acreate(username="organizer")
+		player = await User.objects.acreate(username="player")
+		other = await User.objects.acreate(username="other")
+		event = await Event.objects.acreate(title="One-shot", organizer=organizer, max_players=1)
+
+		response = await AsyncClient().get(
+			f"/api/events/{event.pk}/live/",
+			headers={"Authorization": f"Bearer {AccessToken.for_user(player)}"},
+		)
+		self.assertEqual(response["Content-Type"], "text/event-stream")
+		stream = aiter(response.streaming_content)
+
+		async def next_event():
+			chunk = (await asyncio.wait_for(anext(stream), 5)).decode()
+			name, data = chunk.strip().split("\n")
+			return name.removeprefix("event: "), json.loads(data.removeprefix("data: "))
+
+		self.assertTrue((await anext(stream)).startswith(b"retry:"))
+		self.assertEqual(await next_event(), ("seats", {"approved_count": 0, "pending_count": 0, "max_players": 1, "has_space": True}))
+
+		join_request = await sync_to_async(request_to_join)(event, player)
+		self.assertEqual(await next_event(), ("request", {"id": join_request.pk, "status": "pending", "own": True}))
+		self.assertEqual((await next_event())[1]["pending_count"], 1)
+
+		# Someone else's request only moves the counters
+		await sync_to_async(request_to_join)(event, other)
+		self.assertEqual((await next_event())[1]["pending_count"], 2)
+
+		await sync_to_async(set_request_status)(join_request, "approved")
+		self.assertEqual(await next_event(), ("request", {"id": join_request.pk, "status": "approved", "own": True}))
+		self.assertEqual((await next_event())[1], {"approved_count": 1, "pending_count": 1, "max_players": 1, "has_space": False})
+		await stream.aclose()
+
+	def test_stream_needs_asgi(self):
+		organizer = User.objects.create_user("organizer")
+		event = Event.objects.create(title="One-shot", organizer=organizer)
+		response = self.client.get(f"/api/events/{event.pk}/live/")
+		self.assertEqual(response.status_code, 501)
+		self.assertNotIn("retry", response.content.decode())
+
+
+class SeedAndBenchmarkTests(TestCase):
+	"""Seeded data must be consistent, and the benchmarked views must not grow their queries with the data."""
+
+	def test_seed_is_consistent_and_skewed(self):
+		created = seeding.seed(users=40, systems=4, events=50, requests=300, seed=1)
+		self.assertEqual(created, {"users": 40, "systems": 4, "events": 50, "requests": 300})
+		drifted = Event.objects.annotate(
+			approved=Count("requests", filter=Q(requests__status="approved")),
+			pending=Count("requests", filter=Q(requests__status="pending")),
+		).exclude(approved_count=F("approved"), pending_count=F("pending"))
+		self.assertFalse(drifted.exists())
+		self.assertFalse(Event.objects.exclude(max_players=0).filter(approved_count__gt=F("max_players")).exists())
+
+		counts = sorted(Event.objects.annotate(total=Count("requests")).values_list("total", flat=True), reverse=True)
+		self.assertGreater(sum(counts[:5]), sum(counts) / 4)
+
+	def test_benchmark_results_and_baseline(self):
+		with tempfile.TemporaryDirectory() as directory:
+			output = os.path.join(directory, "bench.json")
+			# Both sizes fill the first page of the event list from dated events alone
+			call_command("bench_planner", sizes="40,80", iterations=2, output=output, stderr=StringIO())
+			with open(output) as file:
+				results = json.load(file)
+			small, large = results["sizes"]["40"], results["sizes"]["80"]
+			self.assertEqual(set(small), {"getData", "home", "single", "join_event_api", "update_request_api", "list_requests_api"})
+			self.assertEqual({name: result["queries"] for name, result in small.items()}, {name: result["queries"] for name, result in large.items()})
+
+			small["getData"]["queries"] -= 1
+			with open(output, "w") as file:
+				json.dump(results, file)
+			with self.assertRaisesMessage(CommandError, "getData at 40 events"):
+				call_command("bench_planner", sizes="40", iterations=2, baseline=output, tolerance=100, stdout=StringIO(), stderr=StringIO())
+
+
+class SeatReservationStressTests(TransactionTestCase):
+	"""Hundreds of parallel joins and approvals must never oversubscribe an event."""
+
+	players = 200
+	seats = 5
+
+	def setUp(self):
+		self.organizer = User.objects.create_user("organizer")
+		self.event = Event.objects.create(title="One-shot", organizer=self.organizer, max_players=self.seats)
+		User.objects.bulk_create(User(username=f"player-{n}") for n in range(self.players))
+		self.users = list(User.objects.exclude(pk=self.organizer.pk))
+
+	def run_parallel(self, calls):
+		"""Fire every call from its own thread at once and collect the response status codes."""
+		barrier = threading.Barrier(len(calls))
+
+		def fire(call):
+			try:
+				barrier.wait()
+				return call()
+			finally:
+				connections.close_all()
+
+		with ThreadPoolExecutor(max_workers=len(calls)) as pool:
+			return [response.status_code for response in pool.map(fire, calls)]
+
+	def client_for(self, user):
+		client = APIClient()
+		client.force_authenticate(user)
+		return client
+
+	def test_parallel_joins_and_approvals(self):
+		url = f"/api/events/{self.event.pk}/join/"
+		joins = [partial(self.client_for(user).post, url) for user in self.users]
+		# Every user also retries once, racing their own first request
+		joins += [partial(self.client_for(user).post, url) for user in self.users[:20]]
+		codes = self.run_parallel(joins)
+		self.assertEqual(codes.count(201), self.players)
+		self.assertEqual(codes.count(409), 20)
+
+		organizer = self.client_for(self.organizer)
+		approvals = [
+			partial(organizer.patch, f"/api/requests/{pk}/", {"status": "approved"}, format="json")
+			for pk in self.event.requests.values_list("pk", flat=True)
+		]
+		codes = self.run_parallel(approvals)
+		self.assertEqual(codes.count(200), self.seats)
+		self.assertEqual(codes.count(409), self.players - self.seats)
+
+		self.event.refresh_from_db()
+		self.assertEqual(self.event.requests.filter(status="approved").count(), self.seats)
+		self.assertEqual(self.event.approved_count, self.seats)
+		self.assertEqual(self.event.pending_count, self.players - self.seats)
@@ -1,47 +1,60 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import login
 from django.contrib import messages
+from django.conf import settings
+from django.core.paginator import Paginator
 from django.utils import timezone
 from .models import Event, EventRequest, System
-from .forms import SignUpForm, EventForm
+from .forms import SignUpForm, EventForm, EventFilterForm
+from .services import SeatConflict, request_to_join, set_request_status
+from .system_names import filter_by_system
 from django.contrib.auth.decorators import login_required
 
 # Create your views here.
 
 def home(request):
-	events = Event.objects.all().select_related("organizer").prefetch_related("requests", "players").order_by("-date_start")
-	
+	events = Event.objects.select_related("organizer", "system").order_by("-date_start", "-id")
+	if request.user.is_authenticated:
+		events = events.with_request_status(request.user)
+
 	system_name = request.GET.get("system")
 	if system_name:
-		events = events.filter(system__name__iexact=system_name)
+		events = filter_by_system(events, system_name)
 
-	data = []
-	for event in events:
-		request_status = None
-		pending_count = 0
+	filters = EventFilterForm(request.GET)
+	if filters.is_valid():
+		events = filters.filter(events)
 
-		if request.user.is_authenticated:
-			req = event.requests.filter(user=request.user).first()
-			if req:
-				request_status = req.status
-
-			if request.user == event.organizer:
-				pending_count = event.requests.filter(status="pending").count()
+	page = Paginator(events, settings.EVENT_PAGE_SIZE).get_page(request.GET.get("page"))
 
+	data = []
+	for event in page:
+		is_organizer = request.user.is_authenticated and event.organizer_id == request.user.id
 		data.append({
 			"event": event,
-			"slots_taken": event.players.count(),
+			"slots_taken": event.approved_count,
 			"slots_total": event.max_players,
-			"request_status": request_status,
-			"pending_count": pending_count,
+			"request_status": getattr(event, "viewer_status", None),
+			"pending_count": event.pending_count if is_organizer else 0,
 		})
 
 	systems = System.objects.all()
-	return render(request, "index.html", {"events": data, "systems": systems, "selected_system": system_name})
+	# Query string carried over by the pagination links
+	query = request.GET.copy()
+	query.pop("page", None)
+	filter_query = query.urlencode()
+	return render(request, "index.html", {
+		"events": data,
+		"page_obj": page,
+		"systems": systems,
+		"selected_system": system_name,
+		"filters": filters,
+		"filter_query": filter_query,
+	})
 
 def single(request, event_id):
-	event = Event.objects.get(pk=event_id)
-	players = event.players.all()
+	event = Event.objects.select_related("organizer", "system").get(pk=event_id)
+	players = event.approved_players
 
 	request_status = None
 	pending_requests = []
@@ -52,7 +65,7 @@ def single(request, event_id):
 			request_status = req.status
 
 		if request.user == event.organizer:
-			pending_requests = event.requests.filter(status="pending")
+			pending_requests = event.requests.filter(status="pending").select_related("user").order_by("id")
 
 	if event and event.date_start:
 		time_remaining = event.date_start - timezone.now()
@@ -103,19 +116,13 @@ def join_event(request, event_id):
 		messages.error(request, "You are the organizer of this event.")
 		return redirect("single", event_id=event_id)
 
-	# Check if already requested
-	existing = EventRequest.objects.filter(event=event, user=request.user).first()
-	if existing:
-		messages.info(request, "You already requested to join this event.")
-		return redirect("single", event_id=event_id)
-
-	# Check capacity
-	if not event.has_space():
-		messages.error(request, "This event is full.")
+	# Create a new pending request
+	try:
+		request_to_join(event, request.user)
+	except SeatConflict as exc:
+		messages.error(request, str(exc))
 		return redirect("single", event_id=event_id)
 
-	# Create a new pending request
-	EventRequest.objects.create(event=event, user=request.user)
 	messages.success(request, "Your request has been sent to the organizer.")
 	return redirect("single", event_id=event_id)
 
@@ -180,15 +187,18 @@ def manage_request(request, event_id, request_id, action):
 		return redirect("single", event_id=event.id)
 
 	if action == "approve":
-		if not event.has_space():
-			messages.error(request, "Cannot approve: event is full.")
+		try:
+			set_request_status(join_request, "approved")
+		except SeatConflict as exc:
+			messages.error(request, f"Cannot approve: {exc}")
 		else:
-			join_request.status = "approved"
-			join_request.save()
 			messages.success(request, f"{join_request.user.username} has been approved!")
 	else:  # reject
-		join_request.status = "rejected"
-		join_request.save()
-		messages.info(request, f"{join_request.user.username} has been rejected.")
+		try:
+			set_request_status(join_request, "rejected")
+		except SeatConflict as exc:
+			messages.error(request, str(exc))
+		else:
+			messages.info(request, f"{join_request.user.username} has been rejected.")
 
 	return redirect("single", event_id=event.id)